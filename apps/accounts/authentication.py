@@ -1,13 +1,86 @@
-from rest_framework.exceptions import AuthenticationFailed
+import time
+
+from django.conf import settings
+from django.core.cache import caches
 from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.settings import api_settings
+
+from apps.common.metrics import metrics
+
+
+def get_user_cache():
+    return caches[settings.AUTH_USER_CACHE_ALIAS]
+
+
+def get_generation_cache():
+    return caches[settings.AUTH_GENERATION_CACHE_ALIAS]
+
+
+def _generation_key(user_id):
+    return f"auth-user-gen:{user_id}"
+
+
+def _user_key(user_id, iat):
+    """
+    (user id, 세대, 토큰 iat) 키. 세대 값이 없으면 새로 발급해 이전 항목과 겹치지 않게 함
+    - 세대는 모든 프로세스가 공유하는 캐시에서 요청마다 읽으므로 다른 프로세스의 무효화도 바로 반영
+    - 세대를 저장할 수 없는 백엔드(dummy 등)면 None → 캐시를 쓰지 않음
+    """
+    cache = get_generation_cache()
+    generation = cache.get(_generation_key(user_id))
+    if generation is None:
+        cache.add(_generation_key(user_id), time.time_ns(), None)
+        generation = cache.get(_generation_key(user_id))
+    if generation is None:
+        return None
+    return f"auth-user:{user_id}:{generation}:{iat}"
+
+
+def invalidate_cached_user(user_id):
+    get_generation_cache().set(_generation_key(user_id), time.time_ns(), None)
 
 
 class CookieJWTAuthentication(JWTAuthentication):
+    """
+    Authorization 헤더 → access_token 쿠키 순으로 토큰을 찾아 한 번만 검증
+    - 유저는 (user id, iat) 기준으로 짧게 캐시해 요청마다의 User 조회를 생략
+    - 유저 저장/삭제 시 signals.py에서 공유 캐시의 세대 번호를 바꿔 모든 프로세스의 캐시를 무효화
+      (비밀번호 변경, 탈퇴, is_active 변경 등)
+    - 캐시 적중률과 인증 소요 시간은 apps.common.metrics로 집계
+    """
+
     def authenticate(self, request):
-        access_token = request.COOKIES.get("access_token")
+        header = self.get_header(request)
+        raw_token = self.get_raw_token(header) if header is not None else None
+        if raw_token is None:
+            raw_token = request.COOKIES.get("access_token")
 
-        if access_token is None:
+        if raw_token is None:
             return None
 
-        validated_token = self.get_validated_token(access_token)
-        return self.get_user(validated_token), validated_token
+        started = time.perf_counter()
+        try:
+            validated_token = self.get_validated_token(raw_token)
+            return self.get_user(validated_token), validated_token
+        finally:
+            metrics.observe("auth.authenticate", time.perf_counter() - started)
+
+    def get_user(self, validated_token):
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        if user_id is None:
+            return super().get_user(validated_token)
+
+        key = _user_key(user_id, validated_token.get("iat"))
+        if key is None:
+            return super().get_user(validated_token)
+
+        cache = get_user_cache()
+        user = cache.get(key)
+        if user is not None:
+            metrics.incr("auth.user_cache.hits")
+            return user
+
+        metrics.incr("auth.user_cache.misses")
+        user = super().get_user(validated_token)
+        cache.set(key, user)
+        return user
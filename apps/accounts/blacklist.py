@@ -0,0 +1,187 @@
+"""
+Refresh 토큰 블랙리스트 조회 최적화
+
+BlacklistedToken 테이블에서 만들어 둔 Bloom filter로 "확실히 블랙리스트에 없는" 토큰은 DB 조회를 건너뛴다.
+- 필터가 있다고 답한 경우(실제 포함 또는 오탐)에만 기존처럼 DB를 조회
+- 필터는 백그라운드 스레드에서 만들고, 준비되기 전에는 모든 토큰을 DB로 조회
+- 같은 프로세스의 블랙리스트 등록은 즉시 필터에 반영
+- 다른 프로세스의 등록은 SYNC_INTERVAL마다 반영. 늦게 커밋된 행을 놓치지 않도록 SYNC_LAG 전에 이미 할당돼 있던
+  id 이후를 다시 읽음 (트랜잭션이 SYNC_LAG보다 오래 걸리지 않는다고 가정)
+- 만료/정리된 토큰을 비우기 위해 REBUILD_INTERVAL마다 백그라운드에서 새로 만들어 교체
+"""
+
+import bisect
+import hashlib
+import logging
+import math
+import threading
+import time
+from datetime import datetime, timezone
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.db import connections
+from django.dispatch import receiver
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.utils import aware_utcnow
+
+from apps.common.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+
+class BloomFilter:
+    def __init__(self, capacity, error_rate):
+        self.size = max(int(-capacity * math.log(error_rate) / math.log(2) ** 2), 8)
+        self.hash_count = max(round(self.size / capacity * math.log(2)), 1)
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item):
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1, h2 = int.from_bytes(digest[:8], "little"), int.from_bytes(digest[8:], "little")
+        return [(h1 + i * h2) % self.size for i in range(self.hash_count)]
+
+    def add(self, item):
+        for position in self._positions(item):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, item):
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+
+class BlacklistFilter:
+    def __init__(self, capacity, error_rate, sync_interval, rebuild_interval, sync_lag):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.sync_interval = sync_interval
+        self.rebuild_interval = rebuild_interval
+        self.sync_lag = sync_lag
+        self._bloom = None  # 준비되기 전에는 None → 항상 DB 조회
+        self._read_at = 0.0  # _bloom에 반영된 마지막 조회 시각 (time.time)
+        # (시각, id): 그 시각 이후에 삽입되는 행은 모두 id보다 큰 값을 받음 (auto increment)
+        self._watermarks = []
+        self._pending = None  # 재구성 중 같은 프로세스에서 등록된 jti (새 필터로 옮김)
+        self._synced_at = self._built_at = 0.0
+        self._lock = threading.Lock()
+
+    def might_contain(self, jti):
+        self._sync()
+        bloom = self._bloom
+        return bloom is None or jti in bloom
+
+    def add(self, jti):
+        self._sync()
+        with self._lock:
+            if self._bloom is not None:
+                self._bloom.add(jti)
+            if self._pending is not None:
+                self._pending.append(jti)
+
+    def rebuild(self):
+        """유효기간이 남은 블랙리스트 전체로 새 필터를 만들어 교체 (백그라운드 스레드 또는 테스트에서 직접 호출)"""
+        read_at = time.time()
+        lag_cutoff = datetime.fromtimestamp(read_at - self.sync_lag, tz=timezone.utc)
+        bloom = BloomFilter(self.capacity, self.error_rate)
+        floor = 0
+        # 만료된 토큰은 서명 검증 단계에서 거부되므로 유효기간이 남은 것만 담음
+        rows = BlacklistedToken.objects.filter(token__expires_at__gt=aware_utcnow()).values_list(
+            "id", "token__jti", "blacklisted_at"
+        )
+        for row_id, jti, blacklisted_at in rows.iterator(chunk_size=10_000):
+            bloom.add(jti)
+            if blacklisted_at < lag_cutoff:
+                floor = max(floor, row_id)
+
+        with self._lock:
+            for jti in self._pending or ():
+                bloom.add(jti)
+            self._pending = None
+            self._bloom, self._read_at = bloom, read_at
+            # 조회 시점에 커밋되지 않은 행은 SYNC_LAG 이내에 삽입된 것 → floor 이후를 다음 동기화에서 읽음
+            bisect.insort(self._watermarks, (read_at - self.sync_lag, floor))
+            self._built_at = time.monotonic()
+            self._synced_at = 0.0
+        metrics.incr("token_blacklist.filter.rebuilds")
+
+    def _rebuild_in_background(self):
+        try:
+            self.rebuild()
+        except Exception:
+            metrics.incr("token_blacklist.filter.failed_rebuilds")
+            logger.exception("Failed to rebuild the token blacklist filter")
+            with self._lock:
+                self._pending = None  # 다음 동기화 때 다시 시도 (그동안 기존 필터 또는 DB 조회)
+        finally:
+            connections.close_all()
+
+    def _sync(self):
+        now = time.monotonic()
+        if now - self._synced_at < self.sync_interval:
+            return
+
+        with self._lock:
+            if now - self._synced_at < self.sync_interval:
+                return
+            self._synced_at = now  # 동기화 중인 다른 요청은 기다리지 않고 현재 필터를 사용
+
+            if self._pending is None and (self._bloom is None or now - self._built_at >= self.rebuild_interval):
+                self._pending = []
+                threading.Thread(target=self._rebuild_in_background, name="token-blacklist-filter", daemon=True).start()
+            if self._bloom is not None:
+                self._catch_up()
+
+    def _catch_up(self):
+        """마지막 조회 SYNC_LAG 전의 워터마크 이후 행을 읽어 반영 (lock 안에서 호출)"""
+        index = bisect.bisect_right(self._watermarks, (self._read_at - self.sync_lag, math.inf)) - 1
+        floor = self._watermarks[index][1] if index >= 0 else 0
+        del self._watermarks[: max(index, 0)]
+
+        read_at = time.time()
+        max_id = floor
+        for row_id, jti in (
+            BlacklistedToken.objects.filter(id__gt=floor).values_list("id", "token__jti").iterator(chunk_size=10_000)
+        ):
+            self._bloom.add(jti)
+            max_id = max(max_id, row_id)
+        self._watermarks.append((read_at, max_id))
+        self._read_at = read_at
+
+
+@lru_cache(maxsize=None)
+def get_blacklist_filter() -> BlacklistFilter:
+    conf = settings.TOKEN_BLACKLIST_FILTER
+    return BlacklistFilter(
+        capacity=conf["CAPACITY"],
+        error_rate=conf["ERROR_RATE"],
+        sync_interval=conf["SYNC_INTERVAL"],
+        rebuild_interval=conf["REBUILD_INTERVAL"],
+        sync_lag=conf["SYNC_LAG"],
+    )
+
+
+@receiver(setting_changed)
+def reset_blacklist_filter(*, setting, **kwargs):
+    if setting == "TOKEN_BLACKLIST_FILTER":
+        get_blacklist_filter.cache_clear()
+
+
+class FilteredRefreshToken(RefreshToken):
+    """블랙리스트 조회 전에 Bloom filter를 확인하는 RefreshToken"""
+
+    def check_blacklist(self):
+        if not settings.TOKEN_BLACKLIST_FILTER["ENABLED"]:
+            return super().check_blacklist()
+
+        if get_blacklist_filter().might_contain(self.payload[api_settings.JTI_CLAIM]):
+            metrics.incr("token_blacklist.filter.db_checks")
+            return super().check_blacklist()
+        metrics.incr("token_blacklist.filter.skipped")
+
+    def blacklist(self):
+        result = super().blacklist()
+        if settings.TOKEN_BLACKLIST_FILTER["ENABLED"]:
+            get_blacklist_filter().add(self.payload[api_settings.JTI_CLAIM])
+        return result
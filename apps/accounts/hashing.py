@@ -0,0 +1,91 @@
+"""
+비밀번호 해싱 전용 스레드 풀
+
+해시 함수(PBKDF2 등)는 의도적으로 느리고 GIL을 놓고 실행되므로, 요청 스레드/이벤트 루프 대신 고정 크기 풀에서 실행한다.
+- 실행 중 + 대기 중 작업이 MAX_PENDING을 넘으면 기다리지 않고 PasswordHashBusy(503, Retry-After) 발생
+- 로그인 폭주가 와도 다른 엔드포인트는 워커를 그대로 사용
+"""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+from django.conf import settings
+from django.contrib.auth import hashers
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+from apps.common.metrics import metrics
+
+
+class PasswordHashBusy(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = "요청이 많아 잠시 후 다시 시도해 주세요."
+    default_code = "password_hash_busy"
+
+    def __init__(self, wait):
+        super().__init__()
+        self.wait = wait  # DRF가 Retry-After 헤더로 내려줌
+
+
+class PasswordHashPool:
+    def __init__(self, max_workers, max_pending, retry_after):
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="password-hash")
+        self.retry_after = retry_after
+        self._slots = threading.BoundedSemaphore(max_pending)
+
+    async def run(self, func, *args):
+        if not self._slots.acquire(blocking=False):
+            metrics.incr("password_hash.rejected")
+            raise PasswordHashBusy(self.retry_after)
+
+        started = time.perf_counter()
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self.executor, func, *args)
+        finally:
+            self._slots.release()
+            metrics.observe("password_hash", time.perf_counter() - started)
+
+    async def make_password(self, raw_password):
+        return await self.run(hashers.make_password, raw_password)
+
+    async def check_password(self, raw_password, encoded):
+        """
+        (일치 여부, 새 해시) 반환
+        - 해셔 설정이 바뀌어 재해싱이 필요하면 새 해시를 함께 반환 (저장은 호출 측에서)
+        - encoded가 None(없는 유저)이면 시간 차로 계정 존재가 드러나지 않도록 해싱만 한 번 수행
+        """
+        if encoded is None:
+            await self.make_password(raw_password)
+            return False, None
+
+        def check():
+            upgraded = []
+            matched = hashers.check_password(
+                raw_password, encoded, setter=lambda raw: upgraded.append(hashers.make_password(raw))
+            )
+            return matched, upgraded[0] if upgraded else None
+
+        return await self.run(check)
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+@lru_cache(maxsize=None)
+def get_hash_pool() -> PasswordHashPool:
+    conf = settings.PASSWORD_HASH_POOL
+    return PasswordHashPool(
+        max_workers=conf["MAX_WORKERS"], max_pending=conf["MAX_PENDING"], retry_after=conf["RETRY_AFTER"]
+    )
+
+
+@receiver(setting_changed)
+def reset_hash_pool(*, setting, **kwargs):
+    if setting == "PASSWORD_HASH_POOL" and get_hash_pool.cache_info().currsize:
+        get_hash_pool().shutdown()
+        get_hash_pool.cache_clear()
@@ -0,0 +1,81 @@
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from rest_framework_simplejwt.token_blacklist.models import (
+    BlacklistedToken,
+    OutstandingToken,
+)
+from rest_framework_simplejwt.utils import aware_utcnow
+
+from apps.accounts.models import RefreshTokenLog
+
+
+class Command(BaseCommand):
+    """
+    만료된 OutstandingToken / BlacklistedToken / RefreshTokenLog를 일정 크기씩 나눠 삭제 (cron 등으로 주기 실행)
+
+    - expires_at 에는 인덱스가 없으므로 PK 순으로 배치를 읽어 만료된 행만 삭제
+    - 토큰 수명이 일정해 PK 순서가 곧 만료 순서이므로, 만료된 행이 없는 배치를 만나면 종료
+    - RefreshTokenLog는 만료 후 REFRESH_TOKEN_LOG_RETENTION_DAYS가 지난 행을 expired_at 인덱스로 찾아 삭제
+    """
+
+    help = "만료된 refresh 토큰(outstanding / blacklisted)과 세션 기록을 배치 단위로 삭제합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=5000, help="한 트랜잭션에서 삭제할 최대 행 수")
+        parser.add_argument("--sleep", type=float, default=0.0, help="배치 사이 대기 시간(초), DB 부하 조절용")
+        parser.add_argument("--max-batches", type=int, default=None, help="이번 실행에서 처리할 최대 배치 수")
+
+    def handle(self, *args, batch_size, sleep, max_batches, **options):
+        now = aware_utcnow()
+        deleted, batches = self.prune_outstanding(now, batch_size, sleep, max_batches)
+        self.stdout.write(f"만료된 토큰 {deleted}개를 삭제했습니다. (배치 {batches}회)")
+
+        cutoff = now - timedelta(days=settings.REFRESH_TOKEN_LOG_RETENTION_DAYS)
+        deleted, batches = self.prune_session_logs(cutoff, batch_size, sleep, max_batches)
+        self.stdout.write(f"보관 기간이 지난 세션 기록 {deleted}개를 삭제했습니다. (배치 {batches}회)")
+
+    def prune_outstanding(self, now, batch_size, sleep, max_batches):
+        cursor = 0
+        batches = deleted = 0
+
+        while max_batches is None or batches < max_batches:
+            rows = list(
+                OutstandingToken.objects.filter(id__gt=cursor)
+                .order_by("id")
+                .values_list("id", "expires_at")[:batch_size]
+            )
+            expired_ids = [row_id for row_id, expires_at in rows if expires_at <= now]
+            if not expired_ids:
+                break
+
+            with transaction.atomic():
+                BlacklistedToken.objects.filter(token_id__in=expired_ids).delete()
+                OutstandingToken.objects.filter(id__in=expired_ids).delete()
+
+            cursor = rows[-1][0]
+            batches += 1
+            deleted += len(expired_ids)
+            if sleep:
+                time.sleep(sleep)
+
+        return deleted, batches
+
+    def prune_session_logs(self, cutoff, batch_size, sleep, max_batches):
+        batches = deleted = 0
+
+        while max_batches is None or batches < max_batches:
+            ids = list(RefreshTokenLog.objects.filter(expired_at__lte=cutoff).values_list("id", flat=True)[:batch_size])
+            if not ids:
+                break
+
+            RefreshTokenLog.objects.filter(id__in=ids).delete()
+            batches += 1
+            deleted += len(ids)
+            if sleep:
+                time.sleep(sleep)
+
+        return deleted, batches
@@ -0,0 +1,56 @@
+import django.utils.timezone
+from django.db import migrations, models
+
+
+def delete_raw_token_rows(apps, schema_editor):
+    # 기존 행은 원본 토큰만 담고 있고 어디서도 쓰이지 않았으므로 jti 해시 키로 옮기지 않고 삭제
+    apps.get_model("accounts", "RefreshTokenLog").objects.all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0002_refreshtokenlog"),
+    ]
+
+    operations = [
+        migrations.RunPython(delete_raw_token_rows, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name="refreshtokenlog",
+            name="token",
+        ),
+        migrations.AddField(
+            model_name="refreshtokenlog",
+            name="jti_hash",
+            field=models.CharField(default="", help_text="refresh 토큰 jti의 SHA-256 hex", max_length=64, unique=True),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name="refreshtokenlog",
+            name="event",
+            field=models.CharField(
+                choices=[("login", "로그인"), ("refresh", "재발급")], default="login", max_length=10
+            ),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name="refreshtokenlog",
+            name="user_agent",
+            field=models.CharField(blank=True, max_length=255),
+        ),
+        migrations.AddField(
+            model_name="refreshtokenlog",
+            name="ip_address",
+            field=models.GenericIPAddressField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name="refreshtokenlog",
+            name="expired_at",
+            field=models.DateTimeField(db_index=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+        migrations.AddIndex(
+            model_name="refreshtokenlog",
+            index=models.Index(fields=["user", "is_revoked", "expired_at"], name="refreshlog_user_active_idx"),
+        ),
+    ]
@@ -4,12 +4,15 @@ from django.db import models
 
 # UserManager를 통해 사용자 생성 로직 정의
 class UserManager(BaseUserManager):
-    def create_user(self, email, username, password=None):
+    def create_user(self, email, username, password=None, password_hash=None):
         if not email:
             raise ValueError("The Email field must be set")
         email = self.normalize_email(email)
         user = self.model(email=email, username=username)
-        user.set_password(password)  # 비밀번호 암호화
+        if password_hash:
+            user.password = password_hash  # 해싱 풀에서 미리 계산된 해시
+        else:
+            user.set_password(password)  # 비밀번호 암호화
         user.save(using=self._db)
         return user
 
@@ -41,8 +44,26 @@ class User(AbstractBaseUser):
 
 
 class RefreshTokenLog(models.Model):
+    """
+    refresh 토큰 발급 이력 (로그인 / 재발급 한 건 = 세션 한 건)
+    - 원본 토큰 대신 jti의 SHA-256만 고정 길이 키로 저장
+    - 활성 세션: is_revoked=False 이고 expired_at이 지나지 않은 행
+    """
+
+    class Event(models.TextChoices):
+        LOGIN = "login", "로그인"
+        REFRESH = "refresh", "재발급"
+
     user = models.ForeignKey("accounts.User", on_delete=models.CASCADE)
-    token = models.TextField()
+    jti_hash = models.CharField(max_length=64, unique=True, help_text="refresh 토큰 jti의 SHA-256 hex")
+    event = models.CharField(max_length=10, choices=Event.choices)
+    user_agent = models.CharField(max_length=255, blank=True)
+    ip_address = models.GenericIPAddressField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
-    expired_at = models.DateTimeField(null=True, blank=True)
+    expired_at = models.DateTimeField(db_index=True)
     is_revoked = models.BooleanField(default=False)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["user", "is_revoked", "expired_at"], name="refreshlog_user_active_idx"),
+        ]
@@ -2,6 +2,10 @@
 
 from django.contrib.auth import get_user_model
 from rest_framework import serializers
+from rest_framework_simplejwt.serializers import TokenRefreshSerializer
+
+from .blacklist import FilteredRefreshToken
+from .models import RefreshTokenLog
 
 User = get_user_model()
 
@@ -19,9 +23,30 @@ class RegisterSerializer(serializers.ModelSerializer):
         return value
 
     def create(self, validated_data):
+        # password_hash: 뷰에서 해싱 풀로 계산해 save(password_hash=...)로 전달
         return User.objects.create_user(**validated_data)
 
 
 class LoginSerializer(serializers.Serializer):
     email = serializers.EmailField()
     password = serializers.CharField(write_only=True)
+
+
+class CookieTokenRefreshSerializer(TokenRefreshSerializer):
+    # 블랙리스트 조회 전에 Bloom filter를 확인
+    token_class = FilteredRefreshToken
+
+
+class SessionSerializer(serializers.ModelSerializer):
+    """
+    활성 세션 목록용 (context["current_jti_hash"]로 현재 세션 표시)
+    """
+
+    is_current = serializers.SerializerMethodField()
+
+    class Meta:
+        model = RefreshTokenLog
+        fields = ["id", "event", "user_agent", "ip_address", "created_at", "expired_at", "is_current"]
+
+    def get_is_current(self, obj):
+        return obj.jti_hash == self.context.get("current_jti_hash")
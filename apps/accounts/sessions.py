@@ -0,0 +1,78 @@
+"""
+RefreshTokenLog 기반 세션 기록 / 조회 / 일괄 폐기
+"""
+
+import hashlib
+from datetime import datetime, timezone
+
+from django.conf import settings
+from django.db import transaction
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.token_blacklist.models import (
+    BlacklistedToken,
+    OutstandingToken,
+)
+from rest_framework_simplejwt.utils import aware_utcnow
+
+from .blacklist import get_blacklist_filter
+from .models import RefreshTokenLog
+
+
+def hash_jti(jti):
+    return hashlib.sha256(jti.encode()).hexdigest()
+
+
+def record_session(token, event, request, rotated_from=None):
+    """
+    발급된 refresh 토큰을 세션으로 기록
+    - rotated_from: 재발급으로 교체된 이전 토큰의 jti (이전 세션은 폐기 처리)
+    """
+    with transaction.atomic():
+        if rotated_from:
+            RefreshTokenLog.objects.filter(jti_hash=hash_jti(rotated_from)).update(is_revoked=True)
+        return RefreshTokenLog.objects.create(
+            user_id=token[api_settings.USER_ID_CLAIM],
+            jti_hash=hash_jti(token[api_settings.JTI_CLAIM]),
+            event=event,
+            user_agent=request.META.get("HTTP_USER_AGENT", "")[:255],
+            ip_address=request.META.get("REMOTE_ADDR") or None,
+            expired_at=datetime.fromtimestamp(token["exp"], tz=timezone.utc),
+        )
+
+
+def active_sessions(user):
+    return RefreshTokenLog.objects.filter(user=user, is_revoked=False, expired_at__gt=aware_utcnow()).order_by(
+        "-created_at", "-id"
+    )
+
+
+def revoke_session(jti):
+    return RefreshTokenLog.objects.filter(jti_hash=hash_jti(jti), is_revoked=False).update(is_revoked=True)
+
+
+def revoke_other_sessions(user, current_jti):
+    """
+    현재 세션을 제외한 유저의 활성 세션을 UPDATE 한 번으로 폐기하고,
+    해당 refresh 토큰들을 블랙리스트에 일괄 등록해 재발급을 차단
+    """
+    now = aware_utcnow()
+    with transaction.atomic():
+        revoked = (
+            RefreshTokenLog.objects.filter(user=user, is_revoked=False, expired_at__gt=now)
+            .exclude(jti_hash=hash_jti(current_jti))
+            .update(is_revoked=True)
+        )
+        outstanding = list(
+            OutstandingToken.objects.filter(user=user, expires_at__gt=now, blacklistedtoken__isnull=True)
+            .exclude(jti=current_jti)
+            .values_list("id", "jti")
+        )
+        BlacklistedToken.objects.bulk_create(
+            [BlacklistedToken(token_id=token_id) for token_id, _ in outstanding], ignore_conflicts=True
+        )
+
+    if settings.TOKEN_BLACKLIST_FILTER["ENABLED"]:
+        blacklist_filter = get_blacklist_filter()
+        for _, jti in outstanding:
+            blacklist_filter.add(jti)
+    return revoked
@@ -0,0 +1,18 @@
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .authentication import invalidate_cached_user
+
+User = get_user_model()
+
+
+# 비밀번호 변경, is_active 변경, 탈퇴 등 유저가 바뀌면 인증 캐시를 무효화
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_auth_cache(sender, instance, **kwargs):
+    invalidate_cached_user(instance.pk)
+    # 커밋 전 행을 읽은 다른 요청이 새 세대로 캐시했을 수 있으므로 커밋 후 한 번 더
+    user_id = instance.pk
+    transaction.on_commit(lambda: invalidate_cached_user(user_id))
@@ -1,8 +1,35 @@
 # tests/accounts/test_auth.py (pytest 버전)
+import asyncio
+import threading
+import time
+from datetime import timedelta
+from io import StringIO
+
 import pytest
+from asgiref.sync import async_to_sync
 from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import check_password, make_password
+from django.core.management import call_command
+from django.test import override_settings
 from django.urls import reverse
 from rest_framework.test import APIClient
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.token_blacklist.models import (
+    BlacklistedToken,
+    OutstandingToken,
+)
+from rest_framework_simplejwt.utils import aware_utcnow
+
+from apps.accounts.blacklist import (
+    BlacklistFilter,
+    BloomFilter,
+    FilteredRefreshToken,
+    get_blacklist_filter,
+)
+from apps.accounts.hashing import PasswordHashBusy, PasswordHashPool
+from apps.accounts.models import RefreshTokenLog
+from apps.common.metrics import metrics
+from apps.prompts.models import Prompt, PromptListVersion, Tag
 
 User = get_user_model()
 pytestmark = pytest.mark.django_db  # 전체 테스트에서 DB 사용 허용
@@ -110,3 +137,288 @@ def test_delete_account(api_client, create_user):
     response = api_client.delete(reverse("delete_account"))
     assert response.status_code == 204
     assert User.objects.filter(email="delete@example.com").count() == 0
+
+
+# 프롬프트가 있는 유저도 탈퇴 가능 (실제 커밋해 지연된 FK 검사까지 확인)
+@pytest.mark.django_db(transaction=True)
+def test_delete_account_with_prompts(api_client, create_user):
+    user = create_user(email="owner@example.com")
+    for title in ("first", "second"):
+        prompt = Prompt.objects.create(user=user, title=title, content="content")
+        prompt.tags.add(Tag.objects.get_or_create(name="shared")[0])
+    _logged_in_client(api_client, user)
+
+    assert api_client.delete(reverse("delete_account")).status_code == 204
+    assert not User.objects.filter(pk=user.pk).exists()
+    assert not PromptListVersion.objects.filter(user_id=user.pk).exists()
+
+
+# 로그인 후 access_token 쿠키를 설정한 클라이언트
+def _logged_in_client(api_client, user, password="pass1234"):
+    login_response = api_client.post(reverse("login"), data={"email": user.email, "password": password})
+    api_client.cookies["access_token"] = login_response.cookies["access_token"].value
+    return api_client
+
+
+# 같은 토큰의 두 번째 요청부터는 User 조회 없이 캐시로 인증
+def test_authenticated_user_is_cached(api_client, create_user, django_assert_num_queries):
+    client = _logged_in_client(api_client, create_user())
+    metrics.reset()
+
+    assert client.get(reverse("me")).status_code == 200
+    with django_assert_num_queries(0):
+        assert client.get(reverse("me")).status_code == 200
+
+    snapshot = metrics.snapshot()
+    assert snapshot["counters"] == {"auth.user_cache.misses": 1, "auth.user_cache.hits": 1}
+    assert snapshot["timers"]["auth.authenticate"]["count"] == 2
+
+
+# Authorization 헤더로도 인증 가능 (쿠키와 동일한 캐시 사용)
+def test_bearer_header_authentication(api_client, create_user):
+    user = create_user()
+    login_response = api_client.post(reverse("login"), data={"email": user.email, "password": "pass1234"})
+    api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {login_response.cookies['access_token'].value}")
+
+    response = api_client.get(reverse("me"))
+    assert response.status_code == 200
+    assert response.data["email"] == user.email
+
+
+# 유저가 변경되면(비활성화) 캐시가 무효화되어 즉시 반영
+def test_user_cache_invalidated_on_deactivation(api_client, create_user):
+    user = create_user()
+    client = _logged_in_client(api_client, user)
+    assert client.get(reverse("me")).status_code == 200
+
+    user.is_active = False
+    user.save()
+    assert client.get(reverse("me")).status_code == 401
+
+
+# 다른 프로세스(별도의 프로세스 내 유저 캐시)에서 바꾼 유저도 공유 세대 번호로 바로 반영
+def test_user_cache_invalidated_from_other_process(api_client, create_user, settings):
+    user = create_user()
+    client = _logged_in_client(api_client, user)
+    assert client.get(reverse("me")).status_code == 200
+
+    other_process = {**settings.CACHES, "auth_users": {**settings.CACHES["auth_users"], "LOCATION": "other-process"}}
+    with override_settings(CACHES=other_process):
+        user.is_active = False
+        user.save()
+    assert client.get(reverse("me")).status_code == 401
+
+
+# 비밀번호 변경 후에는 캐시된 이전 유저 객체를 재사용하지 않음
+def test_user_cache_invalidated_on_password_change(api_client, create_user, django_assert_num_queries):
+    client = _logged_in_client(api_client, create_user(password="oldpass123"), password="oldpass123")
+    client.put(reverse("change_password"), {"current_password": "oldpass123", "new_password": "newpass456"})
+
+    with django_assert_num_queries(1):
+        assert client.get(reverse("me")).status_code == 200
+
+
+# 비밀번호 확인은 캐시된 유저가 아니라 현재 행 기준, 저장은 비밀번호 컬럼만
+def test_change_password_rereads_user_row(api_client, create_user):
+    user = create_user(password="oldpass123")
+    client = _logged_in_client(api_client, user, password="oldpass123")
+    assert client.get(reverse("me")).status_code == 200  # 인증 캐시에 유저 저장
+
+    # 시그널 없이 바뀐 행 (다른 요청이 먼저 비밀번호 / 이름을 바꾼 경우)
+    User.objects.filter(pk=user.pk).update(password=make_password("otherpass789"), username="renamed")
+    data = {"current_password": "oldpass123", "new_password": "newpass456"}
+    assert client.put(reverse("change_password"), data).status_code == 400
+
+    data = {"current_password": "otherpass789", "new_password": "newpass456"}
+    assert client.put(reverse("change_password"), data).status_code == 200
+    user.refresh_from_db()
+    assert user.username == "renamed" and user.check_password("newpass456")
+
+
+# Bloom filter 상태가 테스트 사이에 남지 않도록 초기화 (백그라운드 스레드 대신 테스트 트랜잭션 안에서 바로 생성)
+@pytest.fixture
+def blacklist_filter():
+    get_blacklist_filter.cache_clear()
+    blacklist_filter = get_blacklist_filter()
+    blacklist_filter.rebuild()
+    yield blacklist_filter
+    get_blacklist_filter.cache_clear()
+
+
+# Bloom filter는 추가한 값을 항상 포함한다고 답해야 함 (false negative 없음)
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    items = [f"jti-{i}" for i in range(1000)]
+    for item in items:
+        bloom.add(item)
+    assert all(item in bloom for item in items)
+    assert sum(f"other-{i}" in bloom for i in range(1000)) < 50
+
+
+# 재발급으로 블랙리스트에 오른 refresh 토큰은 재사용 불가, 새 토큰은 DB 조회 없이 통과
+def test_refresh_token_rotation_uses_blacklist_filter(api_client, create_user, blacklist_filter):
+    create_user(email="test@naver.com", password="pass1234")
+    api_client.post(reverse("login"), data={"email": "test@naver.com", "password": "pass1234"})
+    old_refresh = api_client.cookies["refresh_token"].value
+
+    metrics.reset()
+    res = api_client.post(reverse("token_refresh"))
+    assert res.status_code == 200
+    assert metrics.snapshot()["counters"]["token_blacklist.filter.skipped"] == 1
+
+    api_client.cookies["refresh_token"] = old_refresh
+    res = api_client.post(reverse("token_refresh"))
+    assert res.status_code == 401
+    assert metrics.snapshot()["counters"]["token_blacklist.filter.db_checks"] == 1
+
+
+# 다른 프로세스가 등록한 블랙리스트도 동기화 후 반영
+def test_blacklist_filter_syncs_rows_written_elsewhere(create_user, blacklist_filter):
+    user = create_user()
+    token = FilteredRefreshToken.for_user(user)
+    jti = token.payload["jti"]
+    assert not blacklist_filter.might_contain(jti)
+
+    BlacklistedToken.objects.create(token=OutstandingToken.objects.get(jti=jti))
+    blacklist_filter._synced_at = 0.0
+    assert blacklist_filter.might_contain(jti)
+    with pytest.raises(TokenError):
+        FilteredRefreshToken(str(token))
+
+
+# 필터가 준비되기 전에는 모든 토큰을 DB에서 확인
+def test_blacklist_filter_falls_back_to_db_until_built(create_user, monkeypatch):
+    monkeypatch.setattr(BlacklistFilter, "_rebuild_in_background", lambda self: None)
+    get_blacklist_filter.cache_clear()
+    token = FilteredRefreshToken.for_user(create_user())
+    BlacklistedToken.objects.create(token=OutstandingToken.objects.get(jti=token.payload["jti"]))
+
+    metrics.reset()
+    assert get_blacklist_filter().might_contain("unknown-jti")
+    with pytest.raises(TokenError):
+        FilteredRefreshToken(str(token))
+    assert metrics.snapshot()["counters"]["token_blacklist.filter.db_checks"] == 1
+    get_blacklist_filter.cache_clear()
+
+
+# 이미 읽은 id보다 작은 id가 늦게 커밋돼도 SYNC_LAG 이내면 다음 동기화에서 반영
+def test_blacklist_filter_syncs_late_committed_rows(create_user, blacklist_filter):
+    user = create_user()
+    early, late = FilteredRefreshToken.for_user(user), FilteredRefreshToken.for_user(user)
+    BlacklistedToken.objects.create(id=2000, token=OutstandingToken.objects.get(jti=late.payload["jti"]))
+    blacklist_filter._synced_at = 0.0
+    assert blacklist_filter.might_contain(late.payload["jti"])
+
+    # 더 작은 id를 먼저 받은 트랜잭션이 이제야 커밋된 경우
+    BlacklistedToken.objects.create(id=1000, token=OutstandingToken.objects.get(jti=early.payload["jti"]))
+    blacklist_filter._synced_at = 0.0
+    assert blacklist_filter.might_contain(early.payload["jti"])
+
+
+# 만료된 토큰만 배치 단위로 삭제, 블랙리스트 행도 함께 삭제
+def test_prune_tokens_deletes_only_expired(create_user):
+    user = create_user()
+    now = aware_utcnow()
+    expired = [
+        OutstandingToken.objects.create(user=user, jti=f"old-{i}", token="", expires_at=now - timedelta(days=1))
+        for i in range(5)
+    ]
+    live = OutstandingToken.objects.create(user=user, jti="live", token="", expires_at=now + timedelta(days=1))
+    BlacklistedToken.objects.create(token=expired[0])
+    BlacklistedToken.objects.create(token=live)
+
+    out = StringIO()
+    call_command("prune_tokens", batch_size=2, stdout=out)
+
+    assert list(OutstandingToken.objects.values_list("jti", flat=True)) == ["live"]
+    assert list(BlacklistedToken.objects.values_list("token__jti", flat=True)) == ["live"]
+    assert "5개" in out.getvalue()
+
+
+# 로그인 / 재발급이 세션으로 기록되고, 재발급된 이전 세션은 폐기됨
+def test_login_and_refresh_record_sessions(api_client, create_user):
+    user = create_user(email="test@naver.com", password="pass1234")
+    api_client.post(reverse("login"), data={"email": "test@naver.com", "password": "pass1234"})
+    login_log = RefreshTokenLog.objects.get(user=user)
+    assert login_log.event == RefreshTokenLog.Event.LOGIN
+    assert len(login_log.jti_hash) == 64
+
+    res = api_client.post(reverse("token_refresh"))
+    api_client.cookies["refresh_token"] = res.data["refresh"]
+
+    login_log.refresh_from_db()
+    assert login_log.is_revoked
+    res = api_client.get(reverse("sessions"))
+    assert res.status_code == 200
+    assert [(s["event"], s["is_current"]) for s in res.data] == [("refresh", True)]
+
+
+# 다른 세션 일괄 폐기: 다른 기기의 refresh 토큰은 더 이상 재발급 불가
+def test_revoke_other_sessions(create_user):
+    create_user(email="test@naver.com", password="pass1234")
+    devices = [APIClient() for _ in range(3)]
+    for client in devices:
+        client.post(reverse("login"), data={"email": "test@naver.com", "password": "pass1234"})
+
+    res = devices[0].post(reverse("revoke_other_sessions"))
+    assert res.status_code == 200
+    assert res.data["revoked"] == 2
+
+    assert [s["is_current"] for s in devices[0].get(reverse("sessions")).data] == [True]
+    assert devices[1].post(reverse("token_refresh")).status_code == 401
+    assert devices[0].post(reverse("token_refresh")).status_code == 200
+
+
+# 보관 기간이 지난 세션 기록만 정리
+def test_prune_tokens_deletes_old_session_logs(create_user, settings):
+    settings.REFRESH_TOKEN_LOG_RETENTION_DAYS = 30
+    user = create_user()
+    now = aware_utcnow()
+    for i, days in enumerate([-40, -10, 1]):
+        RefreshTokenLog.objects.create(
+            user=user, jti_hash=f"{i:064d}", event="login", expired_at=now + timedelta(days=days)
+        )
+
+    call_command("prune_tokens", stdout=StringIO())
+
+    assert RefreshTokenLog.objects.count() == 2
+
+
+# 해싱 풀이 가득 차면 기다리지 않고 503 + Retry-After
+def test_login_fails_fast_when_hash_pool_is_full(api_client, create_user, settings):
+    create_user(email="test@naver.com", password="pass1234")
+    settings.PASSWORD_HASH_POOL = {"MAX_WORKERS": 1, "MAX_PENDING": 0, "RETRY_AFTER": 3}
+
+    res = api_client.post(reverse("login"), data={"email": "test@naver.com", "password": "pass1234"})
+    assert res.status_code == 503
+    assert res["Retry-After"] == "3"
+    assert "access_token" not in res.cookies
+
+
+# 실행 중 + 대기 중 작업 수 제한, 작업이 끝나면 다시 받음
+def test_hash_pool_limits_pending_work():
+    pool = PasswordHashPool(max_workers=1, max_pending=1, retry_after=1)
+    release = threading.Event()
+
+    async def scenario():
+        running = asyncio.ensure_future(pool.run(release.wait))
+        await asyncio.sleep(0.05)
+        with pytest.raises(PasswordHashBusy):
+            await pool.run(time.sleep, 0)
+        release.set()
+        await running
+        return await pool.make_password("pass1234")
+
+    try:
+        assert check_password("pass1234", async_to_sync(scenario)())
+    finally:
+        pool.shutdown()
+
+
+# 로그인 실패 메시지는 기존과 동일, 없는 이메일도 같은 응답
+def test_login_failure_for_wrong_password_and_unknown_email(api_client, create_user):
+    create_user(email="test@naver.com", password="pass1234")
+    wrong = api_client.post(reverse("login"), data={"email": "test@naver.com", "password": "nope"})
+    unknown = api_client.post(reverse("login"), data={"email": "none@naver.com", "password": "pass1234"})
+    assert wrong.status_code == unknown.status_code == 401
+    assert wrong.data == unknown.data
@@ -10,6 +10,8 @@ from .views import (
     LoginView,
     MeView,
     RegisterView,
+    RevokeOtherSessionsView,
+    SessionListView,
 )
 
 urlpatterns = [
@@ -19,4 +21,6 @@ urlpatterns = [
     path("me/", MeView.as_view(), name="me"),
     path("change-password/", ChangePasswordView.as_view(), name="change_password"),
     path("delete/", DeleteAccountView.as_view(), name="delete_account"),
+    path("sessions/", SessionListView.as_view(), name="sessions"),
+    path("sessions/revoke-others/", RevokeOtherSessionsView.as_view(), name="revoke_other_sessions"),
 ]
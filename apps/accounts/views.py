@@ -1,28 +1,55 @@
 # apps/accounts/views.py
 
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
 from django.db import DatabaseError, IntegrityError
 from rest_framework import status
 from rest_framework.exceptions import AuthenticationFailed, ValidationError
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from rest_framework_simplejwt.tokens import RefreshToken
-from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
-
-from .serializers import RegisterSerializer
-
-
-class RegisterView(APIView):
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.serializers import TokenObtainSerializer
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.views import TokenRefreshView
+
+from apps.common.db import ReplicaReadMixin
+from apps.common.views import AsyncAPIView
+
+from .blacklist import FilteredRefreshToken
+from .hashing import PasswordHashBusy, get_hash_pool
+from .models import RefreshTokenLog
+from .serializers import (
+    CookieTokenRefreshSerializer,
+    LoginSerializer,
+    RegisterSerializer,
+    SessionSerializer,
+)
+from .sessions import (
+    active_sessions,
+    hash_jti,
+    record_session,
+    revoke_other_sessions,
+    revoke_session,
+)
+
+User = get_user_model()
+
+
+class RegisterView(AsyncAPIView):
     """
-    회원가입 처리
+    회원가입 처리 (비밀번호 해싱은 해싱 풀에서 실행)
     """
 
-    def post(self, request):
+    async def post(self, request):
         serializer = RegisterSerializer(data=request.data)
         try:
-            serializer.is_valid(raise_exception=True)
-            serializer.save()
+            await sync_to_async(serializer.is_valid)(raise_exception=True)
+            password_hash = await get_hash_pool().make_password(serializer.validated_data["password"])
+            await sync_to_async(serializer.save)(password_hash=password_hash)
             return Response({"message": "회원가입 되었습니다."}, status=status.HTTP_201_CREATED)
+        except PasswordHashBusy:
+            raise
         except ValidationError as e:
             return Response(e.detail, status=status.HTTP_400_BAD_REQUEST)
         except IntegrityError:
@@ -37,24 +64,48 @@ class RegisterView(APIView):
             )
 
 
-class LoginView(TokenObtainPairView):
+class LoginView(AsyncAPIView):
     """
     로그인 처리 (Access / Refresh 토큰을 쿠키로 저장)
+    - 비밀번호 검증은 해싱 풀에서 실행해 로그인 폭주 중에도 다른 요청이 워커를 사용할 수 있게 함
     """
 
-    def post(self, request, *args, **kwargs):
-        response = super().post(request, *args, **kwargs)
-        refresh = response.data.get("refresh")
-        access = response.data.get("access")
-
-        response.data.clear()
-        response.data["message"] = "로그인 성공"
-
-        response.set_cookie("access_token", access, httponly=True, secure=True, samesite="Strict", max_age=1800)
-        response.set_cookie("refresh_token", refresh, httponly=True, secure=True, samesite="Strict", max_age=604800)
-
+    authentication_classes = ()
+    permission_classes = [AllowAny]
+
+    def get_authenticate_header(self, request):
+        # 인증 실패를 403이 아닌 401로 응답 (TokenObtainPairView와 동일)
+        return f'{api_settings.AUTH_HEADER_TYPES[0]} realm="api"'
+
+    async def post(self, request):
+        serializer = LoginSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        email, password = serializer.validated_data["email"], serializer.validated_data["password"]
+
+        user = await User.objects.filter(email=email).afirst()
+        matched, upgraded_hash = await get_hash_pool().check_password(password, user.password if user else None)
+        if not matched or not user.is_active:
+            raise AuthenticationFailed(TokenObtainSerializer.default_error_messages["no_active_account"])
+
+        if upgraded_hash:
+            await User.objects.filter(pk=user.pk).aupdate(password=upgraded_hash)
+        refresh = await sync_to_async(self.issue_tokens)(request, user)
+
+        response = Response({"message": "로그인 성공"}, status=status.HTTP_200_OK)
+        response.set_cookie(
+            "access_token", str(refresh.access_token), httponly=True, secure=True, samesite="Strict", max_age=1800
+        )
+        response.set_cookie(
+            "refresh_token", str(refresh), httponly=True, secure=True, samesite="Strict", max_age=604800
+        )
         return response
 
+    @staticmethod
+    def issue_tokens(request, user):
+        refresh = FilteredRefreshToken.for_user(user)
+        record_session(refresh, RefreshTokenLog.Event.LOGIN, request)
+        return refresh
+
 
 class LogoutView(APIView):
     """
@@ -69,8 +120,9 @@ class LogoutView(APIView):
             return Response({"message": "Refresh token이 없습니다."}, status=status.HTTP_400_BAD_REQUEST)
 
         try:
-            token = RefreshToken(refresh_token)
+            token = FilteredRefreshToken(refresh_token)
             token.blacklist()
+            revoke_session(token[api_settings.JTI_CLAIM])
         except Exception:
             return Response({"message": "토큰 블랙리스트 등록 실패"}, status=status.HTTP_400_BAD_REQUEST)
 
@@ -80,9 +132,10 @@ class LogoutView(APIView):
         return res
 
 
-class MeView(APIView):
+class MeView(ReplicaReadMixin, APIView):
     """
     로그인된 사용자 정보 조회
+    - 인증(유저 조회)은 default에서 하고, 핸들러 안의 조회만 읽기 복제본으로 보냄
     """
 
     permission_classes = [IsAuthenticated]
@@ -92,20 +145,23 @@ class MeView(APIView):
         return Response({"email": user.email, "username": user.username}, status=status.HTTP_200_OK)
 
 
-class ChangePasswordView(APIView):
+class ChangePasswordView(AsyncAPIView):
     """
-    비밀번호 변경
+    비밀번호 변경 (검증 / 해싱은 해싱 풀에서 실행)
     """
 
     permission_classes = [IsAuthenticated]
 
-    def put(self, request):
-        user = request.user
-        if not user.check_password(request.data.get("current_password")):
+    async def put(self, request):
+        # request.user는 인증 캐시의 객체일 수 있으므로 현재 행을 다시 읽어 비밀번호를 확인하고, 비밀번호만 저장
+        user = await User.objects.aget(pk=request.user.pk)
+        hash_pool = get_hash_pool()
+        matched, _ = await hash_pool.check_password(request.data.get("current_password"), user.password)
+        if not matched:
             return Response({"message": "현재 비밀번호가 틀렸습니다."}, status=status.HTTP_400_BAD_REQUEST)
 
-        user.set_password(request.data.get("new_password"))
-        user.save()
+        user.password = await hash_pool.make_password(request.data.get("new_password"))
+        await user.asave(update_fields=["password"])
         return Response({"message": "비밀번호가 변경되었습니다."}, status=status.HTTP_200_OK)
 
 
@@ -126,6 +182,8 @@ class CookieTokenRefreshView(TokenRefreshView):
     쿠키 기반 토큰 재발급
     """
 
+    serializer_class = CookieTokenRefreshSerializer
+
     def post(self, request, *args, **kwargs):
         refresh_token = request.COOKIES.get("refresh_token")
         if not refresh_token:
@@ -137,4 +195,58 @@ class CookieTokenRefreshView(TokenRefreshView):
         except Exception:
             raise AuthenticationFailed("유효하지 않은 refresh token입니다.")
 
+        rotated = serializer.validated_data.get("refresh")
+        if rotated:
+            previous = FilteredRefreshToken(refresh_token, verify=False)
+            record_session(
+                FilteredRefreshToken(rotated, verify=False),
+                RefreshTokenLog.Event.REFRESH,
+                request,
+                rotated_from=previous[api_settings.JTI_CLAIM],
+            )
+
         return Response(serializer.validated_data, status=status.HTTP_200_OK)
+
+
+def _current_refresh_jti(request):
+    """refresh_token 쿠키의 jti (없거나 유효하지 않으면 None)"""
+    refresh_token = request.COOKIES.get("refresh_token")
+    if not refresh_token:
+        return None
+    try:
+        return FilteredRefreshToken(refresh_token)[api_settings.JTI_CLAIM]
+    except TokenError:
+        return None
+
+
+class SessionListView(APIView):
+    """
+    내 활성 세션 목록 (폐기되지 않고 만료 전인 refresh 토큰)
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        current_jti = _current_refresh_jti(request)
+        serializer = SessionSerializer(
+            active_sessions(request.user),
+            many=True,
+            context={"current_jti_hash": hash_jti(current_jti) if current_jti else None},
+        )
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
+
+class RevokeOtherSessionsView(APIView):
+    """
+    현재 세션(refresh_token 쿠키)을 제외한 모든 세션 폐기
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        current_jti = _current_refresh_jti(request)
+        if not current_jti:
+            return Response({"message": "유효한 Refresh token이 없습니다."}, status=status.HTTP_400_BAD_REQUEST)
+
+        revoked = revoke_other_sessions(request.user, current_jti)
+        return Response({"message": "다른 세션이 모두 종료되었습니다.", "revoked": revoked}, status=status.HTTP_200_OK)
@@ -0,0 +1,53 @@
+"""
+클라이언트 연결 끊김을 알려주는 ASGI 핸들러
+
+- Django 4.2의 ASGIHandler는 요청 본문을 읽은 뒤에는 receive()를 다시 부르지 않으므로 스트리밍 응답 도중
+  클라이언트가 끊어도 알 수 없고, 서버(uvicorn 등)는 끊긴 뒤의 send를 조용히 버림
+- 본문을 다 읽으면 receive()를 기다리는 태스크를 띄워 http.disconnect가 오면 scope의 Event를 설정
+- 뷰는 client_disconnected(request)로 확인 (WSGI / 테스트 클라이언트 요청이면 항상 False)
+"""
+
+import asyncio
+
+import django
+from django.core.handlers.asgi import ASGIHandler
+
+DISCONNECT_SCOPE_KEY = "promptbook.disconnected"
+
+
+class DisconnectAwareASGIHandler(ASGIHandler):
+    async def handle(self, scope, receive, send):
+        disconnected = asyncio.Event()
+        scope = {**scope, DISCONNECT_SCOPE_KEY: disconnected}
+        watcher = None
+
+        async def watch_disconnect():
+            while (await receive())["type"] != "http.disconnect":
+                pass
+            disconnected.set()
+
+        async def receive_body():
+            nonlocal watcher
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                disconnected.set()
+            elif not message.get("more_body", False):
+                watcher = asyncio.create_task(watch_disconnect())
+            return message
+
+        try:
+            await super().handle(scope, receive_body, send)
+        finally:
+            if watcher is not None:
+                watcher.cancel()
+
+
+def get_asgi_application():
+    """django.core.asgi.get_asgi_application()과 같되 DisconnectAwareASGIHandler를 반환"""
+    django.setup(set_prefix=False)
+    return DisconnectAwareASGIHandler()
+
+
+def client_disconnected(request):
+    event = getattr(request, "scope", {}).get(DISCONNECT_SCOPE_KEY)
+    return event is not None and event.is_set()
@@ -0,0 +1,81 @@
+"""
+조건부 요청 (ETag / Last-Modified)
+
+- GET / HEAD: If-None-Match(우선) 또는 If-Modified-Since가 현재 값과 같으면 본문 없이 304
+- PUT / PATCH / DELETE: If-Match 또는 If-Unmodified-Since가 맞지 않으면 PreconditionFailed(412)
+- ETag는 내용이 아니라 버전 값으로 만드는 약한(W/) ETag이며, If-Match도 약한 비교로 판정
+  (같은 버전이면 표현이 달라도 같은 리소스 상태이므로)
+- 수정과 무관하게 바뀌는 표현 값(실행 통계 등)은 variant로 ETag 뒤에 붙이고, If-Match는 그 부분을 빼고 비교
+"""
+
+import hashlib
+
+from django.utils.http import http_date, parse_etags, parse_http_date_safe
+from rest_framework import status
+from rest_framework.exceptions import APIException
+from rest_framework.response import Response
+
+
+class PreconditionFailed(APIException):
+    status_code = status.HTTP_412_PRECONDITION_FAILED
+    default_detail = "다른 요청이 먼저 변경했습니다. 다시 조회한 뒤 시도해 주세요."
+    default_code = "precondition_failed"
+
+
+def _digest(parts, size):
+    return hashlib.blake2b(":".join(map(str, parts)).encode(), digest_size=size).hexdigest()
+
+
+def make_etag(*parts, variant=None):
+    digest = _digest(parts, 12)
+    if variant is not None:
+        digest = f"{digest}.{_digest(variant, 6)}"
+    return f'W/"{digest}"'
+
+
+def _opaque(tag, ignore_variant=False):
+    tag = tag.removeprefix("W/")
+    return tag.strip('"').partition(".")[0] if ignore_variant else tag
+
+
+def _etag_matches(header, etag, ignore_variant=False):
+    tags = parse_etags(header)
+    current = _opaque(etag, ignore_variant)
+    return "*" in tags or any(_opaque(tag, ignore_variant) == current for tag in tags)
+
+
+def _not_newer(header, last_modified):
+    since = parse_http_date_safe(header)
+    return since is not None and last_modified is not None and int(last_modified.timestamp()) <= since
+
+
+def has_validators(request):
+    return "If-None-Match" in request.headers or "If-Modified-Since" in request.headers
+
+
+def is_not_modified(request, etag, last_modified=None):
+    if "If-None-Match" in request.headers:
+        return _etag_matches(request.headers["If-None-Match"], etag)
+    if "If-Modified-Since" in request.headers:
+        return _not_newer(request.headers["If-Modified-Since"], last_modified)
+    return False
+
+
+def check_preconditions(request, etag, last_modified=None):
+    if "If-Match" in request.headers:
+        if not _etag_matches(request.headers["If-Match"], etag, ignore_variant=True):
+            raise PreconditionFailed()
+    elif "If-Unmodified-Since" in request.headers:
+        if not _not_newer(request.headers["If-Unmodified-Since"], last_modified):
+            raise PreconditionFailed()
+
+
+def set_validators(response, etag, last_modified=None):
+    response["ETag"] = etag
+    if last_modified is not None:
+        response["Last-Modified"] = http_date(last_modified.timestamp())
+    return response
+
+
+def not_modified(etag, last_modified=None):
+    return set_validators(Response(status=status.HTTP_304_NOT_MODIFIED), etag, last_modified)
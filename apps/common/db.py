@@ -0,0 +1,112 @@
+"""
+읽기 복제본 라우팅
+
+- ReplicaReadMixin을 쓴 뷰의 GET / HEAD 핸들러 안에서 실행되는 조회만 settings.DATABASE_REPLICAS 중 하나로 보냄
+  (인증 / 권한 확인과 그 밖의 모든 쿼리, 쓰기는 default)
+- 쓰기 요청(POST / PUT / PATCH / DELETE)에 성공한 유저는 REPLICA_PIN_SECONDS 동안 default에서 읽음
+  (복제 지연 때문에 방금 쓴 내용이 안 보이는 일을 막음, 고정 여부는 REPLICA_PIN_CACHE_ALIAS 캐시에 저장)
+- 복제본은 default와 같은 스키마를 복제받으므로 마이그레이션은 default에만 적용
+"""
+
+import random
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.permissions import SAFE_METHODS
+
+from .metrics import metrics
+
+_replica_reads = ContextVar("replica_reads", default=False)
+
+
+def _pin_cache():
+    return caches[settings.REPLICA_PIN_CACHE_ALIAS]
+
+
+def _pin_key(user_id):
+    return f"primary-pin:{user_id}"
+
+
+def is_pinned_to_primary(user_id):
+    return _pin_cache().get(_pin_key(user_id)) is not None
+
+
+def _should_pin(request, response):
+    user = getattr(request, "user", None)
+    return (
+        settings.DATABASE_REPLICAS
+        and request.method not in SAFE_METHODS
+        and response.status_code < 400
+        and user is not None
+        and user.is_authenticated
+    )
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        if _replica_reads.get() and settings.DATABASE_REPLICAS:
+            return random.choice(settings.DATABASE_REPLICAS)
+        return None
+
+    def db_for_write(self, model, **hints):
+        return "default"
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db != "default" and db in settings.DATABASE_REPLICAS:
+            return False
+        return None
+
+
+class ReplicaReadMixin:
+    """GET / HEAD 핸들러의 조회를 복제본으로 보내는 APIView 믹스인 (인증 / 권한 확인 뒤부터 응답 전까지)"""
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if request.method not in SAFE_METHODS or not settings.DATABASE_REPLICAS:
+            return
+        if is_pinned_to_primary(request.user.pk):
+            metrics.incr("db.read.pinned_to_primary")
+            return
+        metrics.incr("db.read.replica")
+        self._replica_token = _replica_reads.set(True)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        token = getattr(self, "_replica_token", None)
+        if token is not None:
+            _replica_reads.reset(token)
+            self._replica_token = None
+        return super().finalize_response(request, response, *args, **kwargs)
+
+
+class PrimaryPinMiddleware:
+    """
+    쓰기 요청에 성공한 유저를 일정 시간 default에 고정
+    - DRF가 인증한 유저는 request.user에도 설정되므로 응답 후에 확인
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        response = self.get_response(request)
+        if _should_pin(request, response):
+            _pin_cache().set(_pin_key(request.user.pk), 1, settings.REPLICA_PIN_SECONDS)
+        return response
+
+    async def __acall__(self, request):
+        response = await self.get_response(request)
+        if _should_pin(request, response):
+            await _pin_cache().aset(_pin_key(request.user.pk), 1, settings.REPLICA_PIN_SECONDS)
+        return response
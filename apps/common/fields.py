@@ -0,0 +1,95 @@
+"""
+압축 저장 TextField
+
+- 저장: UTF-8 기준 settings.TEXT_COMPRESSION_MIN_BYTES 이상인 값만 zlib 압축 후 base64로 바꿔 마커와 함께 저장
+  (컬럼 타입은 그대로 TEXT, 0이면 압축하지 않음)
+- 읽기: DB 값은 CompressedText로 감싸 두기만 하고, 모델 속성에 처음 접근(직렬화 등)할 때 압축 해제
+- .values() / .values_list() 결과에는 CompressedText가 그대로 담김 (str() 또는 DjangoJSONEncoder로 풀림)
+"""
+
+import base64
+import zlib
+
+from django.conf import settings
+from django.db import models
+from django.db.models.query_utils import DeferredAttribute
+from django.utils.functional import Promise
+
+MARKER = "\x1fz1:"
+COMPRESSION_LEVEL = 6
+
+
+def compress_text(value):
+    return MARKER + base64.b64encode(zlib.compress(value.encode(), COMPRESSION_LEVEL)).decode("ascii")
+
+
+def decompress_text(value):
+    if isinstance(value, str) and value.startswith(MARKER):
+        return zlib.decompress(base64.b64decode(value[len(MARKER) :])).decode()
+    return value
+
+
+class CompressedText(Promise):
+    """압축된 DB 값. str()로 처음 변환할 때 한 번만 압축 해제"""
+
+    __slots__ = ("raw", "_text")
+
+    def __init__(self, raw):
+        self.raw = raw
+        self._text = None
+
+    def __str__(self):
+        if self._text is None:
+            self._text = decompress_text(self.raw)
+        return self._text
+
+    def __eq__(self, other):
+        return str(self) == str(other) if isinstance(other, (str, CompressedText)) else NotImplemented
+
+    def __hash__(self):
+        return hash(str(self))
+
+    def __len__(self):
+        return len(str(self))
+
+    def __repr__(self):
+        return f"CompressedText({len(self.raw)} bytes)"
+
+
+class CompressedTextDescriptor(DeferredAttribute):
+    def __get__(self, instance, cls=None):
+        value = super().__get__(instance, cls)
+        if isinstance(value, CompressedText):
+            value = str(value)
+            instance.__dict__[self.field.attname] = value
+        return value
+
+    def __set__(self, instance, value):
+        instance.__dict__[self.field.attname] = value
+
+
+class CompressedTextField(models.TextField):
+    descriptor_class = CompressedTextDescriptor
+
+    def from_db_value(self, value, expression, connection):
+        if isinstance(value, str) and value.startswith(MARKER):
+            return CompressedText(value)
+        return value
+
+    def to_python(self, value):
+        if isinstance(value, CompressedText):
+            return str(value)
+        return super().to_python(value)
+
+    def get_prep_value(self, value):
+        if isinstance(value, CompressedText):
+            return value.raw
+        value = super().get_prep_value(value)
+        if not isinstance(value, str):
+            return value
+
+        threshold = settings.TEXT_COMPRESSION_MIN_BYTES
+        # 원래 값이 마커로 시작하면 압축 값으로 오인하지 않도록 길이와 상관없이 압축
+        if value.startswith(MARKER) or (threshold and len(value.encode()) >= threshold):
+            return compress_text(value)
+        return value
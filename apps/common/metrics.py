@@ -0,0 +1,42 @@
+"""
+프로세스 내 운영 지표 (카운터 / 소요 시간)
+
+값은 워커 프로세스 단위로 집계되므로 수집기는 워커별로 조회해 합산해야 한다.
+"""
+
+import threading
+from collections import defaultdict
+
+
+class Metrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = defaultdict(int)
+        self._timers = {}
+
+    def incr(self, name, value=1):
+        with self._lock:
+            self._counters[name] += value
+
+    def observe(self, name, seconds):
+        with self._lock:
+            count, total, peak = self._timers.get(name, (0, 0.0, 0.0))
+            self._timers[name] = (count + 1, total + seconds, max(peak, seconds))
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "counters": dict(self._counters),
+                "timers": {
+                    name: {"count": count, "avg_ms": total / count * 1000, "max_ms": peak * 1000}
+                    for name, (count, total, peak) in self._timers.items()
+                },
+            }
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._timers.clear()
+
+
+metrics = Metrics()
@@ -0,0 +1,52 @@
+"""
+orjson 기반 JSON 렌더러 / 파서 (REST_FRAMEWORK 기본값으로 사용)
+
+- orjson은 선택 의존성: 설치되어 있지 않으면 DRF의 JSONRenderer / JSONParser와 똑같이 동작
+- 출력은 DRF JSONRenderer와 같게 맞춤: datetime은 DRF 인코더로 변환("...Z"), U+2028/U+2029 이스케이프,
+  Decimal / lazy 문자열(CompressedText 포함) 등 orjson이 모르는 타입도 DRF 인코더에 넘김
+- ?format=json / Accept: application/json; indent=N 의 들여쓰기는 orjson이 지원하는 2칸으로 출력
+"""
+
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils import encoders
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson 미설치 환경
+    orjson = None
+
+LINE_SEPARATORS = ((b"\xe2\x80\xa8", b"\\u2028"), (b"\xe2\x80\xa9", b"\\u2029"))
+
+
+class FastJSONRenderer(JSONRenderer):
+    def __init__(self):
+        super().__init__()
+        self._encoder = encoders.JSONEncoder()
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or data is None:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        option = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+        if self.get_indent(accepted_media_type, renderer_context or {}):
+            option |= orjson.OPT_INDENT_2
+        ret = orjson.dumps(data, default=self._encoder.default, option=option)
+        for raw, escaped in LINE_SEPARATORS:
+            if raw in ret:
+                ret = ret.replace(raw, escaped)
+        return ret
+
+
+class FastJSONParser(JSONParser):
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        if orjson is None or parser_context.get("encoding", "utf-8").lower() not in ("utf-8", "utf8"):
+            return super().parse(stream, media_type, parser_context)
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError(f"JSON parse error - {exc}")
@@ -0,0 +1,51 @@
+import asyncio
+
+from asgiref.sync import sync_to_async
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from .metrics import metrics
+
+
+class AsyncAPIView(APIView):
+    """
+    async 핸들러(async def post 등)를 지원하는 APIView
+    - 인증/권한/스로틀(initial)은 DB를 조회하므로 sync_to_async로 실행
+    - ASGI(config/asgi.py)로 서빙하면 외부 호출을 기다리는 동안 워커를 점유하지 않음
+    """
+
+    async def dispatch(self, request, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await sync_to_async(self.initial)(request, *args, **kwargs)
+
+            if request.method.lower() in self.http_method_names:
+                handler = getattr(self, request.method.lower(), self.http_method_not_allowed)
+            else:
+                handler = self.http_method_not_allowed
+
+            response = handler(request, *args, **kwargs)
+            if asyncio.iscoroutine(response):
+                response = await response
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
+
+
+class MetricsView(APIView):
+    """
+    - GET: 현재 워커 프로세스의 운영 지표 조회 (관리자 전용)
+    """
+
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response(metrics.snapshot())
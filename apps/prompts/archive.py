@@ -0,0 +1,116 @@
+"""
+PromptLog 보관 기간 관리 / 아카이브
+
+- 보관 기간(유저별 PromptLogRetentionPolicy 또는 PROMPT_LOG_ARCHIVE["RETENTION_DAYS"])이 지난 로그를
+  (created_at, id) 순으로 BATCH_SIZE씩 gzip NDJSON 세그먼트에 이어 쓰고, 같은 배치를 짧은 트랜잭션으로 삭제
+- 배치마다 gzip 멤버를 하나씩 덧붙이므로 파일은 항상 온전한 gzip이고, 유효한 줄 수는 DB의 row_count가 기준
+  (파일 쓰기 후 삭제 전에 중단되면 뒤에 남은 줄은 읽을 때 무시되고, 해당 로그는 다음 실행에서 다시 아카이브됨)
+- 읽기는 세그먼트를 한 줄씩 풀어 필요한 범위만 돌려줌
+"""
+
+import gzip
+import json
+import os
+from datetime import timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .models import PromptLog, PromptLogArchive, PromptLogRetentionPolicy
+
+ARCHIVED_FIELDS = ("id", "prompt_id", "prompt_version", "is_partial", "is_cached", "created_at")
+# 본문은 ContentBlob에서 가져와 세그먼트에 그대로 기록 (아카이브 후 참조가 없어진 본문은 prune_content_blobs가 정리)
+ARCHIVED_TEXTS = {"input_text": F("input_blob__text"), "output_text": F("output_blob__text")}
+
+
+def archive_root():
+    return Path(settings.PROMPT_LOG_ARCHIVE["DIR"])
+
+
+def retention_cutoff(user_id, now=None):
+    """유저의 보관 기준 시각 (이보다 오래된 로그를 아카이브), 보관 기간이 0이면 None"""
+    policy = PromptLogRetentionPolicy.objects.filter(user_id=user_id).values_list("retention_days", flat=True).first()
+    days = policy if policy is not None else settings.PROMPT_LOG_ARCHIVE["RETENTION_DAYS"]
+    if not days:
+        return None
+    return (now or timezone.now()) - timedelta(days=days)
+
+
+def _append_member(path, rows):
+    # 배치 하나 = gzip 멤버 하나, fsync 후에야 DB에서 삭제
+    with open(path, "ab") as raw:
+        with gzip.GzipFile(fileobj=raw, mode="wb") as out:
+            for row in rows:
+                out.write((json.dumps(row, ensure_ascii=False, cls=DjangoJSONEncoder) + "\n").encode())
+        raw.flush()
+        os.fsync(raw.fileno())
+
+
+def _new_segment(user_id):
+    segment = PromptLogArchive.objects.create(user_id=user_id, path="")
+    segment.path = f"user_{user_id}/{segment.pk:010d}.ndjson.gz"
+    segment.save(update_fields=["path"])
+    (archive_root() / segment.path).parent.mkdir(parents=True, exist_ok=True)
+    return segment
+
+
+def archive_user_logs(user_id, cutoff, batch_size=None, segment_max_rows=None, max_batches=None):
+    """cutoff 이전 로그를 세그먼트로 옮기고 삭제, 옮긴 행 수 반환"""
+    conf = settings.PROMPT_LOG_ARCHIVE
+    batch_size = batch_size or conf["BATCH_SIZE"]
+    segment_max_rows = segment_max_rows or conf["SEGMENT_MAX_ROWS"]
+
+    segment = None
+    moved = batches = 0
+    while max_batches is None or batches < max_batches:
+        rows = list(
+            PromptLog.objects.filter(user_id=user_id, created_at__lt=cutoff)
+            .order_by("created_at", "id")
+            .values(*ARCHIVED_FIELDS, **ARCHIVED_TEXTS)[:batch_size]
+        )
+        if not rows:
+            break
+
+        if segment is None or segment.row_count >= segment_max_rows:
+            segment = _new_segment(user_id)
+        _append_member(archive_root() / segment.path, rows)
+
+        with transaction.atomic():
+            PromptLog.objects.filter(id__in=[row["id"] for row in rows]).delete()
+            segment.row_count += len(rows)
+            segment.start_at = segment.start_at or rows[0]["created_at"]
+            segment.end_at = rows[-1]["created_at"]
+            segment.save(update_fields=["row_count", "start_at", "end_at"])
+
+        moved += len(rows)
+        batches += 1
+    return moved
+
+
+def iter_archived_logs(segment, start=None, end=None):
+    """세그먼트의 로그를 한 줄씩 생성 (start <= created_at < end 범위만)"""
+    with gzip.open(archive_root() / segment.path, "rt", encoding="utf-8") as lines:
+        for _, line in zip(range(segment.row_count), lines):
+            row = json.loads(line)
+            created_at = parse_datetime(row["created_at"])
+            if start is not None and created_at < start:
+                continue
+            if end is not None and created_at >= end:
+                return
+            yield row
+
+
+def iter_archived_range(user, start=None, end=None):
+    """유저의 세그먼트 중 [start, end)와 겹치는 것만 순서대로 열어 로그를 생성"""
+    segments = PromptLogArchive.objects.filter(user=user, row_count__gt=0)
+    if start is not None:
+        segments = segments.filter(end_at__gte=start)
+    if end is not None:
+        segments = segments.filter(start_at__lt=end)
+    for segment in segments.order_by("start_at", "id"):
+        yield from iter_archived_logs(segment, start, end)
@@ -0,0 +1,172 @@
+"""
+프롬프트 실행 백엔드
+
+settings.PROMPT_EXECUTION["BACKEND"] 에 지정된 클래스를 OPTIONS로 초기화해 프로세스 전체에서 공유한다.
+"""
+
+import asyncio
+import json
+import re
+import weakref
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
+from functools import lru_cache
+
+import httpx
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.utils.module_loading import import_string
+
+from .templating import render_prompt
+
+
+@dataclass(frozen=True)
+class RunRequest:
+    """백엔드에 전달되는 실행 단위"""
+
+    title: str
+    content: str
+    input_text: str
+
+    @classmethod
+    def from_prompt(cls, prompt, input_text, variables=None):
+        """프롬프트 내용의 {{변수}}를 variables로 채워 생성 (templating.TemplateVariableError)"""
+        return cls(title=prompt.title, content=render_prompt(prompt, variables), input_text=input_text)
+
+
+class ExecutionError(Exception):
+    """백엔드 호출 실패 (네트워크 오류, 비정상 응답 등)"""
+
+
+class BaseExecutionBackend:
+    def __init__(self, **options):
+        self.options = options
+
+    def cache_params(self) -> dict:
+        """결과 캐시 키에 포함할 백엔드 식별 정보 (백엔드 종류, 모델 등)"""
+        return {"backend": f"{type(self).__module__}.{type(self).__qualname__}"}
+
+    async def run(self, request: RunRequest) -> str:
+        raise NotImplementedError
+
+    async def stream(self, request: RunRequest) -> AsyncIterator[str]:
+        """생성되는 대로 텍스트 조각을 반환 (기본 구현은 전체 결과를 한 번에 반환)"""
+        yield await self.run(request)
+
+
+class MockExecutionBackend(BaseExecutionBackend):
+    """비용 없이 테스트할 수 있는 Mock 응답"""
+
+    async def run(self, request: RunRequest) -> str:
+        return f"[MOCK RESPONSE] '{request.title}' → '{request.input_text}'"
+
+    async def stream(self, request: RunRequest) -> AsyncIterator[str]:
+        for token in re.findall(r"\s*\S+", await self.run(request)):
+            yield token
+
+
+class HTTPExecutionBackend(BaseExecutionBackend):
+    """
+    OpenAI 호환 Chat Completions API 호출
+    - 이벤트 루프마다 httpx.AsyncClient 하나를 공유해 커넥션 풀을 재사용
+    - 클라이언트는 루프가 끝날 때(asyncio.run 등의 shutdown_asyncgens) 함께 닫힘
+      (WSGI에서는 async_to_sync가 요청마다 루프를 새로 만들므로 요청마다 닫힘)
+    - max_connections 만큼의 요청이 한 워커에서 동시에 진행될 수 있음
+    """
+
+    def __init__(
+        self,
+        base_url,
+        api_key="",
+        model="gpt-4o-mini",
+        timeout=60.0,
+        max_connections=200,
+        max_keepalive_connections=50,
+        **options,
+    ):
+        super().__init__(**options)
+        self.base_url = base_url.rstrip("/")
+        self.api_key = api_key
+        self.model = model
+        self.timeout = timeout
+        self.limits = httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_keepalive_connections)
+        # httpx 커넥션은 생성된 이벤트 루프에 묶이므로 루프별로 (클라이언트, 정리용 async generator)를 보관
+        self._clients = weakref.WeakKeyDictionary()
+
+    def cache_params(self) -> dict:
+        return {**super().cache_params(), "base_url": self.base_url, "model": self.model}
+
+    async def get_client(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        entry = self._clients.get(loop)
+        if entry is None:
+            headers = {"Authorization": f"Bearer {self.api_key}"} if self.api_key else {}
+            client = httpx.AsyncClient(
+                base_url=self.base_url, headers=headers, timeout=self.timeout, limits=self.limits
+            )
+            closer = _close_on_loop_shutdown(client)
+            # 첫 반복에서 루프에 등록되어, 루프가 끝날 때 shutdown_asyncgens가 aclose()를 호출
+            await closer.__anext__()
+            entry = self._clients[loop] = (client, closer)
+        return entry[0]
+
+    def build_payload(self, request: RunRequest) -> dict:
+        return {
+            "model": self.model,
+            "messages": [
+                {"role": "system", "content": request.content},
+                {"role": "user", "content": request.input_text},
+            ],
+        }
+
+    async def run(self, request: RunRequest) -> str:
+        try:
+            client = await self.get_client()
+            response = await client.post("/chat/completions", json=self.build_payload(request))
+            response.raise_for_status()
+            return response.json()["choices"][0]["message"]["content"]
+        except (httpx.HTTPError, ValueError, KeyError, IndexError, TypeError) as exc:
+            raise ExecutionError(str(exc)) from exc
+
+    async def stream(self, request: RunRequest) -> AsyncIterator[str]:
+        payload = {**self.build_payload(request), "stream": True}
+        try:
+            client = await self.get_client()
+            async with client.stream("POST", "/chat/completions", json=payload) as response:
+                response.raise_for_status()
+                async for line in response.aiter_lines():
+                    if not line.startswith("data:"):
+                        continue
+                    data = line[len("data:") :].strip()
+                    if data == "[DONE]":
+                        break
+                    token = json.loads(data)["choices"][0].get("delta", {}).get("content")
+                    if token:
+                        yield token
+        except (httpx.HTTPError, ValueError, KeyError, IndexError, TypeError) as exc:
+            raise ExecutionError(str(exc)) from exc
+
+    async def aclose(self):
+        entry = self._clients.pop(asyncio.get_running_loop(), None)
+        if entry is not None:
+            await entry[1].aclose()
+
+
+async def _close_on_loop_shutdown(client):
+    try:
+        yield
+    finally:
+        await client.aclose()
+
+
+@lru_cache(maxsize=None)
+def get_backend() -> BaseExecutionBackend:
+    conf = settings.PROMPT_EXECUTION
+    return import_string(conf["BACKEND"])(**conf.get("OPTIONS", {}))
+
+
+@receiver(setting_changed)
+def reset_backend(*, setting, **kwargs):
+    if setting == "PROMPT_EXECUTION":
+        get_backend.cache_clear()
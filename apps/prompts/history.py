@@ -0,0 +1,151 @@
+"""
+프롬프트 실행 이력(PromptLog) 저장
+
+settings.PROMPT_LOG_WRITE_MODE
+- "sync": 요청 안에서 바로 INSERT. 실패하면 예외가 전파되어 호출부가 500을 응답 (기본값)
+- "buffered": 프로세스 내 버퍼에 쌓았다가 크기/시간 기준으로 bulk_create (write-behind)
+
+실행 통계(stats.py)는 로그를 INSERT하는 트랜잭션 안에서 함께 증가 (buffered 모드는 flush 시점)
+"""
+
+import atexit
+import logging
+import threading
+from collections import deque
+from functools import lru_cache
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.db import close_old_connections, connections, transaction
+from django.dispatch import receiver
+
+from apps.common.metrics import metrics
+
+from .models import PromptLog
+from .stats import record_runs
+
+logger = logging.getLogger(__name__)
+
+
+class PromptLogBuffer:
+    """
+    PromptLog write-behind 버퍼
+    - add()는 DB를 건드리지 않고 큐에 넣기만 함 (max_size 초과분은 드롭)
+    - 백그라운드 스레드가 flush_size 도달 또는 flush_interval 경과 시 bulk_create
+    - 프로세스 종료 시(atexit) 남은 로그를 flush
+    """
+
+    def __init__(self, max_size=50_000, flush_size=500, flush_interval=1.0):
+        self.max_size = max_size
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self._pending = deque()
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def __len__(self):
+        return len(self._pending)
+
+    def add(self, logs):
+        with self._lock:
+            accepted = logs[: max(self.max_size - len(self._pending), 0)]
+            self._pending.extend(accepted)
+            should_flush = len(self._pending) >= self.flush_size
+
+        dropped = len(logs) - len(accepted)
+        metrics.incr("prompt_log_buffer.queued", len(accepted))
+        if dropped:
+            metrics.incr("prompt_log_buffer.dropped", dropped)
+            logger.warning("PromptLog buffer is full, dropped %d logs", dropped)
+
+        self._ensure_started()
+        if should_flush:
+            self._wakeup.set()
+
+    def flush(self):
+        with self._flush_lock:
+            with self._lock:
+                batch = list(self._pending)
+                self._pending.clear()
+            if not batch:
+                return 0
+
+            try:
+                with transaction.atomic():
+                    PromptLog.objects.bulk_create(batch, batch_size=self.flush_size)
+                    record_runs(batch)
+            except Exception:
+                metrics.incr("prompt_log_buffer.failed_flushes")
+                metrics.incr("prompt_log_buffer.dropped", len(batch))
+                logger.exception("Failed to flush %d buffered PromptLogs", len(batch))
+                return 0
+
+            metrics.incr("prompt_log_buffer.flushed", len(batch))
+            return len(batch)
+
+    def close(self):
+        self._stopped.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.flush_interval + 5)
+        self.flush()
+
+    def _ensure_started(self):
+        if self._thread is not None or self._stopped.is_set():
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="promptlog-buffer", daemon=True)
+                self._thread.start()
+                atexit.register(self.close)
+
+    def _run(self):
+        while True:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            if self._stopped.is_set():
+                break  # 마지막 flush는 close()를 호출한 쪽에서 수행
+            close_old_connections()
+            self.flush()
+        connections.close_all()
+
+
+@lru_cache(maxsize=None)
+def get_log_buffer() -> PromptLogBuffer:
+    conf = settings.PROMPT_LOG_BUFFER
+    return PromptLogBuffer(
+        max_size=conf["MAX_SIZE"], flush_size=conf["FLUSH_SIZE"], flush_interval=conf["FLUSH_INTERVAL"]
+    )
+
+
+@receiver(setting_changed)
+def reset_log_buffer(*, setting, **kwargs):
+    if setting in ("PROMPT_LOG_BUFFER", "PROMPT_LOG_WRITE_MODE") and get_log_buffer.cache_info().currsize:
+        get_log_buffer().close()
+        get_log_buffer.cache_clear()
+
+
+def save_run_logs(logs):
+    """실행 로그 저장. buffered 모드가 아니면 DB 오류를 그대로 전파한다."""
+    if not logs:
+        return
+    if settings.PROMPT_LOG_WRITE_MODE == "buffered":
+        get_log_buffer().add(logs)
+        return
+    with transaction.atomic(savepoint=False):
+        if len(logs) == 1:
+            logs[0].save()
+        else:
+            PromptLog.objects.bulk_create(logs, batch_size=1000)
+        record_runs(logs)
+
+
+async def asave_run_logs(logs):
+    if settings.PROMPT_LOG_WRITE_MODE == "buffered":
+        save_run_logs(logs)
+    else:
+        await sync_to_async(save_run_logs)(logs)
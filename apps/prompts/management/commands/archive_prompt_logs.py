@@ -0,0 +1,41 @@
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from apps.prompts.archive import archive_user_logs, retention_cutoff
+
+
+class Command(BaseCommand):
+    """
+    보관 기간이 지난 PromptLog를 gzip NDJSON 세그먼트로 옮기고 배치 단위로 삭제 (cron 등으로 주기 실행)
+    - 유저마다 (user, created_at) 인덱스로 오래된 로그만 읽으므로 전체 테이블을 훑지 않음
+    """
+
+    help = "보관 기간이 지난 실행 로그를 압축 아카이브로 옮깁니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--user", help="이 이메일의 유저만 처리")
+        parser.add_argument("--batch-size", type=int, default=None, help="한 트랜잭션에서 옮길 최대 로그 수")
+        parser.add_argument("--sleep", type=float, default=0.0, help="유저 사이 대기 시간(초), DB 부하 조절용")
+
+    def handle(self, *args, user, batch_size, sleep, **options):
+        users = get_user_model().objects.order_by("id")
+        if user:
+            users = users.filter(email=user)
+
+        now = timezone.now()
+        moved_total = 0
+        for user_id in users.values_list("id", flat=True).iterator():
+            cutoff = retention_cutoff(user_id, now)
+            if cutoff is None:
+                continue
+            moved = archive_user_logs(user_id, cutoff, batch_size=batch_size)
+            if moved:
+                moved_total += moved
+                self.stdout.write(f"유저 {user_id}: 로그 {moved}건 아카이브")
+                if sleep:
+                    time.sleep(sleep)
+
+        self.stdout.write(f"총 {moved_total}건의 실행 로그를 아카이브했습니다.")
@@ -0,0 +1,39 @@
+import sys
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.prompts.transfer import IMPORT_CHUNK_SIZE, import_prompts
+
+
+class Command(BaseCommand):
+    """
+    NDJSON 파일(또는 표준 입력)의 프롬프트를 지정한 유저 소유로 일괄 생성
+    """
+
+    help = "NDJSON 파일의 프롬프트를 청크 단위 bulk_create로 가져옵니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="NDJSON 파일 경로 (- 이면 표준 입력)")
+        parser.add_argument("--user", required=True, help="프롬프트를 소유할 유저 이메일")
+        parser.add_argument(
+            "--chunk-size", type=int, default=IMPORT_CHUNK_SIZE, help="한 트랜잭션에서 넣을 프롬프트 수"
+        )
+
+    def handle(self, *args, path, user, chunk_size, **options):
+        try:
+            owner = get_user_model().objects.get(email=user)
+        except get_user_model().DoesNotExist:
+            raise CommandError(f"존재하지 않는 유저입니다: {user}")
+
+        if path == "-":
+            result = import_prompts(owner, sys.stdin, chunk_size=chunk_size)
+        else:
+            with open(path, encoding="utf-8") as lines:
+                result = import_prompts(owner, lines, chunk_size=chunk_size)
+
+        for error in result.errors:
+            self.stderr.write(f"{error['line']}번째 줄: {error['message']}")
+        self.stdout.write(
+            f"프롬프트 {result.created}개를 가져왔습니다. (새 태그 {result.tags_created}개, 실패 {result.failed}줄)"
+        )
@@ -0,0 +1,62 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import IntegrityError
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+
+from apps.prompts.models import ContentBlob, PromptLog
+
+
+class Command(BaseCommand):
+    """
+    어떤 PromptLog도 참조하지 않는 ContentBlob을 배치 단위로 삭제 (로그 삭제 / 아카이브 뒤 cron 등으로 주기 실행)
+
+    - 참조 여부는 DELETE 문 안의 NOT EXISTS로 다시 확인하므로, 후보를 고른 뒤 새로 참조된 본문은 지워지지 않음
+    - 로그가 저장(재사용 포함)하며 last_referenced_at을 갱신한 본문은 같은 트랜잭션의 로그가 아직 커밋되지 않았을 수 있어
+      --grace-minutes 동안은 건너뜀 (DELETE 문에서도 다시 확인)
+    - 커밋되지 않은 로그가 참조 중이라 FK 제약에 걸린 배치는 건너뛰고 다음 실행에서 다시 시도
+    """
+
+    help = "참조가 없어진 실행 입력/출력 본문을 배치 단위로 삭제합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000, help="한 번에 확인할 최대 본문 수")
+        parser.add_argument(
+            "--grace-minutes", type=int, default=60, help="마지막으로 참조된 지 이 시간이 지나지 않은 본문은 건너뜀"
+        )
+        parser.add_argument("--sleep", type=float, default=0.0, help="배치 사이 대기 시간(초), DB 부하 조절용")
+        parser.add_argument("--max-batches", type=int, default=None, help="이번 실행에서 처리할 최대 배치 수")
+
+    def handle(self, *args, batch_size, grace_minutes, sleep, max_batches, **options):
+        cutoff = timezone.now() - timedelta(minutes=grace_minutes)
+        unreferenced = ~Exists(PromptLog.objects.filter(input_blob=OuterRef("pk"))) & ~Exists(
+            PromptLog.objects.filter(output_blob=OuterRef("pk"))
+        )
+
+        cursor = ""
+        batches = deleted = skipped = 0
+        while max_batches is None or batches < max_batches:
+            hashes = list(
+                ContentBlob.objects.filter(hash__gt=cursor, last_referenced_at__lt=cutoff)
+                .order_by("hash")
+                .values_list("hash", flat=True)[:batch_size]
+            )
+            if not hashes:
+                break
+
+            try:
+                count, _ = ContentBlob.objects.filter(
+                    unreferenced, hash__in=hashes, last_referenced_at__lt=cutoff
+                ).delete()
+                deleted += count
+            except IntegrityError:
+                skipped += 1
+
+            cursor = hashes[-1]
+            batches += 1
+            if sleep:
+                time.sleep(sleep)
+
+        self.stdout.write(f"참조가 없는 본문 {deleted}개를 삭제했습니다. (배치 {batches}회, 건너뜀 {skipped}회)")
@@ -0,0 +1,38 @@
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+
+from apps.prompts.stats import RECONCILE_CHUNK_SIZE, rebuild_user_stats
+
+
+class Command(BaseCommand):
+    """
+    실행 로그로 프롬프트 / 유저 실행 통계를 다시 계산 (도입 시 기존 로그 backfill, 이후 필요할 때 정합성 맞춤)
+    - 유저마다 (user, created_at) 인덱스로 그 유저의 로그만 읽고, 한 트랜잭션에서 통계를 교체
+    - 아카이브된 기간의 일별 값은 유지
+    """
+
+    help = "실행 로그로 프롬프트 / 유저 실행 통계를 다시 계산합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--user", help="이 이메일의 유저만 처리")
+        parser.add_argument("--chunk-size", type=int, default=RECONCILE_CHUNK_SIZE, help="한 번에 읽을 실행 로그 수")
+        parser.add_argument("--sleep", type=float, default=0.0, help="유저 사이 대기 시간(초), DB 부하 조절용")
+
+    def handle(self, *args, user, chunk_size, sleep, **options):
+        users = get_user_model().objects.order_by("id")
+        if user:
+            users = users.filter(email=user)
+
+        user_count = log_total = 0
+        for user_id in users.values_list("id", flat=True).iterator():
+            buckets, logs = rebuild_user_stats(user_id, chunk_size=chunk_size)
+            user_count += 1
+            log_total += logs
+            if logs:
+                self.stdout.write(f"유저 {user_id}: 로그 {logs}건, 일별 통계 {buckets}행")
+                if sleep:
+                    time.sleep(sleep)
+
+        self.stdout.write(f"유저 {user_count}명의 실행 통계를 다시 계산했습니다. (실행 로그 {log_total}건)")
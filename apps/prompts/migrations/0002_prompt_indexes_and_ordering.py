@@ -0,0 +1,41 @@
+# Generated by Django 4.2.30 on 2026-10-18 18:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("prompts", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name="prompt",
+            options={"ordering": ["-created_at", "-id"]},
+        ),
+        migrations.AlterModelOptions(
+            name="promptlog",
+            options={"ordering": ["-created_at", "-id"]},
+        ),
+        migrations.AddIndex(
+            model_name="prompt",
+            index=models.Index(fields=["user", "created_at"], name="prompt_user_created_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="prompt",
+            index=models.Index(fields=["user", "is_favorite"], name="prompt_user_favorite_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="prompt",
+            index=models.Index(fields=["user", "is_public"], name="prompt_user_public_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="promptlog",
+            index=models.Index(fields=["user", "created_at"], name="promptlog_user_created_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="promptlog",
+            index=models.Index(fields=["prompt", "created_at"], name="promptlog_prompt_created_idx"),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 4.2.30 on 2026-10-18 18:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("prompts", "0002_prompt_indexes_and_ordering"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="promptlog",
+            name="is_partial",
+            field=models.BooleanField(
+                default=False, help_text="스트리밍 도중 클라이언트 연결이 끊겨 일부만 저장된 실행"
+            ),
+        ),
+    ]
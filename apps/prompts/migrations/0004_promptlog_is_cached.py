@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-18 18:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("prompts", "0003_promptlog_is_partial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="promptlog",
+            name="is_cached",
+            field=models.BooleanField(default=False, help_text="백엔드 호출 없이 결과 캐시로 응답한 실행"),
+        ),
+    ]
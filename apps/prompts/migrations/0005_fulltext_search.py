@@ -0,0 +1,61 @@
+# 전문 검색 인덱스: MySQL은 FULLTEXT, SQLite(로컬)는 FTS5 external content 테이블 + 동기화 트리거
+# (apps.prompts.search는 이후 스키마에 맞춰 바뀌므로 이 시점의 테이블 목록과 SQL을 그대로 둠)
+
+from django.db import migrations
+
+TABLES = {
+    "prompts_prompt": ("title", "content"),
+    "prompts_promptlog": ("input_text", "output_text"),
+}
+
+
+def sqlite_trigger_statements(table, columns):
+    fts = f"{table}_fts"
+    cols = ", ".join(columns)
+    new_values = ", ".join(f"new.{c}" for c in columns)
+    old_values = ", ".join(f"old.{c}" for c in columns)
+    return [
+        f"CREATE TRIGGER {fts}_ai AFTER INSERT ON {table} BEGIN "
+        f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.id, {new_values}); END",
+        f"CREATE TRIGGER {fts}_ad AFTER DELETE ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.id, {old_values}); END",
+        f"CREATE TRIGGER {fts}_au AFTER UPDATE OF {cols} ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.id, {old_values}); "
+        f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.id, {new_values}); END",
+    ]
+
+
+def forwards(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    for table, columns in TABLES.items():
+        if vendor == "mysql":
+            schema_editor.execute(f"ALTER TABLE {table} ADD FULLTEXT INDEX {table}_ft ({', '.join(columns)})")
+        elif vendor == "sqlite":
+            schema_editor.execute(
+                f"CREATE VIRTUAL TABLE {table}_fts USING fts5({', '.join(columns)}, content='{table}', content_rowid='id')"
+            )
+            for statement in sqlite_trigger_statements(table, columns):
+                schema_editor.execute(statement)
+            schema_editor.execute(f"INSERT INTO {table}_fts({table}_fts) VALUES ('rebuild')")
+
+
+def backwards(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    for table in TABLES:
+        if vendor == "mysql":
+            schema_editor.execute(f"ALTER TABLE {table} DROP INDEX {table}_ft")
+        elif vendor == "sqlite":
+            for suffix in ("ai", "ad", "au"):
+                schema_editor.execute(f"DROP TRIGGER IF EXISTS {table}_fts_{suffix}")
+            schema_editor.execute(f"DROP TABLE IF EXISTS {table}_fts")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("prompts", "0004_promptlog_is_cached"),
+    ]
+
+    operations = [
+        migrations.RunPython(forwards, backwards),
+    ]
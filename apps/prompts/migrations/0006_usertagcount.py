@@ -0,0 +1,55 @@
+# Generated by Django 4.2.30 on 2026-10-18 18:57
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def backfill_tag_counts(apps, schema_editor):
+    Prompt = apps.get_model("prompts", "Prompt")
+    UserTagCount = apps.get_model("prompts", "UserTagCount")
+    through = Prompt._meta.get_field("tags").remote_field.through
+
+    rows = through.objects.values("prompt__user_id", "tag_id").annotate(count=Count("id")).order_by()
+    UserTagCount.objects.bulk_create(
+        [UserTagCount(user_id=row["prompt__user_id"], tag_id=row["tag_id"], count=row["count"]) for row in rows],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("prompts", "0005_fulltext_search"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="UserTagCount",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("count", models.PositiveIntegerField(default=0)),
+                (
+                    "tag",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE, related_name="user_counts", to="prompts.tag"
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="tag_counts",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name="usertagcount",
+            constraint=models.UniqueConstraint(fields=("user", "tag"), name="unique_user_tag_count"),
+        ),
+        migrations.RunPython(backfill_tag_counts, migrations.RunPython.noop),
+    ]
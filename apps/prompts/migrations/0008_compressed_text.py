@@ -0,0 +1,17 @@
+# Generated by Django 4.2.30 on 2026-10-18 19:20
+
+# 압축 저장 필드(apps.common.fields.CompressedTextField) 도입 시점
+# - 프롬프트 내용과 실행 로그 본문(input_text / output_text)은 전문 검색(FULLTEXT / FTS5) 대상이라
+#   색인이 원문을 담아야 하므로 압축하지 않음 → 이 시점에 바꾸거나 변환하는 컬럼은 없음
+# - 압축은 검색하지 않는 버전 스냅샷(PromptVersion.snapshot, 0012)부터 사용
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("prompts", "0007_prompt_log_archive"),
+    ]
+
+    operations = []
@@ -0,0 +1,186 @@
+# 실행 로그 본문을 내용 해시로 키를 둔 ContentBlob으로 옮기고, 전문 검색 색인도 본문 테이블로 이전
+
+import hashlib
+
+import django.db.models.deletion
+from django.db import migrations, models, transaction
+
+BATCH_SIZE = 1000
+# 이 시점의 전문 검색 대상 (apps.prompts.search는 이후 스키마에 맞춰 바뀌므로 SQL을 그대로 둠)
+LOG_FULLTEXT = {"prompts_promptlog": ("input_text", "output_text")}
+BLOB_FULLTEXT = {"prompts_contentblob": ("text",)}
+
+
+def content_hash(text):
+    # apps.prompts.models.content_hash와 같은 값이어야 함 (본문 SHA-256)
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+def sqlite_trigger_statements(table, columns):
+    fts = f"{table}_fts"
+    cols = ", ".join(columns)
+    new_values = ", ".join(f"new.{c}" for c in columns)
+    old_values = ", ".join(f"old.{c}" for c in columns)
+    return [
+        f"CREATE TRIGGER {fts}_ai AFTER INSERT ON {table} BEGIN "
+        f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.rowid, {new_values}); END",
+        f"CREATE TRIGGER {fts}_ad AFTER DELETE ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.rowid, {old_values}); END",
+        f"CREATE TRIGGER {fts}_au AFTER UPDATE OF {cols} ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.rowid, {old_values}); "
+        f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.rowid, {new_values}); END",
+    ]
+
+
+def create_fulltext_indexes(schema_editor, tables):
+    vendor = schema_editor.connection.vendor
+    for table, columns in tables.items():
+        if vendor == "mysql":
+            schema_editor.execute(f"ALTER TABLE {table} ADD FULLTEXT INDEX {table}_ft ({', '.join(columns)})")
+        elif vendor == "sqlite":
+            schema_editor.execute(
+                f"CREATE VIRTUAL TABLE {table}_fts USING fts5({', '.join(columns)}, content='{table}')"
+            )
+            for statement in sqlite_trigger_statements(table, columns):
+                schema_editor.execute(statement)
+            schema_editor.execute(f"INSERT INTO {table}_fts({table}_fts) VALUES ('rebuild')")
+
+
+def drop_fulltext_indexes(schema_editor, tables):
+    vendor = schema_editor.connection.vendor
+    for table in tables:
+        if vendor == "mysql":
+            schema_editor.execute(f"ALTER TABLE {table} DROP INDEX {table}_ft")
+        elif vendor == "sqlite":
+            for suffix in ("ai", "ad", "au"):
+                schema_editor.execute(f"DROP TRIGGER IF EXISTS {table}_fts_{suffix}")
+            schema_editor.execute(f"DROP TABLE IF EXISTS {table}_fts")
+
+
+def iter_batches(model, fields):
+    cursor = 0
+    while True:
+        rows = list(model.objects.filter(id__gt=cursor).order_by("id").only("id", *fields)[:BATCH_SIZE])
+        if not rows:
+            return
+        cursor = rows[-1].id
+        yield rows
+
+
+def move_text_to_blobs(apps, schema_editor):
+    PromptLog = apps.get_model("prompts", "PromptLog")
+    ContentBlob = apps.get_model("prompts", "ContentBlob")
+    for rows in iter_batches(PromptLog, ["input_text", "output_text"]):
+        blobs = {}
+        for row in rows:
+            for text_field, blob_field in (("input_text", "input_blob_id"), ("output_text", "output_blob_id")):
+                value = getattr(row, text_field)
+                if value is None:
+                    continue
+                digest = content_hash(value)
+                blobs.setdefault(digest, ContentBlob(hash=digest, text=value))
+                setattr(row, blob_field, digest)
+        with transaction.atomic():
+            ContentBlob.objects.bulk_create(blobs.values(), ignore_conflicts=True)
+            PromptLog.objects.bulk_update(rows, ["input_blob", "output_blob"])
+
+
+def move_blobs_to_text(apps, schema_editor):
+    PromptLog = apps.get_model("prompts", "PromptLog")
+    ContentBlob = apps.get_model("prompts", "ContentBlob")
+    for rows in iter_batches(PromptLog, ["input_blob", "output_blob"]):
+        hashes = {row.input_blob_id for row in rows} | {row.output_blob_id for row in rows}
+        texts = dict(ContentBlob.objects.filter(hash__in=hashes - {None}).values_list("hash", "text"))
+        for row in rows:
+            row.input_text = texts.get(row.input_blob_id, "")
+            row.output_text = texts.get(row.output_blob_id)
+        with transaction.atomic():
+            PromptLog.objects.bulk_update(rows, ["input_text", "output_text"])
+
+
+def move_fulltext_to_blobs(apps, schema_editor):
+    drop_fulltext_indexes(schema_editor, LOG_FULLTEXT)
+    create_fulltext_indexes(schema_editor, BLOB_FULLTEXT)
+
+
+def move_fulltext_to_logs(apps, schema_editor):
+    drop_fulltext_indexes(schema_editor, BLOB_FULLTEXT)
+    create_fulltext_indexes(schema_editor, LOG_FULLTEXT)
+
+
+def restore_log_triggers(apps, schema_editor):
+    # SQLite는 필드 변경 시 테이블을 새로 만들면서 트리거를 함께 지우므로 다시 생성하고 색인을 재구성
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    for table, columns in LOG_FULLTEXT.items():
+        for suffix in ("ai", "ad", "au"):
+            schema_editor.execute(f"DROP TRIGGER IF EXISTS {table}_fts_{suffix}")
+        for statement in sqlite_trigger_statements(table, columns):
+            schema_editor.execute(statement)
+        schema_editor.execute(f"INSERT INTO {table}_fts({table}_fts) VALUES ('rebuild')")
+
+
+class Migration(migrations.Migration):
+    # 기존 로그 이전은 배치마다 커밋
+    atomic = False
+
+    dependencies = [
+        ("prompts", "0008_compressed_text"),
+    ]
+
+    operations = [
+        # 되돌릴 때 input_blob / output_blob 제거로 테이블이 다시 만들어지며 지워진 트리거를 복구
+        migrations.RunPython(migrations.RunPython.noop, restore_log_triggers),
+        migrations.CreateModel(
+            name="ContentBlob",
+            fields=[
+                ("hash", models.CharField(max_length=64, primary_key=True, serialize=False)),
+                ("text", models.TextField()),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name="promptlog",
+            name="input_blob",
+            field=models.ForeignKey(
+                null=True,
+                on_delete=django.db.models.deletion.DO_NOTHING,
+                related_name="+",
+                to="prompts.contentblob",
+            ),
+        ),
+        migrations.AddField(
+            model_name="promptlog",
+            name="output_blob",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.DO_NOTHING,
+                related_name="+",
+                to="prompts.contentblob",
+            ),
+        ),
+        # 되돌릴 때 본문을 다시 채운 뒤에 NOT NULL을 적용하도록 먼저 nullable로 바꿈
+        migrations.AlterField(
+            model_name="promptlog",
+            name="input_text",
+            field=models.TextField(null=True),
+        ),
+        migrations.RunPython(move_text_to_blobs, move_blobs_to_text),
+        migrations.RunPython(move_fulltext_to_blobs, move_fulltext_to_logs),
+        migrations.RemoveField(
+            model_name="promptlog",
+            name="input_text",
+        ),
+        migrations.RemoveField(
+            model_name="promptlog",
+            name="output_text",
+        ),
+        migrations.AlterField(
+            model_name="promptlog",
+            name="input_blob",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.DO_NOTHING, related_name="+", to="prompts.contentblob"
+            ),
+        ),
+    ]
@@ -0,0 +1,83 @@
+# Generated by Django 4.2.30 on 2026-10-18 19:32
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+BATCH_SIZE = 5000
+# 이 시점의 전문 검색 대상 (apps.prompts.search는 이후 스키마에 맞춰 바뀌므로 SQL을 그대로 둠)
+FULLTEXT_TABLES = {"prompts_prompt": ("title", "content")}
+
+
+def sqlite_trigger_statements(table, columns):
+    fts = f"{table}_fts"
+    cols = ", ".join(columns)
+    new_values = ", ".join(f"new.{c}" for c in columns)
+    old_values = ", ".join(f"old.{c}" for c in columns)
+    return [
+        f"CREATE TRIGGER {fts}_ai AFTER INSERT ON {table} BEGIN "
+        f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.rowid, {new_values}); END",
+        f"CREATE TRIGGER {fts}_ad AFTER DELETE ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.rowid, {old_values}); END",
+        f"CREATE TRIGGER {fts}_au AFTER UPDATE OF {cols} ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.rowid, {old_values}); "
+        f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.rowid, {new_values}); END",
+    ]
+
+
+def restore_triggers(apps, schema_editor):
+    # SQLite는 필드 변경 시 테이블을 새로 만들면서 트리거를 함께 지우므로 다시 생성하고 색인을 재구성
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    for table, columns in FULLTEXT_TABLES.items():
+        for suffix in ("ai", "ad", "au"):
+            schema_editor.execute(f"DROP TRIGGER IF EXISTS {table}_fts_{suffix}")
+        for statement in sqlite_trigger_statements(table, columns):
+            schema_editor.execute(statement)
+        schema_editor.execute(f"INSERT INTO {table}_fts({table}_fts) VALUES ('rebuild')")
+
+
+def copy_created_at(apps, schema_editor):
+    # 기존 프롬프트의 수정 시각은 생성 시각으로 채움 (PK 구간별 UPDATE)
+    Prompt = apps.get_model("prompts", "Prompt")
+    last_id = Prompt.objects.order_by("-id").values_list("id", flat=True).first() or 0
+    for start in range(0, last_id, BATCH_SIZE):
+        Prompt.objects.filter(id__gt=start, id__lte=start + BATCH_SIZE).update(updated_at=models.F("created_at"))
+
+
+class Migration(migrations.Migration):
+    # 기존 행 변환은 배치마다 커밋
+    atomic = False
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("prompts", "0009_contentblob"),
+    ]
+
+    operations = [
+        migrations.RunPython(migrations.RunPython.noop, restore_triggers),
+        migrations.CreateModel(
+            name="PromptListVersion",
+            fields=[
+                (
+                    "user",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="prompt_list_version",
+                        serialize=False,
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                ("version", models.PositiveBigIntegerField(default=0)),
+                ("changed_at", models.DateTimeField()),
+            ],
+        ),
+        migrations.AddField(
+            model_name="prompt",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.RunPython(restore_triggers, migrations.RunPython.noop),
+        migrations.RunPython(copy_created_at, migrations.RunPython.noop),
+    ]
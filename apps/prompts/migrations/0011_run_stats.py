@@ -0,0 +1,107 @@
+# Generated by Django 4.2.30 on 2026-10-18 19:51
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+# 이 시점의 전문 검색 대상 (apps.prompts.search는 이후 스키마에 맞춰 바뀌므로 SQL을 그대로 둠)
+FULLTEXT_TABLES = {"prompts_prompt": ("title", "content")}
+
+
+def sqlite_trigger_statements(table, columns):
+    fts = f"{table}_fts"
+    cols = ", ".join(columns)
+    new_values = ", ".join(f"new.{c}" for c in columns)
+    old_values = ", ".join(f"old.{c}" for c in columns)
+    return [
+        f"CREATE TRIGGER {fts}_ai AFTER INSERT ON {table} BEGIN "
+        f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.rowid, {new_values}); END",
+        f"CREATE TRIGGER {fts}_ad AFTER DELETE ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.rowid, {old_values}); END",
+        f"CREATE TRIGGER {fts}_au AFTER UPDATE OF {cols} ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.rowid, {old_values}); "
+        f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.rowid, {new_values}); END",
+    ]
+
+
+def restore_triggers(apps, schema_editor):
+    # SQLite는 필드 변경 시 테이블을 새로 만들면서 트리거를 함께 지우므로 다시 생성하고 색인을 재구성
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    for table, columns in FULLTEXT_TABLES.items():
+        for suffix in ("ai", "ad", "au"):
+            schema_editor.execute(f"DROP TRIGGER IF EXISTS {table}_fts_{suffix}")
+        for statement in sqlite_trigger_statements(table, columns):
+            schema_editor.execute(statement)
+        schema_editor.execute(f"INSERT INTO {table}_fts({table}_fts) VALUES ('rebuild')")
+
+
+class Migration(migrations.Migration):
+    # 기존 실행 로그의 통계는 reconcile_run_stats 명령으로 채움
+
+    dependencies = [
+        ("accounts", "0003_refreshtokenlog_session_ledger"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("prompts", "0010_prompt_updated_at_list_version"),
+    ]
+
+    operations = [
+        migrations.RunPython(migrations.RunPython.noop, restore_triggers),
+        migrations.CreateModel(
+            name="UserRunStats",
+            fields=[
+                (
+                    "user",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="run_stats",
+                        serialize=False,
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                ("run_count", models.PositiveIntegerField(default=0)),
+                ("last_run_at", models.DateTimeField(blank=True, null=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name="prompt",
+            name="last_run_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="prompt",
+            name="run_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(restore_triggers, migrations.RunPython.noop),
+        migrations.CreateModel(
+            name="PromptRunDay",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("day", models.DateField()),
+                ("run_count", models.PositiveIntegerField(default=0)),
+                (
+                    "prompt",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE, related_name="run_days", to="prompts.prompt"
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="prompt_run_days",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [models.Index(fields=["user", "day"], name="promptrunday_user_day_idx")],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="promptrunday",
+            constraint=models.UniqueConstraint(fields=("prompt", "day"), name="unique_prompt_run_day"),
+        ),
+    ]
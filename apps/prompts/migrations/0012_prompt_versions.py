@@ -0,0 +1,107 @@
+# Generated by Django 4.2.30 on 2026-10-18 19:57
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+import apps.common.fields
+
+BATCH_SIZE = 2000
+# 이 시점의 전문 검색 대상 (apps.prompts.search는 이후 스키마에 맞춰 바뀌므로 SQL을 그대로 둠)
+FULLTEXT_TABLES = {"prompts_prompt": ("title", "content")}
+
+
+def sqlite_trigger_statements(table, columns):
+    fts = f"{table}_fts"
+    cols = ", ".join(columns)
+    new_values = ", ".join(f"new.{c}" for c in columns)
+    old_values = ", ".join(f"old.{c}" for c in columns)
+    return [
+        f"CREATE TRIGGER {fts}_ai AFTER INSERT ON {table} BEGIN "
+        f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.rowid, {new_values}); END",
+        f"CREATE TRIGGER {fts}_ad AFTER DELETE ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.rowid, {old_values}); END",
+        f"CREATE TRIGGER {fts}_au AFTER UPDATE OF {cols} ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.rowid, {old_values}); "
+        f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.rowid, {new_values}); END",
+    ]
+
+
+def restore_triggers(apps, schema_editor):
+    # SQLite는 필드 변경 시 테이블을 새로 만들면서 트리거를 함께 지우므로 다시 생성하고 색인을 재구성
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    for table, columns in FULLTEXT_TABLES.items():
+        for suffix in ("ai", "ad", "au"):
+            schema_editor.execute(f"DROP TRIGGER IF EXISTS {table}_fts_{suffix}")
+        for statement in sqlite_trigger_statements(table, columns):
+            schema_editor.execute(statement)
+        schema_editor.execute(f"INSERT INTO {table}_fts({table}_fts) VALUES ('rebuild')")
+
+
+def snapshot_existing_prompts(apps, schema_editor):
+    # 기존 프롬프트의 현재 내용을 1번 버전(전체 저장)으로 남김 (PK 순 배치, 압축된 값은 그대로 복사)
+    Prompt = apps.get_model("prompts", "Prompt")
+    PromptVersion = apps.get_model("prompts", "PromptVersion")
+    cursor = 0
+    while True:
+        rows = list(
+            Prompt.objects.filter(id__gt=cursor, version=0)
+            .order_by("id")
+            .values_list("id", "title", "content")[:BATCH_SIZE]
+        )
+        if not rows:
+            break
+        PromptVersion.objects.bulk_create(
+            PromptVersion(prompt_id=pk, number=1, title=title, snapshot=content) for pk, title, content in rows
+        )
+        Prompt.objects.filter(id__in=[pk for pk, _, _ in rows]).update(version=1)
+        cursor = rows[-1][0]
+
+
+class Migration(migrations.Migration):
+    # 기존 행 변환은 배치마다 커밋
+    atomic = False
+
+    dependencies = [
+        ("prompts", "0011_run_stats"),
+    ]
+
+    operations = [
+        migrations.RunPython(migrations.RunPython.noop, restore_triggers),
+        migrations.AddField(
+            model_name="prompt",
+            name="version",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(restore_triggers, migrations.RunPython.noop),
+        migrations.AddField(
+            model_name="promptlog",
+            name="prompt_version",
+            field=models.PositiveIntegerField(blank=True, help_text="실행한 프롬프트 버전 번호", null=True),
+        ),
+        migrations.CreateModel(
+            name="PromptVersion",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("number", models.PositiveIntegerField()),
+                ("title", models.CharField(max_length=100)),
+                ("snapshot", apps.common.fields.CompressedTextField(blank=True, null=True)),
+                ("delta", models.TextField(blank=True, null=True)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "prompt",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE, related_name="versions", to="prompts.prompt"
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["-number"],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="promptversion",
+            constraint=models.UniqueConstraint(fields=("prompt", "number"), name="unique_prompt_version"),
+        ),
+        migrations.RunPython(snapshot_existing_prompts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,68 @@
+# Generated by Django 4.2.30 on 2026-10-18 20:09
+
+import django.core.validators
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("prompts", "0012_prompt_versions"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PromptRunLimit",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                (
+                    "run_rate",
+                    models.CharField(
+                        blank=True,
+                        max_length=20,
+                        validators=[
+                            django.core.validators.RegexValidator(
+                                "^[1-9]\\d*/[smhd]", '"요청 수/기간" 형식이어야 합니다. (예: 120/m)'
+                            )
+                        ],
+                    ),
+                ),
+                (
+                    "batch_rate",
+                    models.CharField(
+                        blank=True,
+                        max_length=20,
+                        validators=[
+                            django.core.validators.RegexValidator(
+                                "^[1-9]\\d*/[smhd]", '"요청 수/기간" 형식이어야 합니다. (예: 120/m)'
+                            )
+                        ],
+                    ),
+                ),
+                (
+                    "stream_rate",
+                    models.CharField(
+                        blank=True,
+                        max_length=20,
+                        validators=[
+                            django.core.validators.RegexValidator(
+                                "^[1-9]\\d*/[smhd]", '"요청 수/기간" 형식이어야 합니다. (예: 120/m)'
+                            )
+                        ],
+                    ),
+                ),
+                ("daily_quota", models.PositiveIntegerField(blank=True, null=True)),
+                (
+                    "user",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="run_limit",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+        ),
+    ]
@@ -0,0 +1,52 @@
+# Generated by Django 4.2.30 on 2026-10-18 21:04
+
+from django.db import migrations, models
+
+# 이 시점의 전문 검색 대상 (apps.prompts.search는 이후 스키마에 맞춰 바뀌므로 SQL을 그대로 둠)
+FULLTEXT_TABLES = {"prompts_prompt": ("title", "content")}
+
+
+def sqlite_trigger_statements(table, columns):
+    fts = f"{table}_fts"
+    cols = ", ".join(columns)
+    new_values = ", ".join(f"new.{c}" for c in columns)
+    old_values = ", ".join(f"old.{c}" for c in columns)
+    return [
+        f"CREATE TRIGGER {fts}_ai AFTER INSERT ON {table} BEGIN "
+        f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.rowid, {new_values}); END",
+        f"CREATE TRIGGER {fts}_ad AFTER DELETE ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.rowid, {old_values}); END",
+        f"CREATE TRIGGER {fts}_au AFTER UPDATE OF {cols} ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.rowid, {old_values}); "
+        f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.rowid, {new_values}); END",
+    ]
+
+
+def restore_triggers(apps, schema_editor):
+    # SQLite는 필드 변경 시 테이블을 새로 만들면서 트리거를 함께 지우므로 다시 생성하고 색인을 재구성
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    for table, columns in FULLTEXT_TABLES.items():
+        for suffix in ("ai", "ad", "au"):
+            schema_editor.execute(f"DROP TRIGGER IF EXISTS {table}_fts_{suffix}")
+        for statement in sqlite_trigger_statements(table, columns):
+            schema_editor.execute(statement)
+        schema_editor.execute(f"INSERT INTO {table}_fts({table}_fts) VALUES ('rebuild')")
+
+
+class Migration(migrations.Migration):
+    # 기존 프롬프트는 False라 내용의 {{ }}를 그대로 씀 (템플릿 치환은 프롬프트마다 켬)
+
+    dependencies = [
+        ("prompts", "0013_run_limits"),
+    ]
+
+    operations = [
+        migrations.RunPython(migrations.RunPython.noop, restore_triggers),
+        migrations.AddField(
+            model_name="prompt",
+            name="is_template",
+            field=models.BooleanField(default=False),
+        ),
+        migrations.RunPython(restore_triggers, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,59 @@
+# Generated by Django 4.2.30 on 2026-10-18 22:10
+
+import django.utils.timezone
+from django.db import migrations, models
+
+# 이 시점의 전문 검색 대상 (apps.prompts.search는 이후 스키마에 맞춰 바뀌므로 SQL을 그대로 둠)
+FULLTEXT_TABLES = {"prompts_contentblob": ("text",)}
+
+
+def sqlite_trigger_statements(table, columns):
+    fts = f"{table}_fts"
+    cols = ", ".join(columns)
+    new_values = ", ".join(f"new.{c}" for c in columns)
+    old_values = ", ".join(f"old.{c}" for c in columns)
+    return [
+        f"CREATE TRIGGER {fts}_ai AFTER INSERT ON {table} BEGIN "
+        f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.rowid, {new_values}); END",
+        f"CREATE TRIGGER {fts}_ad AFTER DELETE ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.rowid, {old_values}); END",
+        f"CREATE TRIGGER {fts}_au AFTER UPDATE OF {cols} ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.rowid, {old_values}); "
+        f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.rowid, {new_values}); END",
+    ]
+
+
+def restore_triggers(apps, schema_editor):
+    # SQLite는 필드 추가 시 테이블을 새로 만들면서 트리거를 함께 지우고 rowid도 바뀌므로 다시 생성하고 색인을 재구성
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    for table, columns in FULLTEXT_TABLES.items():
+        for suffix in ("ai", "ad", "au"):
+            schema_editor.execute(f"DROP TRIGGER IF EXISTS {table}_fts_{suffix}")
+        for statement in sqlite_trigger_statements(table, columns):
+            schema_editor.execute(statement)
+        schema_editor.execute(f"INSERT INTO {table}_fts({table}_fts) VALUES ('rebuild')")
+
+
+def copy_created_at(apps, schema_editor):
+    ContentBlob = apps.get_model("prompts", "ContentBlob")
+    ContentBlob.objects.update(last_referenced_at=models.F("created_at"))
+
+
+class Migration(migrations.Migration):
+    # 기존 본문은 저장 시각을 마지막 참조 시각으로 사용 (정리 명령의 유예 기간 기준이 created_at에서 옮겨감)
+
+    dependencies = [
+        ("prompts", "0014_prompt_is_template"),
+    ]
+
+    operations = [
+        migrations.RunPython(migrations.RunPython.noop, restore_triggers),
+        migrations.AddField(
+            model_name="contentblob",
+            name="last_referenced_at",
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.RunPython(restore_triggers, migrations.RunPython.noop),
+        migrations.RunPython(copy_created_at, migrations.RunPython.noop),
+    ]
@@ -1,5 +1,11 @@
+import hashlib
+
 from django.conf import settings
-from django.db import models
+from django.core.validators import RegexValidator
+from django.db import connections, models, router, transaction
+from django.utils import timezone
+
+from apps.common.fields import CompressedTextField
 
 
 class Tag(models.Model):
@@ -12,22 +18,290 @@ class Tag(models.Model):
 class Prompt(models.Model):
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="prompts")
     title = models.CharField(max_length=100)
-    content = models.TextField(help_text="LLM에 전달할 프롬프트 내용")
+    content = models.TextField(help_text="LLM에 전달할 프롬프트 내용")  # 전문 검색 대상이라 압축하지 않음
     is_public = models.BooleanField(default=False)
     is_favorite = models.BooleanField(default=False)
+    # 실행 시 내용의 {{변수}}를 치환할지 (templating.py, 템플릿 도입 전 프롬프트는 내용을 그대로 씀)
+    is_template = models.BooleanField(default=False)
     tags = models.ManyToManyField(Tag, blank=True, related_name="prompts")
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    # 현재 내용의 버전 번호 (PromptVersion.number, 0이면 아직 이력 없음)
+    version = models.PositiveIntegerField(default=0)
+    # 실행 통계 (실행 로그 저장 시 stats.py에서 증가, reconcile_run_stats 명령으로 재계산)
+    run_count = models.PositiveIntegerField(default=0)
+    last_run_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["-created_at", "-id"]
+        indexes = [
+            models.Index(fields=["user", "created_at"], name="prompt_user_created_idx"),
+            models.Index(fields=["user", "is_favorite"], name="prompt_user_favorite_idx"),
+            models.Index(fields=["user", "is_public"], name="prompt_user_public_idx"),
+        ]
 
     def __str__(self):
         return f"{self.title} ({self.user.email})"
 
 
+class PromptVersion(models.Model):
+    """
+    프롬프트 제목 / 내용의 버전 이력 (versions.py)
+    - snapshot: 전체 내용 (PROMPT_VERSION_SNAPSHOT_INTERVAL 간격, 또는 차이가 내용보다 클 때)
+    - delta: 직전 버전 내용과의 줄 단위 차이 (snapshot이 아닌 버전)
+    """
+
+    prompt = models.ForeignKey(Prompt, on_delete=models.CASCADE, related_name="versions")
+    number = models.PositiveIntegerField()
+    title = models.CharField(max_length=100)
+    snapshot = CompressedTextField(null=True, blank=True)
+    delta = models.TextField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["-number"]
+        constraints = [models.UniqueConstraint(fields=["prompt", "number"], name="unique_prompt_version")]
+
+    def __str__(self):
+        return f"{self.prompt_id} v{self.number}"
+
+
+class UserTagCount(models.Model):
+    """
+    유저별 태그 사용 수 (태그 facet용 비정규화 집계)
+    - Prompt.tags 변경 / 프롬프트 삭제 시 signals.py에서 증감
+    """
+
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="tag_counts")
+    tag = models.ForeignKey(Tag, on_delete=models.CASCADE, related_name="user_counts")
+    count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [models.UniqueConstraint(fields=["user", "tag"], name="unique_user_tag_count")]
+
+    def __str__(self):
+        return f"{self.tag.name}: {self.count} ({self.user.email})"
+
+
+class PromptListVersion(models.Model):
+    """
+    유저별 프롬프트 목록 버전 (목록 ETag / Last-Modified용)
+    - 프롬프트 생성 / 수정 / 삭제 / 태그 변경 시 signals.py에서 version을 새 임의 값으로 바꾸고 changed_at을 갱신
+      (증가 대신 임의 값을 써서 행이 없어도 UPSERT 한 번으로 처리)
+    """
+
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, primary_key=True, related_name="prompt_list_version"
+    )
+    version = models.PositiveBigIntegerField(default=0)
+    changed_at = models.DateTimeField()
+
+    def __str__(self):
+        return f"{self.user_id}: v{self.version}"
+
+
+class UserRunStats(models.Model):
+    """
+    유저별 누적 실행 수 / 마지막 실행 시각 (stats.py에서 증가, 프롬프트 삭제 시 그 프롬프트의 실행 수만큼 감소)
+    """
+
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, primary_key=True, related_name="run_stats"
+    )
+    run_count = models.PositiveIntegerField(default=0)
+    last_run_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.user_id}: {self.run_count}회"
+
+
+class PromptRunDay(models.Model):
+    """
+    프롬프트별 일별 실행 수 (날짜는 settings.TIME_ZONE 기준)
+    - 유저의 일별 실행 수는 (user, day) 인덱스로 이 테이블만 합산
+    - 아카이브로 실행 로그가 지워져도 남아 있으므로 기간 통계는 로그를 읽지 않음
+    """
+
+    prompt = models.ForeignKey(Prompt, on_delete=models.CASCADE, related_name="run_days")
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="prompt_run_days")
+    day = models.DateField()
+    run_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [models.UniqueConstraint(fields=["prompt", "day"], name="unique_prompt_run_day")]
+        indexes = [models.Index(fields=["user", "day"], name="promptrunday_user_day_idx")]
+
+    def __str__(self):
+        return f"{self.prompt_id} {self.day}: {self.run_count}회"
+
+
+def content_hash(text):
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+class ContentBlob(models.Model):
+    """
+    실행 입력/출력 본문 (내용의 SHA-256을 키로 한 번만 저장)
+    - 여러 PromptLog가 같은 행을 가리키며, 참조가 없어진 행은 prune_content_blobs 명령이 정리
+    - last_referenced_at: 로그가 이 본문을 마지막으로 저장(재사용 포함)한 시각, 정리 명령의 유예 기간 기준
+    """
+
+    hash = models.CharField(max_length=64, primary_key=True)
+    text = models.TextField()  # 전문 검색 대상이라 압축하지 않음
+    created_at = models.DateTimeField(auto_now_add=True)
+    last_referenced_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return self.hash
+
+
+class PromptLogQuerySet(models.QuerySet):
+    def bulk_create(self, objs, *args, **kwargs):
+        objs = list(objs)
+        with transaction.atomic(using=self.db, savepoint=False):
+            store_pending_blobs(objs, using=self.db)
+            return super().bulk_create(objs, *args, **kwargs)
+
+
+def store_pending_blobs(logs, using=None):
+    """
+    input_text / output_text로 지정된 본문을 UPSERT 한 번으로 저장
+    - 이미 있는 본문은 last_referenced_at만 갱신해, 로그가 커밋되기 전에 prune_content_blobs가 지우지 않게 함
+    """
+    now = timezone.now()
+    blobs = {}
+    for log in logs:
+        for field_name, text in getattr(log, "_pending_texts", {}).items():
+            digest = content_hash(text)
+            blob = blobs.setdefault(digest, ContentBlob(hash=digest, text=text, last_referenced_at=now))
+            setattr(log, field_name, blob)
+        log._pending_texts = {}
+    if blobs:
+        using = using or router.db_for_write(ContentBlob)
+        ContentBlob.objects.using(using).bulk_create(
+            blobs.values(),
+            update_conflicts=True,
+            update_fields=["last_referenced_at"],
+            # MySQL은 충돌 대상 컬럼을 지정하지 않음 (ON DUPLICATE KEY UPDATE)
+            unique_fields=["hash"] if connections[using].features.supports_update_conflicts_with_target else None,
+        )
+
+
 class PromptLog(models.Model):
+    """
+    실행 이력. 입력/출력 본문은 ContentBlob에 한 번만 저장하고 해시로 참조
+    - input_text / output_text 속성으로 읽고 쓰며, 저장(save / bulk_create) 시 본문을 함께 저장
+    """
+
     prompt = models.ForeignKey(Prompt, on_delete=models.CASCADE, related_name="logs")
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="prompt_logs")
-    input_text = models.TextField()
-    output_text = models.TextField(blank=True, null=True)
+    # 본문 삭제는 참조 여부를 DELETE 문에서 다시 확인하는 prune_content_blobs만 수행 (DB FK 제약은 유지)
+    input_blob = models.ForeignKey(ContentBlob, on_delete=models.DO_NOTHING, related_name="+")
+    output_blob = models.ForeignKey(ContentBlob, on_delete=models.DO_NOTHING, related_name="+", null=True, blank=True)
+    is_partial = models.BooleanField(default=False, help_text="스트리밍 도중 클라이언트 연결이 끊겨 일부만 저장된 실행")
+    is_cached = models.BooleanField(default=False, help_text="백엔드 호출 없이 결과 캐시로 응답한 실행")
+    prompt_version = models.PositiveIntegerField(null=True, blank=True, help_text="실행한 프롬프트 버전 번호")
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        ordering = ["-created_at", "-id"]
+        indexes = [
+            models.Index(fields=["user", "created_at"], name="promptlog_user_created_idx"),
+            models.Index(fields=["prompt", "created_at"], name="promptlog_prompt_created_idx"),
+        ]
+
+    objects = PromptLogQuerySet.as_manager()
+
     def __str__(self):
         return f"Log for {self.prompt.title} by {self.user.email}"
+
+    def _get_text(self, field_name):
+        pending = getattr(self, "_pending_texts", {})
+        if field_name in pending:
+            return pending[field_name]
+        blob = getattr(self, field_name)
+        return blob.text if blob is not None else None
+
+    def _set_text(self, field_name, text):
+        if text is None:
+            getattr(self, "_pending_texts", {}).pop(field_name, None)
+            setattr(self, field_name, None)
+            return
+        text = str(text)
+        self.__dict__.setdefault("_pending_texts", {})[field_name] = text
+        setattr(self, f"{field_name}_id", content_hash(text))
+
+    @property
+    def input_text(self):
+        return self._get_text("input_blob")
+
+    @input_text.setter
+    def input_text(self, text):
+        self._set_text("input_blob", text)
+
+    @property
+    def output_text(self):
+        return self._get_text("output_blob")
+
+    @output_text.setter
+    def output_text(self, text):
+        self._set_text("output_blob", text)
+
+    def save(self, *args, **kwargs):
+        with transaction.atomic(using=kwargs.get("using")):
+            store_pending_blobs([self], using=kwargs.get("using"))
+            super().save(*args, **kwargs)
+
+
+class PromptLogRetentionPolicy(models.Model):
+    """
+    유저별 실행 로그 보관 기간 (없으면 settings.PROMPT_LOG_ARCHIVE["RETENTION_DAYS"] 사용)
+    - 보관 기간이 지난 로그는 archive_prompt_logs 명령이 압축 세그먼트로 옮긴 뒤 삭제
+    """
+
+    user = models.OneToOneField(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="log_retention_policy")
+    retention_days = models.PositiveIntegerField()
+
+    def __str__(self):
+        return f"{self.user.email}: {self.retention_days}일"
+
+
+RATE_VALIDATOR = RegexValidator(r"^[1-9]\d*/[smhd]", '"요청 수/기간" 형식이어야 합니다. (예: 120/m)')
+
+
+class PromptRunLimit(models.Model):
+    """
+    유저별 실행 요청 제한 (비어 있는 값은 settings.PROMPT_RUN_RATES / PROMPT_RUN_DAILY_QUOTA 사용, throttling.py)
+    - *_rate: 엔드포인트별 토큰 버킷 "요청 수/기간" (s / m / h / d)
+    - daily_quota: 하루 실행 수 (배치는 실행한 입력 수만큼), 0이면 제한 없음
+    """
+
+    user = models.OneToOneField(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="run_limit")
+    run_rate = models.CharField(max_length=20, blank=True, validators=[RATE_VALIDATOR])
+    batch_rate = models.CharField(max_length=20, blank=True, validators=[RATE_VALIDATOR])
+    stream_rate = models.CharField(max_length=20, blank=True, validators=[RATE_VALIDATOR])
+    daily_quota = models.PositiveIntegerField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.user.email}: run={self.run_rate or '-'}, quota={self.daily_quota}"
+
+
+class PromptLogArchive(models.Model):
+    """
+    보관 기간이 지난 PromptLog를 옮겨 둔 gzip NDJSON 세그먼트 (PROMPT_LOG_ARCHIVE["DIR"] 아래 path)
+    - 배치마다 gzip 멤버를 이어 붙이고 row_count를 커밋하므로, 앞에서부터 row_count 줄만 유효
+    """
+
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="prompt_log_archives")
+    path = models.CharField(max_length=255)
+    row_count = models.PositiveIntegerField(default=0)
+    start_at = models.DateTimeField(null=True, blank=True)
+    end_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["start_at", "id"]
+        indexes = [models.Index(fields=["user", "end_at"], name="promptlogarchive_user_end_idx")]
+
+    def __str__(self):
+        return f"{self.path} ({self.row_count}건)"
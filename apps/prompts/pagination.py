@@ -0,0 +1,14 @@
+from django.conf import settings
+from rest_framework.pagination import CursorPagination
+
+
+class CreatedAtCursorPagination(CursorPagination):
+    """
+    (created_at, id) 기준 커서 페이지네이션
+    - COUNT(*) 없이 다음/이전 커서만 제공하므로 페이지 깊이와 무관하게 응답 시간이 일정함
+    - ?page_size= 로 페이지 크기 조정 가능 (MAX_PAGE_SIZE 까지)
+    """
+
+    ordering = ("-created_at", "-id")
+    page_size_query_param = "page_size"
+    max_page_size = settings.MAX_PAGE_SIZE
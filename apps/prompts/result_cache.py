@@ -0,0 +1,65 @@
+"""
+프롬프트 실행 결과 캐시
+
+(프롬프트 내용, 제목, 입력, 백엔드/모델 파라미터)의 해시를 키로 settings.PROMPT_RESULT_CACHE_ALIAS 캐시에 저장한다.
+LRU 제거와 TTL은 캐시 백엔드 설정(MAX_ENTRIES, TIMEOUT)을 따르며, locmem 대신 공유 캐시로 바꿔 끼울 수 있다.
+프롬프트가 수정/삭제되면 프롬프트별 세대(generation) 값을 올려 이전 결과를 무효화한다.
+실행 경로는 async 뷰이므로 조회/저장은 캐시의 async API(aget / aset)를 사용한다.
+"""
+
+import hashlib
+import json
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+
+from apps.common.metrics import metrics
+
+
+def get_result_cache():
+    return caches[settings.PROMPT_RESULT_CACHE_ALIAS]
+
+
+def _generation_key(prompt_id):
+    return f"prompt-result-gen:{prompt_id}"
+
+
+async def amake_result_key(prompt_id, run_request, backend):
+    generation = await get_result_cache().aget(_generation_key(prompt_id), 0)
+    payload = json.dumps(
+        [run_request.title, run_request.content, run_request.input_text, backend.cache_params()],
+        ensure_ascii=False,
+        sort_keys=True,
+    )
+    digest = hashlib.sha256(payload.encode()).hexdigest()
+    return f"prompt-result:{prompt_id}:{generation}:{digest}"
+
+
+async def aget_cached_output(key):
+    if not settings.PROMPT_RESULT_CACHE_ENABLED:
+        return None
+    output_text = await get_result_cache().aget(key)
+    metrics.incr("prompt_result_cache.hits" if output_text is not None else "prompt_result_cache.misses")
+    return output_text
+
+
+async def aset_cached_output(key, output_text):
+    if settings.PROMPT_RESULT_CACHE_ENABLED:
+        await get_result_cache().aset(key, output_text)
+
+
+def invalidate_prompt_results(prompt_id):
+    get_result_cache().set(_generation_key(prompt_id), time.time_ns(), None)
+
+
+async def run_with_cache(backend, prompt_id, run_request):
+    """캐시에 결과가 있으면 그대로, 없으면 백엔드를 호출해 저장. (output_text, is_cached) 반환"""
+    key = await amake_result_key(prompt_id, run_request, backend)
+    output_text = await aget_cached_output(key)
+    if output_text is not None:
+        return output_text, True
+
+    output_text = await backend.run(run_request)
+    await aset_cached_output(key, output_text)
+    return output_text, False
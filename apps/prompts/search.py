@@ -0,0 +1,164 @@
+"""
+프롬프트 / 실행 로그 전문 검색
+
+- MySQL: FULLTEXT 인덱스 + MATCH ... AGAINST (BOOLEAN MODE)
+- SQLite(로컬): FTS5 external content 테이블 + 동기화 트리거
+- 실행 로그는 본문 테이블(ContentBlob)을 색인하고, 유저의 로그가 참조하는 본문 중 일치하는 것을 찾아 그 로그를 반환
+  (같은 본문은 한 번만 색인되며, 모든 검색어가 입력 / 출력 중 한쪽에 함께 있어야 일치)
+
+검색어는 단어 단위로 잘라 모든 단어를 (접두어 일치로) 포함하는 문서만 찾고, 관련도 순으로 정렬한다.
+"""
+
+import html
+import re
+
+from django.db import connection
+from django.db.models import F
+
+from .models import Prompt, PromptLog
+
+# 검색 대상 테이블과 인덱스 컬럼 (색인 생성 SQL은 각 마이그레이션이 당시의 스키마 기준으로 가짐)
+FULLTEXT_TABLES = {
+    "prompts_prompt": ("title", "content"),
+    "prompts_contentblob": ("text",),
+}
+SNIPPET_RADIUS = 60
+MAX_TERMS = 8
+
+
+def search_terms(query):
+    return re.findall(r"\w+", query.lower())[:MAX_TERMS]
+
+
+def _match_expression(terms):
+    if connection.vendor == "mysql":
+        return " ".join(f"+{term}*" for term in terms)
+    return " ".join(f'"{term}"*' for term in terms)
+
+
+def _snippet(terms, *texts):
+    """첫 번째로 검색어가 등장하는 위치 주변을 잘라 <mark>로 강조"""
+    texts = [text for text in texts if text]
+    pattern = re.compile(r"\b(" + "|".join(re.escape(term) for term in terms) + r")\w*", re.IGNORECASE)
+    for text in texts:
+        match = pattern.search(text)
+        if match is None:
+            continue
+        start = max(match.start() - SNIPPET_RADIUS, 0)
+        end = min(match.end() + SNIPPET_RADIUS, len(text))
+        fragment = html.escape(text[start:end])
+        fragment = pattern.sub(lambda m: f"<mark>{m.group(0)}</mark>", fragment)
+        return ("…" if start else "") + fragment + ("…" if end < len(text) else "")
+    return html.escape(texts[0][: SNIPPET_RADIUS * 2] if texts else "")
+
+
+def _ranked_ids(table, user_id, terms, limit, offset):
+    """관련도 순 (id, score) 목록. 본문 컬럼은 읽지 않고 인덱스만 사용"""
+    match = _match_expression(terms)
+    if connection.vendor == "mysql":
+        indexed = ", ".join(FULLTEXT_TABLES[table])
+        sql = (
+            f"SELECT id, MATCH({indexed}) AGAINST (%s IN BOOLEAN MODE) AS score FROM {table} "
+            f"WHERE MATCH({indexed}) AGAINST (%s IN BOOLEAN MODE) AND user_id = %s "
+            f"ORDER BY score DESC, id DESC LIMIT %s OFFSET %s"
+        )
+        params = [match, match, user_id, limit, offset]
+    else:
+        sql = (
+            f"SELECT t.id, -bm25({table}_fts) AS score FROM {table}_fts "
+            f"JOIN {table} t ON t.id = {table}_fts.rowid "
+            f"WHERE {table}_fts MATCH %s AND t.user_id = %s "
+            f"ORDER BY score DESC, t.id DESC LIMIT %s OFFSET %s"
+        )
+        params = [match, user_id, limit, offset]
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return [(row_id, float(score)) for row_id, score in cursor.fetchall()]
+
+
+def _ranked_log_ids(user_id, terms, limit, offset):
+    """
+    관련도 순 (log id, score) 목록
+    - 본문 색인에는 유저 컬럼이 없으므로, 유저의 로그가 참조하는 본문으로 후보를 먼저 좁힌 뒤 그 본문만 매칭 / 점수 계산
+      (다른 유저의 본문이 아무리 많이 일치해도 비용이 늘지 않음)
+    - 일치한 본문을 입력 또는 출력으로 참조하는 유저의 로그를 찾음 (둘 다 일치하면 높은 점수)
+    """
+    match = _match_expression(terms)
+    user_blobs = (
+        "SELECT input_blob_id AS hash FROM prompts_promptlog WHERE user_id = %s "
+        "UNION SELECT output_blob_id FROM prompts_promptlog WHERE user_id = %s AND output_blob_id IS NOT NULL"
+    )
+    if connection.vendor == "mysql":
+        matched = (
+            "SELECT STRAIGHT_JOIN b.hash, MATCH(b.text) AGAINST (%s IN BOOLEAN MODE) AS score "
+            f"FROM ({user_blobs}) u JOIN prompts_contentblob b ON b.hash = u.hash "
+            "WHERE MATCH(b.text) AGAINST (%s IN BOOLEAN MODE)"
+        )
+        match_params = [match, user_id, user_id, match]
+    else:
+        # CROSS JOIN으로 조인 순서를 고정해 FTS 테이블은 본문 rowid로만 조회 (MATCH + rowid 조건)
+        matched = (
+            "SELECT b.hash, -bm25(prompts_contentblob_fts) AS score "
+            f"FROM ({user_blobs}) u CROSS JOIN prompts_contentblob b ON b.hash = u.hash "
+            "CROSS JOIN prompts_contentblob_fts ON prompts_contentblob_fts.rowid = b.rowid "
+            "WHERE prompts_contentblob_fts MATCH %s"
+        )
+        match_params = [user_id, user_id, match]
+
+    sql = (
+        "SELECT id, MAX(score) AS score FROM ("
+        f"SELECT l.id, m.score FROM ({matched}) m JOIN prompts_promptlog l ON l.input_blob_id = m.hash "
+        "WHERE l.user_id = %s "
+        "UNION ALL "
+        f"SELECT l.id, m.score FROM ({matched}) m JOIN prompts_promptlog l ON l.output_blob_id = m.hash "
+        "WHERE l.user_id = %s"
+        ") hits GROUP BY id ORDER BY score DESC, id DESC LIMIT %s OFFSET %s"
+    )
+    params = [*match_params, user_id, *match_params, user_id, limit, offset]
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return [(row_id, float(score)) for row_id, score in cursor.fetchall()]
+
+
+def search_prompts(user, query, limit, offset=0):
+    terms = search_terms(query)
+    if not terms:
+        return []
+    ranked = _ranked_ids(Prompt._meta.db_table, user.pk, terms, limit, offset)
+    rows = Prompt.objects.filter(pk__in=[pk for pk, _ in ranked]).values("id", "title", "content", "created_at")
+    rows = {row["id"]: row for row in rows}
+    return [
+        {
+            "id": pk,
+            "title": rows[pk]["title"],
+            "snippet": _snippet(terms, rows[pk]["content"], rows[pk]["title"]),
+            "score": score,
+            "created_at": rows[pk]["created_at"],
+        }
+        for pk, score in ranked
+        if pk in rows
+    ]
+
+
+def search_logs(user, query, limit, offset=0):
+    terms = search_terms(query)
+    if not terms:
+        return []
+    ranked = _ranked_log_ids(user.pk, terms, limit, offset)
+    rows = PromptLog.objects.filter(pk__in=[pk for pk, _ in ranked]).values(
+        "id", "prompt_id", "created_at", input_text=F("input_blob__text"), output_text=F("output_blob__text")
+    )
+    rows = {row["id"]: row for row in rows}
+    return [
+        {
+            "id": pk,
+            "prompt": rows[pk]["prompt_id"],
+            "snippet": _snippet(terms, rows[pk]["input_text"], rows[pk]["output_text"]),
+            "score": score,
+            "created_at": rows[pk]["created_at"],
+        }
+        for pk, score in ranked
+        if pk in rows
+    ]
@@ -1,6 +1,9 @@
+from django.db import transaction
 from rest_framework import serializers
+from rest_framework.utils import html
 
-from .models import Prompt, PromptLog, Tag
+from .models import Prompt, PromptLog, PromptLogArchive, PromptVersion, Tag
+from .versions import build_version, record_revision
 
 
 class TagSerializer(serializers.ModelSerializer):
@@ -9,9 +12,21 @@ class TagSerializer(serializers.ModelSerializer):
         fields = ["id", "name"]
 
 
+class TagIdsField(serializers.ListField):
+    """
+    태그 id 목록 (검증은 PromptSerializer.validate_tag_ids에서 한 번의 쿼리로)
+    - PrimaryKeyRelatedField(many=True)와 같이 JSON 요청에서는 필수, HTML 폼에서 값이 없으면 빈 목록
+    """
+
+    def get_value(self, dictionary):
+        if html.is_html_input(dictionary) and self.field_name not in dictionary:
+            return serializers.empty if getattr(self.root, "partial", False) else []
+        return super().get_value(dictionary)
+
+
 class PromptSerializer(serializers.ModelSerializer):
     tags = TagSerializer(many=True, read_only=True)
-    tag_ids = serializers.PrimaryKeyRelatedField(many=True, queryset=Tag.objects.all(), write_only=True, source="tags")
+    tag_ids = TagIdsField(child=serializers.IntegerField(), write_only=True, source="tags")
 
     class Meta:
         model = Prompt
@@ -21,29 +36,55 @@ class PromptSerializer(serializers.ModelSerializer):
             "content",
             "is_public",
             "is_favorite",
+            "is_template",
             "tags",
             "tag_ids",
             "created_at",
+            "updated_at",
+            "version",
+            "run_count",
+            "last_run_at",
         ]
-        read_only_fields = ["id", "created_at"]
+        read_only_fields = ["id", "created_at", "updated_at", "version", "run_count", "last_run_at"]
+
+    def validate_tag_ids(self, value):
+        # id 개수와 무관하게 한 번의 쿼리로 태그를 조회
+        tag_ids = list(dict.fromkeys(value))
+        tags = Tag.objects.in_bulk(tag_ids)
+        missing = [pk for pk in tag_ids if pk not in tags]
+        if missing:
+            raise serializers.ValidationError(f"존재하지 않는 태그입니다: {missing}")
+        return [tags[pk] for pk in tag_ids]
 
     def create(self, validated_data):
         tags = validated_data.pop("tags", [])
-        prompt = Prompt.objects.create(**validated_data)
+        with transaction.atomic(savepoint=False):
+            prompt = Prompt.objects.create(**validated_data, version=1)
+            build_version(prompt.pk, 1, prompt.title, prompt.content).save()
         prompt.tags.set(tags)
         return prompt
 
     def update(self, instance, validated_data):
         tags = validated_data.pop("tags", None)
-        for attr, value in validated_data.items():
-            setattr(instance, attr, value)
-        instance.save()
+        with transaction.atomic(savepoint=False):
+            # 동시 수정 사이에서도 직전 버전 내용 기준으로 차이를 만들도록 행을 잠그고 다시 읽음
+            previous = (
+                Prompt.objects.select_for_update().filter(pk=instance.pk).values_list("title", "content", "version")
+            ).get()
+            for attr, value in validated_data.items():
+                setattr(instance, attr, value)
+            record_revision(instance, previous)
+            instance.save()
         if tags is not None:
             instance.tags.set(tags)
         return instance
 
 
 class PromptLogSerializer(serializers.ModelSerializer):
+    # 본문은 ContentBlob에 저장되므로 모델 속성(input_text / output_text)을 그대로 노출
+    input_text = serializers.CharField()
+    output_text = serializers.CharField(read_only=True, allow_null=True)
+
     class Meta:
         model = PromptLog
         fields = [
@@ -51,6 +92,21 @@ class PromptLogSerializer(serializers.ModelSerializer):
             "prompt",
             "input_text",
             "output_text",
+            "prompt_version",
+            "is_partial",
+            "is_cached",
             "created_at",
         ]
-        read_only_fields = ["id", "output_text", "created_at", "prompt"]
+        read_only_fields = ["id", "output_text", "prompt_version", "is_partial", "is_cached", "created_at", "prompt"]
+
+
+class PromptVersionSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = PromptVersion
+        fields = ["number", "title", "created_at"]
+
+
+class PromptLogArchiveSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = PromptLogArchive
+        fields = ["id", "row_count", "start_at", "end_at", "created_at"]
@@ -0,0 +1,154 @@
+import secrets
+from collections import Counter, defaultdict
+
+from django.contrib.auth import get_user_model
+from django.db import connection, transaction
+from django.db.models import Case, F, Value, When
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .archive import archive_root
+from .models import (
+    Prompt,
+    PromptListVersion,
+    PromptLogArchive,
+    PromptRunLimit,
+    UserRunStats,
+    UserTagCount,
+)
+from .throttling import invalidate_user_limits
+
+
+def apply_tag_count_deltas(deltas):
+    """{(user_id, tag_id): delta} 를 UserTagCount에 반영 (같은 유저/증감량끼리 UPDATE 한 번)"""
+    grouped = defaultdict(list)
+    for (user_id, tag_id), delta in deltas.items():
+        if delta:
+            grouped[(user_id, delta)].append(tag_id)
+
+    for (user_id, delta), tag_ids in grouped.items():
+        if delta > 0:
+            UserTagCount.objects.bulk_create(
+                [UserTagCount(user_id=user_id, tag_id=tag_id) for tag_id in tag_ids], ignore_conflicts=True
+            )
+        # count는 부호 없는 컬럼이라 MySQL에서 count + delta가 음수가 되는 순간 범위 초과 오류 → 계산 전에 비교해 0으로 고정
+        UserTagCount.objects.filter(user_id=user_id, tag_id__in=tag_ids).update(
+            count=Case(When(count__gte=-delta, then=F("count") + delta), default=Value(0))
+        )
+
+
+def bump_prompt_list_versions(user_ids):
+    """유저들의 프롬프트 목록 버전을 새 임의 값으로 바꿈 (목록 ETag 무효화, 행이 없으면 만들며 UPSERT 한 번)"""
+    now = timezone.now()
+    rows = [
+        PromptListVersion(user_id=user_id, version=secrets.randbits(63), changed_at=now) for user_id in set(user_ids)
+    ]
+    if not rows:
+        return
+    PromptListVersion.objects.bulk_create(
+        rows,
+        update_conflicts=True,
+        update_fields=["version", "changed_at"],
+        # MySQL은 충돌 대상 컬럼을 지정하지 않음 (ON DUPLICATE KEY UPDATE)
+        unique_fields=["user"] if connection.features.supports_update_conflicts_with_target else None,
+    )
+
+
+@receiver(post_save, sender=Prompt)
+@receiver(post_delete, sender=Prompt)
+def touch_prompt_list(sender, instance, origin=None, **kwargs):
+    # 유저 삭제의 CASCADE로 지워지는 경우 목록 버전 행은 이미 지워졌으므로 다시 만들면 커밋 시 FK 위반
+    if origin is not None and getattr(origin, "model", type(origin)) is get_user_model():
+        return
+    bump_prompt_list_versions([instance.user_id])
+
+
+@receiver(m2m_changed, sender=Prompt.tags.through)
+def touch_tagged_prompts(sender, instance, action, reverse, pk_set, **kwargs):
+    """태그 연결만 바뀐 경우에도 상세 / 목록 ETag가 바뀌도록 updated_at과 목록 버전을 갱신"""
+    if not reverse:
+        if action == "post_clear" or (action in ("post_add", "post_remove") and pk_set):
+            # 응답 ETag도 저장된 값으로 만들도록 인스턴스에도 같은 시각을 넣음
+            instance.updated_at = timezone.now()
+            Prompt.objects.filter(pk=instance.pk).update(updated_at=instance.updated_at)
+            bump_prompt_list_versions([instance.user_id])
+        return
+
+    if action == "pre_clear":
+        instance._cleared_prompt_ids = list(
+            sender.objects.filter(tag_id=instance.pk).values_list("prompt_id", flat=True)
+        )
+        return
+    if action == "post_clear":
+        pk_set = getattr(instance, "_cleared_prompt_ids", [])
+    elif action not in ("post_add", "post_remove"):
+        return
+    if pk_set:
+        prompts = Prompt.objects.filter(pk__in=pk_set)
+        user_ids = set(prompts.values_list("user_id", flat=True))
+        prompts.update(updated_at=timezone.now())
+        bump_prompt_list_versions(user_ids)
+
+
+@receiver(m2m_changed, sender=Prompt.tags.through)
+def update_tag_counts(sender, instance, action, reverse, pk_set, **kwargs):
+    if action == "pre_clear":
+        # clear()는 post_clear에 pk_set을 주지 않으므로 지우기 전 연결을 기억
+        if reverse:
+            instance._cleared_tag_links = list(
+                sender.objects.filter(tag_id=instance.pk).values_list("prompt__user_id", "tag_id")
+            )
+        else:
+            instance._cleared_tag_links = [
+                (instance.user_id, tag_id)
+                for tag_id in sender.objects.filter(prompt_id=instance.pk).values_list("tag_id", flat=True)
+            ]
+        return
+
+    if action == "post_clear":
+        links = getattr(instance, "_cleared_tag_links", [])
+        apply_tag_count_deltas({link: -count for link, count in Counter(links).items()})
+        return
+
+    if action not in ("post_add", "post_remove") or not pk_set:
+        return
+
+    sign = 1 if action == "post_add" else -1
+    if reverse:
+        user_ids = Prompt.objects.filter(pk__in=pk_set).values_list("user_id", flat=True)
+        links = Counter((user_id, instance.pk) for user_id in user_ids)
+    else:
+        links = Counter((instance.user_id, tag_id) for tag_id in pk_set)
+    apply_tag_count_deltas({link: sign * count for link, count in links.items()})
+
+
+@receiver(pre_delete, sender=Prompt)
+def release_tag_counts(sender, instance, **kwargs):
+    tag_ids = Prompt.tags.through.objects.filter(prompt_id=instance.pk).values_list("tag_id", flat=True)
+    apply_tag_count_deltas({(instance.user_id, tag_id): -1 for tag_id in tag_ids})
+
+
+@receiver(pre_delete, sender=Prompt)
+def release_run_stats(sender, instance, **kwargs):
+    # 유저 누적 실행 수에서 삭제되는 프롬프트의 실행 수를 뺌 (일별 행은 CASCADE로 함께 삭제)
+    runs = Prompt.objects.filter(pk=instance.pk).values_list("run_count", flat=True).first()
+    if runs:
+        # run_count도 부호 없는 컬럼이므로 빼기 전에 비교해 0으로 고정 (apply_tag_count_deltas와 같은 이유)
+        UserRunStats.objects.filter(user_id=instance.user_id).update(
+            run_count=Case(When(run_count__gte=runs, then=F("run_count") - runs), default=Value(0))
+        )
+
+
+@receiver(post_delete, sender=PromptLogArchive)
+def remove_archive_file(sender, instance, **kwargs):
+    # 삭제가 롤백되면 파일이 남아 있어야 하므로 커밋 후 제거
+    if instance.path:
+        path = archive_root() / instance.path
+        transaction.on_commit(lambda: path.unlink(missing_ok=True))
+
+
+@receiver(post_save, sender=PromptRunLimit)
+@receiver(post_delete, sender=PromptRunLimit)
+def invalidate_run_limits(sender, instance, **kwargs):
+    invalidate_user_limits(instance.user_id)
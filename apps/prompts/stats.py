@@ -0,0 +1,137 @@
+"""
+프롬프트 / 유저 실행 통계 (집계 테이블)
+
+- 실행 로그를 저장하는 트랜잭션 안에서 record_runs()가 Prompt.run_count / last_run_at,
+  UserRunStats, PromptRunDay(일별)를 UPDATE ... SET run_count = run_count + n 으로 증가
+- 이미 있는 행은 UPDATE 한 번, 처음 실행된 유저 / 날짜만 행을 만든 뒤 다시 UPDATE
+- 통계 API와 PromptSerializer는 이 테이블만 읽고 실행 로그는 집계하지 않음
+- rebuild_user_stats(): 남아 있는 실행 로그로 다시 계산 (reconcile_run_stats 명령)
+"""
+
+from collections import Counter
+from datetime import datetime, time, timedelta
+
+from django.db import transaction
+from django.db.models import F, Max, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce, Greatest
+from django.utils import timezone
+
+from .models import Prompt, PromptLog, PromptLogArchive, PromptRunDay, UserRunStats
+from .signals import bump_prompt_list_versions
+
+RECONCILE_CHUNK_SIZE = 5000
+# 통계 API의 ?days= 최대값
+RUN_STATS_MAX_DAYS = 366
+
+
+def _add_runs(queryset, runs, last_run_at=None):
+    """run_count를 runs만큼 증가 (last_run_at은 더 최근 값일 때만 바꿈), 갱신한 행 수 반환"""
+    changes = {"run_count": F("run_count") + runs}
+    if last_run_at is not None:
+        changes["last_run_at"] = Greatest(Coalesce(F("last_run_at"), Value(last_run_at)), Value(last_run_at))
+    return queryset.update(**changes)
+
+
+def _add_runs_or_create(model, lookup, runs, last_run_at=None):
+    queryset = model.objects.filter(**lookup)
+    if _add_runs(queryset, runs, last_run_at):
+        return
+    # 동시에 다른 요청이 만들었을 수 있으므로 충돌은 무시하고 다시 증가
+    model.objects.bulk_create([model(**lookup)], ignore_conflicts=True)
+    _add_runs(queryset, runs, last_run_at)
+
+
+def record_runs(logs):
+    """저장된 실행 로그를 통계에 반영 (호출부의 트랜잭션 안에서 실행)"""
+    prompts, users, days = Counter(), Counter(), Counter()
+    last_run = {}
+    for log in logs:
+        prompts[log.prompt_id] += 1
+        users[log.user_id] += 1
+        days[(log.prompt_id, log.user_id, timezone.localdate(log.created_at))] += 1
+        for key in (("prompt", log.prompt_id), ("user", log.user_id)):
+            last_run[key] = max(last_run.get(key, log.created_at), log.created_at)
+
+    for prompt_id, runs in prompts.items():
+        _add_runs(Prompt.objects.filter(pk=prompt_id), runs, last_run[("prompt", prompt_id)])
+    for user_id, runs in users.items():
+        _add_runs_or_create(UserRunStats, {"user_id": user_id}, runs, last_run[("user", user_id)])
+    for (prompt_id, user_id, day), runs in days.items():
+        _add_runs_or_create(PromptRunDay, {"prompt_id": prompt_id, "user_id": user_id, "day": day}, runs)
+
+
+def daily_runs(queryset, days, today=None):
+    """PromptRunDay 쿼리셋의 최근 days일 실행 수를 [{"date", "runs"}] 로 (실행이 없는 날은 0)"""
+    today = today or timezone.localdate()
+    start = today - timedelta(days=days - 1)
+    counts = dict(
+        queryset.filter(day__gte=start, day__lte=today)
+        .values("day")
+        .annotate(runs=Sum("run_count"))
+        .order_by()
+        .values_list("day", "runs")
+    )
+    return [{"date": day, "runs": counts.get(day, 0)} for day in (start + timedelta(days=n) for n in range(days))]
+
+
+def _first_live_day(user_id):
+    """
+    남아 있는 실행 로그로 다시 계산할 첫 날
+    - 아카이브로 일부만 지워진 날(아카이브 구간과 겹치는 날)은 기존 일별 값을 유지하고 다음 날부터 계산
+    """
+    logs = PromptLog.objects.filter(user_id=user_id).order_by("created_at")
+    first_run = logs.values_list("created_at", flat=True).first()
+    if first_run is None:
+        return None
+    day = timezone.localdate(first_run)
+    day_start = timezone.make_aware(datetime.combine(day, time.min))
+    if PromptLogArchive.objects.filter(user_id=user_id, row_count__gt=0, end_at__gte=day_start).exists():
+        day += timedelta(days=1)
+    return day
+
+
+def rebuild_user_stats(user_id, chunk_size=RECONCILE_CHUNK_SIZE):
+    """
+    유저의 실행 통계를 실행 로그로 다시 계산하고 (일별 행 수, 실행 로그 수) 반환
+    - 아카이브된 기간의 일별 값은 그대로 두고, 남아 있는 로그의 기간만 다시 셈
+    - 누적 실행 수는 일별 값의 합, 마지막 실행 시각은 남아 있는 로그 기준 (로그가 없으면 기존 값 유지)
+    - 유저의 프롬프트 행을 잠가 그 사이 저장되는 실행(같은 행을 UPDATE)이 계산 뒤에 반영되도록 함
+    """
+    with transaction.atomic():
+        list(Prompt.objects.select_for_update().filter(user_id=user_id).values_list("pk", flat=True))
+
+        start_day = _first_live_day(user_id)
+        buckets, last_run, log_count = Counter(), {}, 0
+        if start_day is not None:
+            start = timezone.make_aware(datetime.combine(start_day, time.min))
+            logs = PromptLog.objects.filter(user_id=user_id, created_at__gte=start).values_list(
+                "prompt_id", "created_at"
+            )
+            for prompt_id, created_at in logs.iterator(chunk_size=chunk_size):
+                buckets[(prompt_id, timezone.localdate(created_at))] += 1
+                last_run[prompt_id] = max(last_run.get(prompt_id, created_at), created_at)
+                log_count += 1
+
+            PromptRunDay.objects.filter(user_id=user_id, day__gte=start_day).delete()
+            PromptRunDay.objects.bulk_create(
+                (
+                    PromptRunDay(prompt_id=prompt_id, user_id=user_id, day=day, run_count=runs)
+                    for (prompt_id, day), runs in buckets.items()
+                ),
+                batch_size=chunk_size,
+            )
+
+        totals = (
+            PromptRunDay.objects.filter(prompt_id=OuterRef("pk")).values("prompt_id").annotate(total=Sum("run_count"))
+        )
+        Prompt.objects.filter(user_id=user_id).update(run_count=Coalesce(Subquery(totals.values("total")), 0))
+        prompts = [Prompt(pk=prompt_id, last_run_at=last_run_at) for prompt_id, last_run_at in last_run.items()]
+        Prompt.objects.bulk_update(prompts, ["last_run_at"], batch_size=chunk_size)
+
+        user_totals = Prompt.objects.filter(user_id=user_id).aggregate(
+            run_count=Coalesce(Sum("run_count"), 0), last_run_at=Max("last_run_at")
+        )
+        UserRunStats.objects.update_or_create(user_id=user_id, defaults=user_totals)
+
+    bump_prompt_list_versions([user_id])
+    return len(buckets), log_count
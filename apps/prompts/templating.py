@@ -0,0 +1,149 @@
+"""
+프롬프트 내용 템플릿 ({{변수}} 치환)
+
+- 내용을 한 번 파싱해 (문자열 조각, 변수 자리) 목록으로 컴파일하고, 렌더링은 자리에 값을 넣어 join만 수행
+- 컴파일 결과는 프로세스별 LRU(settings.PROMPT_TEMPLATE_CACHE_SIZE)에 (프롬프트 id, 내용 해시)로 보관,
+  프롬프트가 수정 / 삭제되면 invalidate_template()으로 해당 프롬프트 항목을 제거
+- 템플릿에 없는 변수를 넘기거나 템플릿의 변수를 빠뜨리면 TemplateVariableError
+- 변수 이름은 영문자 / 숫자 / 밑줄이며, 형식에 맞지 않는 {{ ... }}는 그대로 남음
+- {{{{ 는 글자 그대로의 {{ 로 바뀜 (예: {{{{ name }} → {{ name }})
+- 치환은 Prompt.is_template인 프롬프트만, 아니면 내용을 그대로 씀 (템플릿 도입 전 프롬프트의 {{ }}는 글자 그대로)
+"""
+
+import json
+import re
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+from apps.common.metrics import metrics
+
+VARIABLE_PATTERN = re.compile(r"\{\{\s*([A-Za-z_][A-Za-z0-9_]*)\s*\}\}")
+ESCAPE = "{{{{"
+# 이스케이프를 변수보다 먼저 보므로 {{{{ name }} 안의 {{ name }}은 변수로 읽지 않음
+TOKEN_PATTERN = re.compile(re.escape(ESCAPE) + "|" + VARIABLE_PATTERN.pattern)
+VALUE_TYPES = (str, int, float, bool)
+
+
+class TemplateVariableError(ValueError):
+    """변수 누락 / 알 수 없는 변수 / 잘못된 값"""
+
+
+class CompiledTemplate:
+    __slots__ = ("segments", "slots", "variables")
+
+    def __init__(self, segments, slots):
+        self.segments = segments  # 문자열 조각 (변수 자리는 빈 문자열)
+        self.slots = slots  # ((segments 인덱스, 변수 이름), ...)
+        self.variables = frozenset(name for _, name in slots)
+
+    def render(self, values):
+        if not self.slots:
+            return self.segments[0] if self.segments else ""
+        parts = list(self.segments)
+        for index, name in self.slots:
+            parts[index] = values[name]
+        return "".join(parts)
+
+
+def compile_template(text):
+    segments, slots, literal, position = [], [], [], 0
+    for match in TOKEN_PATTERN.finditer(text):
+        literal.append(text[position : match.start()])
+        position = match.end()
+        if match.group(1) is None:
+            literal.append("{{")
+            continue
+        if any(literal):
+            segments.append("".join(literal))
+        literal = []
+        slots.append((len(segments), match.group(1)))
+        segments.append("")
+    literal.append(text[position:])
+    if any(literal) or not segments:
+        segments.append("".join(literal))
+    return CompiledTemplate(tuple(segments), tuple(slots))
+
+
+class TemplateCache:
+    """
+    (프롬프트 id, 내용 해시) → CompiledTemplate LRU (스레드 안전)
+    - 해시는 str 내장 해시(암호화 해시보다 빠르며 인코딩이 필요 없음)를 쓰고, 적중 시 원문과 비교해 충돌을 걸러냄
+    """
+
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, prompt_id, content):
+        key = (prompt_id, hash(content))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+        if entry is not None and entry[0] == content:
+            metrics.incr("prompt_template_cache.hits")
+            return entry[1]
+
+        metrics.incr("prompt_template_cache.misses")
+        template = compile_template(content)
+        with self._lock:
+            self._entries[key] = (content, template)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+        return template
+
+    def invalidate(self, prompt_id):
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == prompt_id]:
+                del self._entries[key]
+
+
+@lru_cache(maxsize=None)
+def get_template_cache() -> TemplateCache:
+    return TemplateCache(settings.PROMPT_TEMPLATE_CACHE_SIZE)
+
+
+@receiver(setting_changed)
+def reset_template_cache(*, setting, **kwargs):
+    if setting == "PROMPT_TEMPLATE_CACHE_SIZE":
+        get_template_cache.cache_clear()
+
+
+def invalidate_template(prompt_id):
+    get_template_cache().invalidate(prompt_id)
+
+
+def render_prompt(prompt, variables=None):
+    """프롬프트 내용에 변수를 넣은 결과 (변수가 없는 내용이나 템플릿이 아닌 프롬프트면 그대로)"""
+    if variables is None:
+        variables = {}
+    if not isinstance(variables, dict):
+        raise TemplateVariableError("variables는 객체여야 합니다.")
+    if not prompt.is_template:
+        if variables:
+            raise TemplateVariableError("템플릿이 아닌 프롬프트에는 variables를 쓸 수 없습니다. (is_template)")
+        return prompt.content
+
+    template = get_template_cache().get(prompt.pk, prompt.content)
+    missing = sorted(template.variables - variables.keys())
+    extra = sorted(variables.keys() - template.variables)
+    if missing or extra:
+        details = [f"누락된 변수: {missing}" if missing else "", f"알 수 없는 변수: {extra}" if extra else ""]
+        raise TemplateVariableError(", ".join(detail for detail in details if detail))
+
+    values = {}
+    for name, value in variables.items():
+        if not isinstance(value, VALUE_TYPES):
+            raise TemplateVariableError(f"변수 {name}의 값은 문자열 또는 숫자여야 합니다.")
+        values[name] = value if isinstance(value, str) else json.dumps(value)
+    return template.render(values)
@@ -0,0 +1,100 @@
+import gzip
+import json
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.prompts.archive import archive_root, archive_user_logs, iter_archived_logs
+from apps.prompts.models import (
+    Prompt,
+    PromptLog,
+    PromptLogArchive,
+    PromptLogRetentionPolicy,
+)
+
+User = get_user_model()
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def archive_dir(settings, tmp_path):
+    settings.PROMPT_LOG_ARCHIVE = {**settings.PROMPT_LOG_ARCHIVE, "DIR": str(tmp_path), "RETENTION_DAYS": 30}
+    return tmp_path
+
+
+# days_ago 순서대로 로그 생성 (created_at은 auto_now_add라 생성 후 UPDATE)
+def create_logs(user, *days_ago):
+    prompt = Prompt.objects.create(user=user, title="Archive", content="content")
+    now = timezone.now()
+    for days in days_ago:
+        log = PromptLog.objects.create(prompt=prompt, user=user, input_text=f"{days}일 전", output_text="out")
+        PromptLog.objects.filter(pk=log.pk).update(created_at=now - timedelta(days=days))
+
+
+# 보관 기간이 지난 로그만 옮기고, 세그먼트를 넘기며 배치 단위로 삭제
+def test_archive_moves_old_logs_in_batches(user):
+    create_logs(user, 50, 40, 35, 10)
+
+    moved = archive_user_logs(user.id, timezone.now() - timedelta(days=30), batch_size=2, segment_max_rows=2)
+
+    assert moved == 3
+    assert list(PromptLog.objects.values_list("input_blob__text", flat=True)) == ["10일 전"]
+    segments = list(PromptLogArchive.objects.filter(user=user))
+    assert [s.row_count for s in segments] == [2, 1]
+    rows = [row for segment in segments for row in iter_archived_logs(segment)]
+    assert [row["input_text"] for row in rows] == ["50일 전", "40일 전", "35일 전"]
+
+
+# row_count 뒤에 이어 쓴 줄(삭제 전에 중단된 배치)은 읽지 않음
+def test_archived_rows_beyond_row_count_are_ignored(user):
+    create_logs(user, 50)
+    archive_user_logs(user.id, timezone.now() - timedelta(days=30))
+    segment = PromptLogArchive.objects.get()
+    with open(archive_root() / segment.path, "ab") as raw, gzip.GzipFile(fileobj=raw, mode="wb") as out:
+        out.write(b'{"input_text": "orphan", "created_at": "2000-01-01T00:00:00Z"}\n')
+
+    assert [row["input_text"] for row in iter_archived_logs(segment)] == ["50일 전"]
+
+
+# 유저별 보관 기간 정책이 전역 설정보다 우선
+def test_command_respects_per_user_policy(user):
+    other = User.objects.create_user(email="keep@example.com", username="keep", password="pass1234")
+    PromptLogRetentionPolicy.objects.create(user=other, retention_days=60)
+    create_logs(user, 45)
+    create_logs(other, 45)
+
+    call_command("archive_prompt_logs", stdout=StringIO())
+
+    assert not PromptLog.objects.filter(user=user).exists()
+    assert PromptLog.objects.filter(user=other).count() == 1
+
+
+# 아카이브 목록 / 범위 조회 API, 세그먼트 삭제 시 파일도 삭제
+def test_archive_api_streams_requested_range(
+    api_client_logged_in, user, archive_dir, django_capture_on_commit_callbacks
+):
+    create_logs(user, 50, 40, 35)
+    call_command("archive_prompt_logs", stdout=StringIO())
+
+    res = api_client_logged_in.get(reverse("prompt-log-archives"))
+    assert res.status_code == 200
+    assert res.data["results"][0]["row_count"] == 3
+
+    start = (timezone.now() - timedelta(days=45)).isoformat()
+    end = (timezone.now() - timedelta(days=38)).isoformat()
+    res = api_client_logged_in.get(reverse("prompt-log-archive-rows"), {"start": start, "end": end})
+    assert res.status_code == 200
+    rows = [json.loads(line) for line in b"".join(res.streaming_content).decode().splitlines()]
+    assert [row["input_text"] for row in rows] == ["40일 전"]
+
+    assert api_client_logged_in.get(reverse("prompt-log-archive-rows"), {"start": "어제"}).status_code == 400
+
+    segment = PromptLogArchive.objects.get()
+    with django_capture_on_commit_callbacks(execute=True):
+        segment.delete()
+    assert not (archive_dir / segment.path).exists()
@@ -0,0 +1,189 @@
+import asyncio
+import gc
+import json
+import threading
+import warnings
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.test import override_settings
+from django.urls import reverse
+
+from apps.prompts.backends import BaseExecutionBackend, HTTPExecutionBackend, RunRequest
+from apps.prompts.models import Prompt, PromptLog
+from apps.prompts.views import RunPromptView
+
+pytestmark = pytest.mark.django_db
+
+
+# OpenAI 호환 응답을 흉내 내는 로컬 스텁 서버
+class StubLLMHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        self.server.received.append((self.path, self.headers.get("Authorization"), body))
+
+        if self.server.fail:
+            self.send_response(500)
+            self.end_headers()
+            return
+
+        if body.get("stream"):
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.end_headers()
+            for word in ["echo:", " ", body["messages"][-1]["content"]]:
+                chunk = {"choices": [{"delta": {"content": word}}]}
+                self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode())
+                self.wfile.flush()
+            self.wfile.write(b"data: [DONE]\n\n")
+            return
+
+        payload = json.dumps(
+            {"choices": [{"message": {"role": "assistant", "content": f"echo: {body['messages'][-1]['content']}"}}]}
+        ).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def stub_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubLLMHandler)
+    server.received = []
+    server.fail = False
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def http_backend_settings(stub_server):
+    host, port = stub_server.server_address
+    execution = {
+        "BACKEND": "apps.prompts.backends.HTTPExecutionBackend",
+        "OPTIONS": {"base_url": f"http://{host}:{port}/v1", "api_key": "test-key", "model": "stub-model"},
+    }
+    with override_settings(PROMPT_EXECUTION=execution):
+        yield
+
+
+@pytest.fixture
+def prompt(user):
+    return Prompt.objects.create(user=user, title="Echo", content="You echo the input.")
+
+
+# 실행 뷰는 async 뷰로 등록되어 ASGI에서 워커를 점유하지 않음
+def test_run_prompt_view_is_async():
+    assert RunPromptView.view_is_async
+
+
+# HTTP 백엔드로 실행하면 스텁 서버 응답이 반환되고 로그에 저장됨
+def test_run_prompt_with_http_backend(api_client_logged_in, prompt, user, stub_server, http_backend_settings):
+    res = api_client_logged_in.post(reverse("prompt-run", args=[prompt.id]), {"input_text": "world"})
+
+    assert res.status_code == 200
+    assert res.data["output"] == "echo: world"
+    path, authorization, body = stub_server.received[0]
+    assert path == "/v1/chat/completions"
+    assert authorization == "Bearer test-key"
+    assert body["model"] == "stub-model"
+    assert body["messages"][0] == {"role": "system", "content": "You echo the input."}
+    assert PromptLog.objects.get(user=user).output_text == "echo: world"
+
+
+# 백엔드 호출 실패 시 502 반환, 로그는 남기지 않음
+def test_run_prompt_backend_failure(api_client_logged_in, prompt, user, stub_server, http_backend_settings):
+    stub_server.fail = True
+    res = api_client_logged_in.post(reverse("prompt-run", args=[prompt.id]), {"input_text": "world"})
+
+    assert res.status_code == 502
+    assert not PromptLog.objects.filter(user=user).exists()
+
+
+# HTTP 백엔드 스트리밍은 delta 조각을 순서대로 반환
+def test_http_backend_stream(stub_server):
+    host, port = stub_server.server_address
+    backend = HTTPExecutionBackend(base_url=f"http://{host}:{port}/v1")
+
+    async def collect():
+        tokens = [token async for token in backend.stream(RunRequest(title="t", content="c", input_text="world"))]
+        await backend.aclose()
+        return tokens
+
+    assert asyncio.run(collect()) == ["echo:", " ", "world"]
+
+
+# 동시 실행 수를 기록하는 테스트용 백엔드
+class ConcurrencyProbeBackend(BaseExecutionBackend):
+    in_flight = peak = 0
+
+    async def run(self, request):
+        cls = type(self)
+        cls.in_flight += 1
+        cls.peak = max(cls.peak, cls.in_flight)
+        await asyncio.sleep(0.01)
+        cls.in_flight -= 1
+        return request.input_text.upper()
+
+
+# 배치 실행은 PROMPT_BATCH_CONCURRENCY 이하로만 동시에 백엔드를 호출
+@override_settings(
+    PROMPT_BATCH_CONCURRENCY=4,
+    PROMPT_EXECUTION={"BACKEND": "apps.prompts.tests.test_backends.ConcurrencyProbeBackend"},
+)
+def test_batch_run_bounded_concurrency(api_client_logged_in, prompt):
+    ConcurrencyProbeBackend.peak = 0
+    inputs = [f"item {i}" for i in range(40)]
+    res = api_client_logged_in.post(reverse("prompt-run-batch", args=[prompt.id]), {"inputs": inputs}, format="json")
+
+    assert res.status_code == 200
+    assert [r["output"] for r in res.data["results"]] == [text.upper() for text in inputs]
+    assert 1 < ConcurrencyProbeBackend.peak <= 4
+
+
+# 같은 이벤트 루프의 동시 실행은 하나의 풀링된 클라이언트를 공유
+def test_http_backend_shares_client_across_concurrent_runs(stub_server):
+    host, port = stub_server.server_address
+    backend = HTTPExecutionBackend(base_url=f"http://{host}:{port}/v1", max_connections=10)
+
+    async def run_many():
+        results = await asyncio.gather(
+            *(backend.run(RunRequest(title="t", content="c", input_text=str(i))) for i in range(50))
+        )
+        clients = {client for client, _ in backend._clients.values()}
+        await backend.aclose()
+        return results, clients
+
+    results, clients = asyncio.run(run_many())
+
+    assert results == [f"echo: {i}" for i in range(50)]
+    assert len(clients) == 1
+
+
+# WSGI처럼 async_to_sync가 호출마다 새 루프를 만들어도, 루프가 끝날 때 그 루프의 클라이언트가 닫힘
+def test_http_backend_closes_client_with_its_loop(stub_server):
+    host, port = stub_server.server_address
+    backend = HTTPExecutionBackend(base_url=f"http://{host}:{port}/v1")
+    clients = []
+
+    async def run_once(input_text):
+        output = await backend.run(RunRequest(title="t", content="c", input_text=input_text))
+        clients.append(await backend.get_client())
+        return output
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("error", ResourceWarning)
+        outputs = [async_to_sync(run_once)(str(i)) for i in range(3)]
+        gc.collect()
+
+    assert outputs == ["echo: 0", "echo: 1", "echo: 2"]
+    assert len(set(map(id, clients))) == 3
+    assert all(client.is_closed for client in clients)
@@ -0,0 +1,75 @@
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.utils import timezone
+
+from apps.prompts.models import ContentBlob, Prompt, PromptLog, content_hash
+from apps.prompts.serializers import PromptLogSerializer
+
+User = get_user_model()
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def prompt():
+    user = User.objects.create_user(email="blob@example.com", username="blob", password="pass1234")
+    return Prompt.objects.create(user=user, title="Blob", content="content")
+
+
+def make_log(prompt, input_text, output_text="same answer"):
+    return PromptLog.objects.create(prompt=prompt, user=prompt.user, input_text=input_text, output_text=output_text)
+
+
+# 같은 입력/출력은 본문 한 행을 공유하고, bulk_create도 같은 본문을 한 번만 저장
+def test_identical_texts_share_one_blob(prompt):
+    make_log(prompt, "repeated input")
+    make_log(prompt, "repeated input")
+    PromptLog.objects.bulk_create(
+        [PromptLog(prompt=prompt, user=prompt.user, input_text="repeated input", output_text=None) for _ in range(5)]
+    )
+
+    assert PromptLog.objects.count() == 7
+    assert set(ContentBlob.objects.values_list("hash", flat=True)) == {
+        content_hash("repeated input"),
+        content_hash("same answer"),
+    }
+
+
+# 직렬화 결과는 본문을 로그에 직접 저장하던 때와 같음
+def test_serializer_output_is_unchanged(prompt):
+    log = make_log(prompt, "hello")
+    loaded = PromptLog.objects.select_related("input_blob", "output_blob").get(pk=log.pk)
+
+    data = PromptLogSerializer(loaded).data
+    assert (data["input_text"], data["output_text"]) == ("hello", "same answer")
+    assert PromptLogSerializer(make_log(prompt, "no output", None)).data["output_text"] is None
+
+
+# 참조가 없어진 본문만 삭제하고, 유예 기간 안에 저장된 본문은 남김
+def test_prune_removes_only_unreferenced_blobs(prompt):
+    kept = make_log(prompt, "kept input")
+    make_log(prompt, "dropped input").delete()
+
+    call_command("prune_content_blobs", grace_minutes=0, stdout=StringIO())
+
+    assert set(ContentBlob.objects.values_list("hash", flat=True)) == {kept.input_blob_id, kept.output_blob_id}
+
+    kept.delete()
+    call_command("prune_content_blobs", stdout=StringIO())
+    assert ContentBlob.objects.count() == 2
+
+
+# 오래된 본문을 재사용하면 마지막 참조 시각이 갱신되어, 유예 기간 동안 (로그 커밋 전이라도) 삭제되지 않음
+def test_prune_grace_period_follows_reuse(prompt):
+    make_log(prompt, "reused input").delete()
+    ContentBlob.objects.update(last_referenced_at=timezone.now() - timedelta(days=1))
+
+    PromptLog.objects.bulk_create([PromptLog(prompt=prompt, user=prompt.user, input_text="reused input")])
+    PromptLog.objects.all().delete()  # 로그가 아직 커밋되지 않아 정리 명령에서 보이지 않는 상황
+    call_command("prune_content_blobs", stdout=StringIO())
+
+    assert ContentBlob.objects.filter(hash=content_hash("reused input")).exists()
+    assert not ContentBlob.objects.filter(hash=content_hash("same answer")).exists()
@@ -0,0 +1,73 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection
+
+from apps.common.fields import MARKER, CompressedText
+from apps.prompts.models import Prompt, PromptLog, PromptVersion
+
+User = get_user_model()
+pytestmark = pytest.mark.django_db
+
+LONG_TEXT = "The model answered with a long and repetitive explanation. " * 100
+
+
+@pytest.fixture(autouse=True)
+def compression_threshold(settings):
+    settings.TEXT_COMPRESSION_MIN_BYTES = 1024
+
+
+@pytest.fixture
+def prompt():
+    user = User.objects.create_user(email="zip@example.com", username="zip", password="pass1234")
+    return Prompt.objects.create(user=user, title="Zip", content="short content")
+
+
+def raw_value(table, column, key, pk):
+    with connection.cursor() as cursor:
+        cursor.execute(f"SELECT {column} FROM {table} WHERE {key} = %s", [pk])
+        return cursor.fetchone()[0]
+
+
+def add_snapshot(prompt, number, text):
+    return PromptVersion.objects.create(prompt=prompt, number=number, title=prompt.title, snapshot=text)
+
+
+# 기준 이상인 버전 스냅샷만 압축 저장, 짧은 값은 그대로
+def test_long_snapshot_is_stored_compressed(prompt):
+    long_version, short_version = add_snapshot(prompt, 2, LONG_TEXT), add_snapshot(prompt, 3, "짧은 내용")
+
+    stored = raw_value("prompts_promptversion", "snapshot", "id", long_version.pk)
+    assert stored.startswith(MARKER)
+    assert len(stored) < len(LONG_TEXT) / 5
+    assert raw_value("prompts_promptversion", "snapshot", "id", short_version.pk) == "짧은 내용"
+
+
+# 전문 검색 대상(프롬프트 내용, 실행 로그 본문)은 길어도 원문 그대로 저장
+def test_searchable_text_is_never_compressed(prompt):
+    prompt.content = LONG_TEXT
+    prompt.save()
+    log = PromptLog.objects.create(prompt=prompt, user=prompt.user, input_text=LONG_TEXT, output_text=LONG_TEXT)
+
+    assert raw_value("prompts_prompt", "content", "id", prompt.pk) == LONG_TEXT
+    assert raw_value("prompts_contentblob", "text", "hash", log.output_blob_id) == LONG_TEXT
+
+
+# 조회 시에는 압축된 채로 두었다가 속성에 접근할 때 한 번만 해제
+def test_decompression_is_lazy(prompt):
+    version = add_snapshot(prompt, 2, LONG_TEXT)
+    loaded = PromptVersion.objects.get(pk=version.pk)
+    assert isinstance(loaded.__dict__["snapshot"], CompressedText)
+
+    assert loaded.snapshot == LONG_TEXT
+    assert loaded.__dict__["snapshot"] == LONG_TEXT
+
+
+# 압축 마커로 시작하는 입력도 원래 값 그대로 돌아옴, values()는 str()로 풀림
+def test_marker_prefixed_text_round_trips(prompt):
+    tricky = MARKER + "not really compressed"
+    add_snapshot(prompt, 2, tricky)
+    add_snapshot(prompt, 3, LONG_TEXT)
+
+    assert PromptVersion.objects.get(prompt=prompt, number=2).snapshot == tricky
+    values = dict(PromptVersion.objects.filter(prompt=prompt, number__gte=2).values_list("number", "snapshot"))
+    assert (str(values[2]), str(values[3])) == (tricky, LONG_TEXT)
@@ -0,0 +1,79 @@
+import pytest
+from django.urls import reverse
+
+from apps.prompts.models import Prompt, Tag
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def prompt(user):
+    return Prompt.objects.create(user=user, title="Cached", content="content")
+
+
+# 목록: 변경이 없으면 목록 버전만 조회하고 304, 생성 / 태그 변경 / 삭제 후에는 새 ETag
+def test_list_not_modified_until_prompts_change(api_client_logged_in, user, prompt, django_assert_num_queries):
+    url = reverse("prompt-list-create")
+    first = api_client_logged_in.get(url)
+    etag = first["ETag"]
+    assert etag.startswith('W/"') and "Last-Modified" in first
+
+    with django_assert_num_queries(1):  # 목록 버전만 (인증 유저는 첫 요청에서 캐시됨)
+        res = api_client_logged_in.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert res.status_code == 304 and res["ETag"] == etag and not res.content
+
+    assert api_client_logged_in.get(url + "?tags=x", HTTP_IF_NONE_MATCH=etag).status_code == 200
+
+    seen = {etag}
+    for change in (
+        lambda: Prompt.objects.create(user=user, title="New", content="c"),
+        lambda: prompt.tags.add(Tag.objects.create(name="fresh")),
+        lambda: prompt.delete(),
+    ):
+        change()
+        res = api_client_logged_in.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert res.status_code == 200 and res["ETag"] not in seen
+        etag = res["ETag"]
+        seen.add(etag)
+
+
+# 상세: If-None-Match / If-Modified-Since가 현재 값이면 본문 없이 304
+def test_detail_conditional_get(api_client_logged_in, prompt):
+    url = reverse("prompt-detail", args=[prompt.id])
+    first = api_client_logged_in.get(url)
+    assert first.status_code == 200
+
+    assert api_client_logged_in.get(url, HTTP_IF_NONE_MATCH=first["ETag"]).status_code == 304
+    assert api_client_logged_in.get(url, HTTP_IF_MODIFIED_SINCE=first["Last-Modified"]).status_code == 304
+
+    api_client_logged_in.patch(url, {"title": "Changed"}, format="json")
+    res = api_client_logged_in.get(url, HTTP_IF_NONE_MATCH=first["ETag"])
+    assert res.status_code == 200 and res.data["title"] == "Changed"
+
+
+# If-Match가 현재 ETag와 다르면 수정 / 삭제하지 않고 412
+def test_if_match_prevents_lost_updates(api_client_logged_in, prompt):
+    url = reverse("prompt-detail", args=[prompt.id])
+    etag = api_client_logged_in.get(url)["ETag"]
+
+    res = api_client_logged_in.patch(url, {"title": "Mine"}, format="json", HTTP_IF_MATCH=etag)
+    assert res.status_code == 200 and res["ETag"] != etag
+
+    res = api_client_logged_in.patch(url, {"title": "Stale"}, format="json", HTTP_IF_MATCH=etag)
+    assert res.status_code == 412
+    assert api_client_logged_in.delete(url, HTTP_IF_MATCH=etag).status_code == 412
+    assert Prompt.objects.get(pk=prompt.pk).title == "Mine"
+
+
+# 태그만 바꾼 수정 응답의 ETag도 저장된 값 기준이라 바로 If-Match / If-None-Match에 쓸 수 있음
+def test_tag_update_returns_current_etag(api_client_logged_in, prompt):
+    url = reverse("prompt-detail", args=[prompt.id])
+    etag = api_client_logged_in.get(url)["ETag"]
+    tag = Tag.objects.create(name="tagged")
+
+    res = api_client_logged_in.patch(url, {"tag_ids": [tag.id]}, format="json", HTTP_IF_MATCH=etag)
+    assert res.status_code == 200 and res["ETag"] != etag
+    assert api_client_logged_in.get(url, HTTP_IF_NONE_MATCH=res["ETag"]).status_code == 304
+
+    res = api_client_logged_in.patch(url, {"title": "Next"}, format="json", HTTP_IF_MATCH=res["ETag"])
+    assert res.status_code == 200
@@ -0,0 +1,103 @@
+import pytest
+from asgiref.sync import async_to_sync
+from django.test import override_settings
+from django.urls import reverse
+
+from apps.common.metrics import metrics
+from apps.prompts.history import PromptLogBuffer, get_log_buffer
+from apps.prompts.models import Prompt, PromptLog
+
+pytestmark = pytest.mark.django_db
+
+# 테스트에서는 백그라운드 스레드가 flush하지 않도록 임계값을 크게 둠
+BUFFERED = {
+    "PROMPT_LOG_WRITE_MODE": "buffered",
+    "PROMPT_LOG_BUFFER": {"MAX_SIZE": 100, "FLUSH_SIZE": 10_000, "FLUSH_INTERVAL": 3600},
+}
+
+
+@pytest.fixture
+def prompt(user):
+    return Prompt.objects.create(user=user, title="Buffered", content="content")
+
+
+@pytest.fixture(autouse=True)
+def reset_metrics():
+    metrics.reset()
+
+
+# buffered 모드: 실행 응답은 바로 반환되고 로그는 flush 시점에 한꺼번에 저장
+@override_settings(**BUFFERED)
+def test_buffered_run_logs_flush_later(api_client_logged_in, prompt, user):
+    for text in ("a", "b", "c"):
+        res = api_client_logged_in.post(reverse("prompt-run", args=[prompt.id]), {"input_text": text})
+        assert res.status_code == 200
+
+    assert not PromptLog.objects.filter(user=user).exists()
+    assert get_log_buffer().flush() == 3
+    assert PromptLog.objects.filter(user=user).count() == 3
+    assert metrics.snapshot()["counters"]["prompt_log_buffer.flushed"] == 3
+
+
+# buffered 모드 스트리밍: 로그 id가 아직 없으므로 done 이벤트에 log_id를 넣지 않음
+@override_settings(**BUFFERED)
+def test_buffered_stream_done_event_omits_log_id(api_client_logged_in, prompt, user):
+    res = api_client_logged_in.post(reverse("prompt-run-stream", args=[prompt.id]), {"input_text": "hi"})
+
+    async def collect():
+        return b"".join([chunk async for chunk in res.streaming_content])
+
+    body = async_to_sync(collect)().decode()
+    assert body.endswith("event: done\ndata: {}\n\n")
+    assert get_log_buffer().flush() == 1
+    assert PromptLog.objects.get(user=user).is_partial is False
+
+
+# 버퍼가 가득 차면 초과분은 드롭되고 지표에 기록
+def test_buffer_drops_when_full(prompt, user):
+    buffer = PromptLogBuffer(max_size=2, flush_size=10_000, flush_interval=3600)
+    buffer.add([PromptLog(prompt=prompt, user=user, input_text=str(i), output_text="o") for i in range(5)])
+
+    assert len(buffer) == 2
+    assert metrics.snapshot()["counters"]["prompt_log_buffer.dropped"] == 3
+    buffer.close()
+    assert PromptLog.objects.filter(user=user).count() == 2
+
+
+# flush 실패는 예외를 삼키고 실패/드롭 지표로 보고
+def test_buffer_reports_failed_flush(prompt, user, monkeypatch):
+    def broken_bulk_create(*args, **kwargs):
+        raise RuntimeError("db down")
+
+    buffer = PromptLogBuffer(max_size=10, flush_size=10_000, flush_interval=3600)
+    buffer.add([PromptLog(prompt=prompt, user=user, input_text="x", output_text="o")])
+    monkeypatch.setattr(PromptLog.objects, "bulk_create", broken_bulk_create)
+
+    assert buffer.flush() == 0
+    counters = metrics.snapshot()["counters"]
+    assert counters["prompt_log_buffer.failed_flushes"] == 1
+    assert counters["prompt_log_buffer.dropped"] == 1
+
+
+# sync 모드(기본값)는 저장 실패 시 기존처럼 500 응답
+def test_sync_mode_keeps_500_on_save_failure(api_client_logged_in, prompt, monkeypatch):
+    def broken_save(self, *args, **kwargs):
+        raise RuntimeError("db down")
+
+    monkeypatch.setattr(PromptLog, "save", broken_save)
+    res = api_client_logged_in.post(reverse("prompt-run", args=[prompt.id]), {"input_text": "hi"})
+
+    assert res.status_code == 500
+    assert res.data["message"] == "프롬프트 실행 이력을 저장하지 못했습니다."
+
+
+# 관리자는 운영 지표를 조회할 수 있고 일반 유저는 접근 불가
+def test_metrics_endpoint_requires_admin(api_client_logged_in, user):
+    assert api_client_logged_in.get(reverse("metrics")).status_code == 403
+
+    user.is_admin = True
+    user.save()
+    metrics.incr("prompt_log_buffer.dropped", 2)
+    res = api_client_logged_in.get(reverse("metrics"))
+    assert res.status_code == 200
+    assert res.data["counters"]["prompt_log_buffer.dropped"] == 2
@@ -0,0 +1,73 @@
+import json
+from decimal import Decimal
+
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from apps.common.fields import CompressedText, compress_text
+from apps.common.renderers import FastJSONParser, FastJSONRenderer
+from apps.prompts.models import Prompt, Tag
+from apps.prompts.serializers import PromptSerializer
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def prompts(user):
+    tags = [Tag.objects.create(name=f"t{i}") for i in range(3)]
+    created = [Prompt.objects.create(user=user, title=f"P{i}", content=f"content {i} " * 200) for i in range(4)]
+    created[0].tags.set(tags)
+    created[1].tags.set(tags[:1])
+    return created
+
+
+# 기본 목록 응답은 PromptSerializer 결과와 같음
+def test_list_matches_model_serializer(api_client_logged_in, prompts):
+    res = api_client_logged_in.get(reverse("prompt-list-create"))
+
+    assert res.status_code == 200
+    expected = PromptSerializer(Prompt.objects.order_by("-created_at", "-id"), many=True).data
+    assert json.loads(res.content)["results"] == json.loads(JSONRenderer().render(expected))
+
+
+# ?fields= 는 지정한 필드만, ?view=summary 는 content 제외, 모르는 필드는 400
+def test_sparse_fieldsets_and_summary(api_client_logged_in, prompts):
+    url = reverse("prompt-list-create")
+
+    res = api_client_logged_in.get(url, {"fields": "id,tags"})
+    assert all(set(item) == {"id", "tags"} for item in res.data["results"])
+    assert sorted(t["name"] for t in res.data["results"][-1]["tags"]) == ["t0", "t1", "t2"]
+
+    res = api_client_logged_in.get(url, {"view": "summary", "page_size": 2})
+    assert len(res.data["results"]) == 2 and res.data["next"]
+    assert all("content" not in item and "title" in item for item in res.data["results"])
+
+    res = api_client_logged_in.get(url, {"fields": "id,password"})
+    assert res.status_code == 400
+
+
+# orjson 렌더러 출력은 DRF JSONRenderer와 같고, 파서는 같은 값을 돌려줌
+def test_fast_renderer_matches_drf_renderer(settings):
+    settings.TEXT_COMPRESSION_MIN_BYTES = 1
+    data = {
+        "text": "한글 \u2028 line",
+        "at": timezone.now(),
+        "amount": Decimal("1.50"),
+        "compressed": CompressedText(compress_text("압축된 본문")),
+        "nested": [{"n": 1, "f": 0.5, "none": None, "flag": True}],
+    }
+
+    rendered = FastJSONRenderer().render(data)
+    assert json.loads(rendered) == json.loads(JSONRenderer().render(data))
+    assert b"\\u2028" in rendered
+    assert FastJSONParser().parse(_Stream(rendered)) == json.loads(rendered)
+
+
+class _Stream:
+    def __init__(self, content):
+        self.content = content
+
+    def read(self):
+        return self.content
@@ -1,30 +1,24 @@
+import asyncio
+import json
+
 import pytest
+from asgiref.sync import async_to_sync
 from django.contrib.auth import get_user_model
+from django.core.signals import request_finished, request_started
+from django.db import close_old_connections
+from django.test import override_settings
 from django.urls import reverse
-from rest_framework.test import APIClient
 
-from apps.prompts.models import Prompt, PromptLog
+from apps.common.asgi import DisconnectAwareASGIHandler
+from apps.prompts.backends import BaseExecutionBackend, RunRequest
+from apps.prompts.models import Prompt, PromptLog, Tag, UserTagCount
+from apps.prompts.signals import apply_tag_count_deltas
+from apps.prompts.views import RunPromptStreamView
 
 User = get_user_model()
 pytestmark = pytest.mark.django_db  # 모든 테스트에서 DB 사용 허용
 
 
-# 테스트용 사용자 생성
-@pytest.fixture
-def user():
-    return User.objects.create_user(email="tester@example.com", username="tester", password="pass1234")
-
-
-# 로그인된 APIClient 제공 (access_token을 쿠키로 설정)
-@pytest.fixture
-def api_client_logged_in(user):
-    client = APIClient()
-    login_response = client.post(reverse("login"), data={"email": user.email, "password": "pass1234"})
-    assert login_response.status_code == 200
-    client.cookies["access_token"] = login_response.cookies["access_token"].value
-    return client
-
-
 # 테스트용 프롬프트 생성
 @pytest.fixture
 def prompt(user):
@@ -42,6 +36,19 @@ def test_create_prompt(api_client_logged_in):
     assert res.data["title"] == "My Prompt"
 
 
+# tag_ids는 JSON 요청에서 필수 (빈 목록은 허용), HTML 폼에서 값이 없으면 태그 없이 생성
+def test_create_prompt_tag_ids_required(api_client_logged_in):
+    url = reverse("prompt-list-create")
+    data = {"title": "My Prompt", "content": "content"}
+    res = api_client_logged_in.post(url, data, format="json")
+    assert res.status_code == 400 and "tag_ids" in res.data
+
+    res = api_client_logged_in.post(url, {**data, "tag_ids": []}, format="json")
+    assert res.status_code == 201 and res.data["tags"] == []
+    res = api_client_logged_in.post(url, data)
+    assert res.status_code == 201 and res.data["tags"] == []
+
+
 # 프롬프트 목록 조회 테스트
 def test_list_prompts(api_client_logged_in, prompt):
     url = reverse("prompt-list-create")
@@ -49,7 +56,7 @@ def test_list_prompts(api_client_logged_in, prompt):
 
     # 응답에 이전에 생성한 프롬프트가 포함되어 있는지 확인
     assert res.status_code == 200
-    assert any(p["title"] == "Test Prompt" for p in res.data)
+    assert any(p["title"] == "Test Prompt" for p in res.data["results"])
 
 
 # 프롬프트 실행 테스트 (MOCK 응답 확인)
@@ -73,4 +80,310 @@ def test_prompt_logs(api_client_logged_in, prompt, user):
 
     # 로그 리스트에 예상 출력이 포함되어 있는지 확인
     assert res.status_code == 200
-    assert any("Hello!" in log["output_text"] for log in res.data)
+    assert any("Hello!" in log["output_text"] for log in res.data["results"])
+
+
+# 실행 로그 커서 페이지네이션 테스트 (최신순, 중복/누락 없이 끝까지 순회)
+def test_prompt_logs_cursor_pagination(api_client_logged_in, prompt, user):
+    PromptLog.objects.bulk_create(
+        [PromptLog(prompt=prompt, user=user, input_text=f"in {i}", output_text=f"out {i}") for i in range(7)]
+    )
+
+    url = reverse("prompt-logs")
+    res = api_client_logged_in.get(url, {"page_size": 3})
+    assert res.status_code == 200
+    assert "count" not in res.data
+    assert len(res.data["results"]) == 3
+
+    seen = [log["id"] for log in res.data["results"]]
+    while res.data["next"]:
+        res = api_client_logged_in.get(res.data["next"])
+        seen += [log["id"] for log in res.data["results"]]
+
+    assert seen == sorted(PromptLog.objects.filter(user=user).values_list("id", flat=True), reverse=True)
+
+
+# 태그가 달린 프롬프트 다수 생성 (쿼리 수 검증용)
+def _create_tagged_prompts(user, prompt_count, tag_count):
+    tags = Tag.objects.bulk_create([Tag(name=f"tag-{user.pk}-{i}") for i in range(tag_count)])
+    prompts = Prompt.objects.bulk_create(
+        [Prompt(user=user, title=f"Prompt {i}", content="content") for i in range(prompt_count)]
+    )
+    for p in prompts:
+        p.tags.set(tags)
+    return prompts, tags
+
+
+# 목록 조회는 프롬프트/태그 개수와 무관하게 고정된 쿼리 수로 동작 (인증 1 + 목록 버전 1 + 목록 1 + 태그 prefetch 1)
+@pytest.mark.parametrize("prompt_count, tag_count", [(1, 1), (20, 10)])
+def test_list_prompts_query_budget(api_client_logged_in, user, django_assert_num_queries, prompt_count, tag_count):
+    _create_tagged_prompts(user, prompt_count, tag_count)
+
+    with django_assert_num_queries(4):
+        res = api_client_logged_in.get(reverse("prompt-list-create"))
+
+    assert res.status_code == 200
+    assert len(res.data["results"]) == prompt_count
+    assert all(len(p["tags"]) == tag_count for p in res.data["results"])
+
+
+# 상세 조회도 태그 개수와 무관하게 고정된 쿼리 수로 동작
+@pytest.mark.parametrize("tag_count", [1, 10])
+def test_retrieve_prompt_query_budget(api_client_logged_in, user, django_assert_num_queries, tag_count):
+    prompts, _ = _create_tagged_prompts(user, 1, tag_count)
+
+    with django_assert_num_queries(3):
+        res = api_client_logged_in.get(reverse("prompt-detail", args=[prompts[0].id]))
+
+    assert res.status_code == 200
+    assert len(res.data["tags"]) == tag_count
+
+
+# tag_ids 검증은 전달된 id 개수와 무관하게 한 번의 쿼리로 처리
+@pytest.mark.parametrize("tag_count", [1, 10])
+def test_create_prompt_query_budget(api_client_logged_in, user, django_assert_num_queries, tag_count):
+    tags = Tag.objects.bulk_create([Tag(name=f"tag-{i}") for i in range(tag_count)])
+    data = {"title": "Tagged", "content": "content", "tag_ids": [t.id for t in tags]}
+
+    # m2m_changed 수신을 위한 기존 태그 조회 1회 + 태그 facet 집계(UserTagCount) 갱신 2회
+    # + 목록 버전 갱신 2회(저장 / 태그 연결) + 태그 연결 후 updated_at 갱신 1회 + 1번 버전 저장 1회 포함
+    with django_assert_num_queries(13):
+        res = api_client_logged_in.post(reverse("prompt-list-create"), data, format="json")
+
+    assert res.status_code == 201
+    assert sorted(t["id"] for t in res.data["tags"]) == sorted(t.id for t in tags)
+
+
+# 존재하지 않는 tag_id가 포함되면 400 반환
+def test_create_prompt_with_unknown_tag(api_client_logged_in):
+    tag = Tag.objects.create(name="known")
+    data = {"title": "Tagged", "content": "content", "tag_ids": [tag.id, tag.id + 999]}
+    res = api_client_logged_in.post(reverse("prompt-list-create"), data, format="json")
+
+    assert res.status_code == 400
+    assert "tag_ids" in res.data
+
+
+# async 스트리밍 응답 본문을 모두 읽음
+def _read_stream(response):
+    async def collect():
+        return b"".join([chunk async for chunk in response.streaming_content])
+
+    return async_to_sync(collect)()
+
+
+# SSE 응답을 (event, data) 목록으로 변환
+def _parse_sse(body):
+    events = []
+    for block in body.decode().strip().split("\n\n"):
+        event_line, data_line = block.split("\n")
+        events.append((event_line.removeprefix("event: "), json.loads(data_line.removeprefix("data: "))))
+    return events
+
+
+# 스트리밍 실행: token 이벤트를 이어 붙이면 전체 출력이 되고, 완료 시 로그가 한 번 저장됨
+def test_run_prompt_stream(api_client_logged_in, prompt, user):
+    res = api_client_logged_in.post(reverse("prompt-run-stream", args=[prompt.id]), {"input_text": "world"})
+
+    assert res.status_code == 200
+    assert res["Content-Type"] == "text/event-stream"
+    events = _parse_sse(_read_stream(res))
+    tokens = [data["text"] for event, data in events if event == "token"]
+    assert len(tokens) > 1
+    assert events[-1][0] == "done"
+
+    log = PromptLog.objects.get(user=user)
+    assert events[-1][1] == {"log_id": log.id}
+    assert log.output_text == "".join(tokens)
+    assert "[MOCK RESPONSE]" in log.output_text
+    assert log.is_partial is False
+
+
+# 스트리밍 도중 연결이 끊기면 받은 부분까지만 is_partial 로그로 저장
+def test_run_prompt_stream_disconnect_saves_partial_log(prompt, user):
+    async def receive_first_token_then_disconnect():
+        events = RunPromptStreamView().stream_events(prompt, user, RunRequest.from_prompt(prompt, "world"))
+        first = await events.__anext__()
+        await events.aclose()
+        return first
+
+    first = async_to_sync(receive_first_token_then_disconnect)()
+
+    log = PromptLog.objects.get(user=user)
+    assert log.is_partial is True
+    assert log.output_text == _parse_sse(first.encode())[0][1]["text"]
+
+
+# 토큰을 계속 만들어 내는 백엔드 (만든 토큰 수를 셈)
+class EndlessStreamBackend(BaseExecutionBackend):
+    produced = 0
+
+    async def run(self, request):
+        return "unused"
+
+    async def stream(self, request):
+        for index in range(10_000):
+            type(self).produced += 1
+            await asyncio.sleep(0)
+            yield f"t{index} "
+
+
+# ASGI 서버에서 스트리밍 도중 http.disconnect가 오면 백엔드 스트림을 멈추고 is_partial 로그로 저장
+def test_run_prompt_stream_stops_on_asgi_disconnect(api_client_logged_in, prompt, user, settings):
+    settings.PROMPT_EXECUTION = {"BACKEND": "apps.prompts.tests.test_prompts.EndlessStreamBackend"}
+    settings.PROMPT_RESULT_CACHE_ENABLED = False
+    EndlessStreamBackend.produced = 0
+    path = reverse("prompt-run-stream", args=[prompt.id])
+    body = b'{"input_text": "world"}'
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "POST",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [
+            (b"host", b"testserver"),
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+            (b"cookie", f"access_token={api_client_logged_in.cookies['access_token'].value}".encode()),
+        ],
+        "client": ("127.0.0.1", 50000),
+        "server": ("testserver", 80),
+    }
+
+    async def stream_then_disconnect():
+        disconnect = asyncio.Event()
+        incoming = [{"type": "http.request", "body": body, "more_body": False}]
+        sent = []
+
+        async def receive():
+            if incoming:
+                return incoming.pop()
+            await disconnect.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            sent.append(message)
+            if b"event: token" in message.get("body", b""):
+                disconnect.set()
+
+        await DisconnectAwareASGIHandler()(scope, receive, send)
+        return sent
+
+    # 테스트 클라이언트처럼 요청 시작 / 종료 시 테스트 트랜잭션의 연결을 닫지 않도록 함
+    request_started.disconnect(close_old_connections)
+    request_finished.disconnect(close_old_connections)
+    try:
+        sent = async_to_sync(stream_then_disconnect)()
+    finally:
+        request_started.connect(close_old_connections)
+        request_finished.connect(close_old_connections)
+
+    assert sent[0]["status"] == 200
+    assert EndlessStreamBackend.produced < 100
+    log = PromptLog.objects.get(user=user)
+    assert log.is_partial is True and log.output_text.startswith("t0 ")
+
+
+# 스트리밍 실행도 input_text 검증
+def test_run_prompt_stream_requires_input(api_client_logged_in, prompt):
+    res = api_client_logged_in.post(reverse("prompt-run-stream", args=[prompt.id]), {"input_text": " "})
+    assert res.status_code == 400
+
+
+# 배치 실행: 입력 순서대로 결과 반환, 항목별 오류 표시, 본문과 로그는 각각 한 번의 INSERT로 저장
+def test_run_prompt_batch(api_client_logged_in, prompt, user, django_assert_num_queries):
+    inputs = ["first", "  ", "second", 3, "third"]
+
+    # 인증 + 유저별 실행 제한 조회(이후 캐시) + 프롬프트 조회 + 본문 bulk INSERT + 로그 bulk INSERT
+    # + 실행 통계 (프롬프트 UPDATE, 처음 실행한 유저 / 날짜라 행 생성 포함 각 3)
+    with django_assert_num_queries(12):
+        res = api_client_logged_in.post(
+            reverse("prompt-run-batch", args=[prompt.id]), {"inputs": inputs}, format="json"
+        )
+
+    assert res.status_code == 200
+    results = res.data["results"]
+    assert [r["index"] for r in results] == list(range(len(inputs)))
+    assert "error" in results[1] and "error" in results[3]
+    assert all("'Test Prompt'" in results[i]["output"] for i in (0, 2, 4))
+    assert sorted(PromptLog.objects.filter(user=user).values_list("input_blob__text", flat=True)) == [
+        "first",
+        "second",
+        "third",
+    ]
+
+
+# 배치 실행 입력 검증 (빈 목록, 최대 개수 초과)
+@override_settings(PROMPT_BATCH_MAX_INPUTS=2)
+def test_run_prompt_batch_validation(api_client_logged_in, prompt):
+    url = reverse("prompt-run-batch", args=[prompt.id])
+
+    assert api_client_logged_in.post(url, {"inputs": []}, format="json").status_code == 400
+    assert api_client_logged_in.post(url, {"inputs": ["a", "b", "c"]}, format="json").status_code == 400
+
+
+# 태그 facet 조회
+def _facets(client):
+    return {f["name"]: f["count"] for f in client.get(reverse("prompt-tag-facets")).data}
+
+
+# 생성/수정/삭제에 따라 태그 facet 개수가 증감
+def test_tag_facet_counts_follow_changes(api_client_logged_in, user):
+    ai, ko, en = Tag.objects.bulk_create([Tag(name="ai"), Tag(name="ko"), Tag(name="en")])
+    url = reverse("prompt-list-create")
+    first = api_client_logged_in.post(url, {"title": "A", "content": "c", "tag_ids": [ai.id, ko.id]}, format="json")
+    api_client_logged_in.post(url, {"title": "B", "content": "c", "tag_ids": [ai.id]}, format="json")
+    assert _facets(api_client_logged_in) == {"ai": 2, "ko": 1}
+
+    detail = reverse("prompt-detail", args=[first.data["id"]])
+    api_client_logged_in.patch(detail, {"tag_ids": [ko.id, en.id]}, format="json")
+    assert _facets(api_client_logged_in) == {"ai": 1, "ko": 1, "en": 1}
+
+    api_client_logged_in.delete(detail)
+    assert _facets(api_client_logged_in) == {"ai": 1}
+
+
+# 태그 facet은 유저별로 분리되고 clear()도 반영
+def test_tag_facet_counts_are_per_user(api_client_logged_in, user, prompt):
+    other = User.objects.create_user(email="facet@example.com", username="facet", password="pass1234")
+    tag = Tag.objects.create(name="shared")
+    Prompt.objects.create(user=other, title="Other", content="c").tags.add(tag)
+    prompt.tags.add(tag)
+    assert _facets(api_client_logged_in) == {"shared": 1}
+
+    prompt.tags.clear()
+    assert _facets(api_client_logged_in) == {}
+
+
+# 집계가 어긋나 감소량이 현재 값보다 커도 음수 계산 없이 0으로 고정 (MySQL 부호 없는 컬럼 범위 초과 방지)
+def test_tag_count_deltas_clamp_at_zero(user):
+    tag = Tag.objects.create(name="drift")
+    UserTagCount.objects.create(user=user, tag=tag, count=1)
+
+    apply_tag_count_deltas({(user.id, tag.id): -3})
+    assert UserTagCount.objects.get(user=user, tag=tag).count == 0
+    apply_tag_count_deltas({(user.id, tag.id): 2})
+    assert UserTagCount.objects.get(user=user, tag=tag).count == 2
+
+
+# ?tags= 필터 (any / all)
+def test_list_prompts_filter_by_tags(api_client_logged_in, user):
+    ai, ko = Tag.objects.bulk_create([Tag(name="ai"), Tag(name="ko")])
+    both = Prompt.objects.create(user=user, title="Both", content="c")
+    both.tags.set([ai, ko])
+    Prompt.objects.create(user=user, title="AI", content="c").tags.set([ai])
+    Prompt.objects.create(user=user, title="None", content="c")
+    url = reverse("prompt-list-create")
+
+    any_titles = {p["title"] for p in api_client_logged_in.get(url, {"tags": "ai,ko"}).data["results"]}
+    all_titles = {
+        p["title"] for p in api_client_logged_in.get(url, {"tags": "ai,ko", "tag_match": "all"}).data["results"]
+    }
+
+    assert any_titles == {"Both", "AI"}
+    assert all_titles == {"Both"}
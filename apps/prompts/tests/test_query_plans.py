@@ -0,0 +1,192 @@
+import json
+import re
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from apps.prompts.models import Prompt, PromptLog, Tag
+from apps.prompts.views import (
+    PromptListCreateView,
+    PromptLogListView,
+    PromptRetrieveUpdateDestroyView,
+    PromptSearchView,
+)
+
+User = get_user_model()
+pytestmark = pytest.mark.django_db
+
+PROMPTS_PER_USER = 1000
+LOGS_PER_USER = 3000
+
+
+# 여러 유저에 걸친 대용량 데이터 + 통계 갱신 (플래너가 실제 분포로 계획을 세우도록)
+@pytest.fixture
+def seeded_user():
+    users = [User.objects.create_user(email=f"plan{i}@example.com", username=f"plan{i}") for i in range(3)]
+    tags = Tag.objects.bulk_create([Tag(name=f"tag{i}") for i in range(500)])
+    for user in users:
+        prompts = Prompt.objects.bulk_create(
+            [
+                Prompt(user=user, title=f"P{i}", content="c", is_favorite=i % 10 == 0, is_public=i % 7 == 0)
+                for i in range(PROMPTS_PER_USER)
+            ]
+        )
+        Prompt.tags.through.objects.bulk_create(
+            [Prompt.tags.through(prompt=prompt, tag=tags[i % len(tags)]) for i, prompt in enumerate(prompts[::5])]
+        )
+        PromptLog.objects.bulk_create(
+            [
+                PromptLog(prompt=prompts[i % 50], user=user, input_text=f"input {i % 100}", output_text="o")
+                for i in range(LOGS_PER_USER)
+            ],
+            batch_size=1000,
+        )
+
+    with connection.cursor() as cursor:
+        if connection.vendor == "mysql":
+            cursor.execute("ANALYZE TABLE prompts_prompt, prompts_prompt_tags, prompts_promptlog, prompts_contentblob")
+        else:
+            cursor.execute("ANALYZE")
+    return users[0]
+
+
+# 뷰 클래스를 실제 요청처럼 초기화 (인증은 강제, 핸들러 메서드를 직접 호출해 뷰가 실행하는 쿼리만 모음)
+def make_view(view_class, user, params=None, headers=None, **kwargs):
+    request = APIRequestFactory().get("/", params or {}, **(headers or {}))
+    force_authenticate(request, user=user)
+    view = view_class()
+    view.setup(request, **kwargs)
+    view.request = view.initialize_request(request)
+    view.format_kwarg = None
+    view.request.user  # 인증은 쿼리 수집 전에 끝냄
+    return view
+
+
+def executed_selects(handler, *args, **kwargs):
+    with CaptureQueriesContext(connection) as ctx:
+        response = handler(*args, **kwargs)
+    assert response.status_code == 200, response.data
+    return response, [query["sql"] for query in ctx.captured_queries if "SELECT" in query["sql"][:20].upper()]
+
+
+def explain(sql):
+    with connection.cursor() as cursor:
+        if connection.vendor == "mysql":
+            cursor.execute(f"EXPLAIN FORMAT=JSON {sql}")
+            return cursor.fetchone()[0]
+        cursor.execute(f"EXPLAIN QUERY PLAN {sql}")
+        return "\n".join(row[-1] for row in cursor.fetchall())
+
+
+def _mysql_tables(node):
+    if isinstance(node, dict):
+        if "table_name" in node:
+            yield node
+        for value in node.values():
+            yield from _mysql_tables(value)
+    elif isinstance(node, list):
+        for value in node:
+            yield from _mysql_tables(value)
+
+
+# EXPLAIN 결과에 풀 스캔 또는 filesort가 있으면 실패
+# ranked=True(검색): 관련도 정렬과 FTS 인덱스 / 서브쿼리 결과를 훑는 것은 허용하고, 실제 테이블 풀 스캔만 금지
+def assert_index_plan(sql, ranked=False):
+    plan = explain(sql)
+    if connection.vendor == "mysql":
+        for table in _mysql_tables(json.loads(plan)):
+            if "materialized_from_subquery" not in table:
+                assert table.get("access_type") != "ALL", plan
+        if not ranked:
+            assert not re.search(r'"using_filesort":\s*true', plan), plan
+        return
+
+    subqueries = set(re.findall(r"(?:CO-ROUTINE|MATERIALIZE) (\w+)", plan))
+    for name, rest in re.findall(r"\bSCAN (\w+)(.*)", plan):
+        assert ranked and (name in subqueries or "VIRTUAL TABLE" in rest), plan
+    if not ranked:
+        assert "USE TEMP B-TREE" not in plan, plan
+
+
+def assert_index_plans(selects, ranked=False):
+    assert selects
+    for sql in selects:
+        assert_index_plan(sql, ranked=ranked)
+
+
+# 목록: 목록 버전 / 통계 조회 + prompt_rows(.values()) 커서 페이지 + 태그 조회
+@pytest.mark.parametrize("params", [{}, {"view": "summary"}, {"fields": "id,title,tags"}])
+def test_prompt_list_plan(seeded_user, params):
+    view = make_view(PromptListCreateView, seeded_user, params)
+    response, selects = executed_selects(view.list, view.request)
+
+    assert len(response.data["results"]) == 50
+    assert_index_plans(selects)
+
+
+def test_prompt_list_cursor_plan(seeded_user):
+    view = make_view(PromptListCreateView, seeded_user)
+    first, _ = executed_selects(view.list, view.request)
+    cursor = parse_qs(urlparse(first.data["next"]).query)["cursor"][0]
+
+    view = make_view(PromptListCreateView, seeded_user, {"cursor": cursor})
+    response, selects = executed_selects(view.list, view.request)
+
+    assert response.data["results"][0]["id"] < first.data["results"][-1]["id"]
+    assert_index_plans(selects)
+
+
+@pytest.mark.parametrize("params", [{"tags": "tag0,tag1"}, {"tags": "tag0", "tag_match": "all"}])
+def test_prompt_list_tag_filter_plan(seeded_user, params):
+    view = make_view(PromptListCreateView, seeded_user, params)
+    response, selects = executed_selects(view.list, view.request)
+
+    assert response.data["results"]
+    assert_index_plans(selects)
+
+
+# 상세: 조건부 요청의 상태 조회 + get_object + 태그 prefetch
+def test_prompt_detail_plan(seeded_user):
+    prompt = Prompt.objects.filter(user=seeded_user).first()
+    view = make_view(
+        PromptRetrieveUpdateDestroyView, seeded_user, headers={"HTTP_IF_NONE_MATCH": '"stale"'}, pk=prompt.pk
+    )
+    response, selects = executed_selects(view.retrieve, view.request, pk=prompt.pk)
+
+    assert response.data["id"] == prompt.pk
+    assert_index_plans(selects)
+
+
+# 실행 로그 목록: 커서 페이지 + 본문 select_related
+def test_prompt_log_list_plan(seeded_user):
+    view = make_view(PromptLogListView, seeded_user)
+    response, selects = executed_selects(view.list, view.request)
+
+    assert len(response.data["results"]) == 50
+    assert_index_plans(selects)
+
+
+def test_prompt_log_cursor_plan(seeded_user):
+    view = make_view(PromptLogListView, seeded_user)
+    first, _ = executed_selects(view.list, view.request)
+    cursor = parse_qs(urlparse(first.data["next"]).query)["cursor"][0]
+
+    view = make_view(PromptLogListView, seeded_user, {"cursor": cursor})
+    response, selects = executed_selects(view.list, view.request)
+
+    assert response.data["results"]
+    assert_index_plans(selects)
+
+
+# 검색: 관련도 순 id 조회(search_prompts / search_logs) + 결과 행 조회
+@pytest.mark.parametrize("search_type, query", [("prompt", "P12"), ("log", "input 7")])
+def test_search_plan(seeded_user, search_type, query):
+    view = make_view(PromptSearchView, seeded_user, {"q": query, "type": search_type})
+    response, selects = executed_selects(view.get, view.request)
+
+    assert response.data["results"]
+    assert_index_plans(selects, ranked=True)
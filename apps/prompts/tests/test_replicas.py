@@ -0,0 +1,95 @@
+import runpy
+
+import pytest
+from django.apps import apps
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connections
+from django.urls import reverse
+
+from apps.common.db import ReplicaRouter
+from apps.common.metrics import metrics
+from apps.prompts.models import Prompt
+
+User = get_user_model()
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def replica(db, settings, tmp_path):
+    """default와 별개인 SQLite 파일을 읽기 복제본 "replica"로 추가 (복제 지연을 흉내 내려고 테이블만 만들고 데이터는 따로 넣음)"""
+    alias = "replica"
+    connections.settings[alias] = connections.configure_settings(
+        {
+            **connections.settings,
+            alias: {"ENGINE": "django.db.backends.sqlite3", "NAME": str(tmp_path / "replica.sqlite3")},
+        }
+    )[alias]
+    with connections[alias].schema_editor() as editor:
+        for model in apps.get_models():
+            editor.create_model(model)
+    settings.DATABASE_REPLICAS = [alias]
+    metrics.reset()
+    yield alias
+    connections[alias].close()
+    del connections[alias]
+    del connections.settings[alias]
+
+
+@pytest.fixture
+def user(replica):
+    user = User.objects.create_user(email="replica@example.com", username="replica", password="pass1234")
+    User.objects.using(replica).create(pk=user.pk, email=user.email, username=user.username, password=user.password)
+    return user
+
+
+def titles(response):
+    return [item["title"] for item in response.data["results"]]
+
+
+# 읽기 전용 뷰의 조회는 복제본, 자신의 쓰기 직후에는 default에서 읽음
+def test_reads_go_to_replica_until_own_write(api_client_logged_in, user, replica):
+    prompt = Prompt.objects.create(user=user, title="primary", content="c")
+    Prompt.objects.using(replica).create(pk=prompt.pk, user_id=user.pk, title="replica", content="c")
+    url = reverse("prompt-list-create")
+
+    assert titles(api_client_logged_in.get(url)) == ["replica"]
+    assert api_client_logged_in.get(reverse("prompt-logs")).status_code == 200
+    assert api_client_logged_in.get(reverse("me")).status_code == 200
+
+    res = api_client_logged_in.patch(reverse("prompt-detail", args=[prompt.pk]), {"title": "edited"}, format="json")
+    assert res.status_code == 200
+    assert titles(api_client_logged_in.get(url)) == ["edited"]
+
+    counters = metrics.snapshot()["counters"]
+    assert counters["db.read.replica"] == 3
+    assert counters["db.read.pinned_to_primary"] == 1
+
+
+# 쓰기 / 마이그레이션은 항상 default, 복제본 사용 구간 밖의 조회도 default
+def test_router_defaults_to_primary(replica):
+    router = ReplicaRouter()
+    assert router.db_for_read(Prompt) is None
+    assert router.db_for_write(Prompt) == "default"
+    assert router.allow_migrate(replica, "prompts") is False
+    assert router.allow_migrate("default", "prompts") is None
+
+
+# 복제본을 쓰는데 고정 여부 캐시가 워커별(locmem / dummy)이면 설정을 읽을 때 거부
+@pytest.mark.parametrize(
+    "backend, allowed",
+    [
+        ("django.core.cache.backends.locmem.LocMemCache", False),
+        ("django.core.cache.backends.dummy.DummyCache", False),
+        ("django.core.cache.backends.filebased.FileBasedCache", True),
+    ],
+)
+def test_replicas_require_shared_pin_cache(settings, monkeypatch, backend, allowed):
+    monkeypatch.setenv("DB_REPLICA_HOSTS", "replica-1")
+    monkeypatch.setenv("REPLICA_PIN_CACHE_BACKEND", backend)
+    path = settings.BASE_DIR / "config" / "settings.py"
+    if allowed:
+        assert runpy.run_path(str(path))["DATABASE_REPLICAS"] == ["replica_1"]
+    else:
+        with pytest.raises(ImproperlyConfigured, match="REPLICA_PIN_CACHE_BACKEND"):
+            runpy.run_path(str(path))
@@ -0,0 +1,118 @@
+import asyncio
+from unittest import mock
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.core.cache.backends.locmem import LocMemCache
+from django.test import override_settings
+from django.urls import reverse
+
+from apps.common.metrics import metrics
+from apps.prompts.backends import BaseExecutionBackend
+from apps.prompts.models import Prompt, PromptLog
+
+pytestmark = pytest.mark.django_db
+
+
+# 호출 횟수를 세는 테스트용 백엔드
+class CountingBackend(BaseExecutionBackend):
+    calls = 0
+
+    async def run(self, request):
+        type(self).calls += 1
+        return f"{request.title}:{request.content}:{request.input_text}"
+
+
+@pytest.fixture(autouse=True)
+def counting_backend():
+    CountingBackend.calls = 0
+    metrics.reset()
+    with override_settings(PROMPT_EXECUTION={"BACKEND": "apps.prompts.tests.test_result_cache.CountingBackend"}):
+        yield CountingBackend
+
+
+# 이벤트 루프 스레드에서 동기 API를 부르면 실패하는 캐시 (aget / aset은 기본 구현대로 스레드에서 동기 API 호출)
+class LoopGuardCache(LocMemCache):
+    def _check_not_in_loop(self):
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        raise AssertionError("이벤트 루프에서 동기 캐시 API 호출")
+
+    def get(self, *args, **kwargs):
+        self._check_not_in_loop()
+        return super().get(*args, **kwargs)
+
+    def set(self, *args, **kwargs):
+        self._check_not_in_loop()
+        return super().set(*args, **kwargs)
+
+
+@pytest.fixture
+def prompt(user):
+    return Prompt.objects.create(user=user, title="Cached", content="v1")
+
+
+def run(client, prompt, input_text="hello"):
+    return client.post(reverse("prompt-run", args=[prompt.id]), {"input_text": input_text})
+
+
+# 같은 프롬프트 + 같은 입력은 두 번째부터 캐시로 응답하고, 로그에는 캐시 여부가 남음
+def test_repeated_run_hits_cache(api_client_logged_in, prompt, user, counting_backend):
+    first, second = run(api_client_logged_in, prompt), run(api_client_logged_in, prompt)
+
+    assert first.data == {"output": "Cached:v1:hello", "cached": False}
+    assert second.data == {"output": "Cached:v1:hello", "cached": True}
+    assert counting_backend.calls == 1
+    assert list(PromptLog.objects.filter(user=user).order_by("id").values_list("is_cached", flat=True)) == [
+        False,
+        True,
+    ]
+    counters = metrics.snapshot()["counters"]
+    assert counters["prompt_result_cache.hits"] == 1
+    assert counters["prompt_result_cache.misses"] == 1
+
+
+# 입력이 다르면 캐시를 공유하지 않음
+def test_different_input_misses_cache(api_client_logged_in, prompt, counting_backend):
+    run(api_client_logged_in, prompt, "a")
+    run(api_client_logged_in, prompt, "b")
+    assert counting_backend.calls == 2
+
+
+# 상세 API로 수정하면 내용이 같아도 이전 결과를 무효화
+@pytest.mark.parametrize("patch", [{"content": "v2"}, {"is_favorite": True}])
+def test_update_invalidates_cache(api_client_logged_in, prompt, counting_backend, patch):
+    run(api_client_logged_in, prompt)
+    res = api_client_logged_in.patch(reverse("prompt-detail", args=[prompt.id]), patch, format="json")
+    assert res.status_code == 200
+
+    res = run(api_client_logged_in, prompt)
+    assert res.data["cached"] is False
+    assert counting_backend.calls == 2
+
+
+# 캐시 비활성화 시 항상 백엔드 호출
+@override_settings(PROMPT_RESULT_CACHE_ENABLED=False)
+def test_cache_can_be_disabled(api_client_logged_in, prompt, counting_backend):
+    run(api_client_logged_in, prompt)
+    run(api_client_logged_in, prompt)
+    assert counting_backend.calls == 2
+
+
+async def read_stream(response):
+    return b"".join([chunk async for chunk in response.streaming_content]).decode()
+
+
+# 실행 / 스트리밍 경로는 캐시의 async API만 사용해 이벤트 루프를 막지 않음
+def test_run_uses_async_cache_api(api_client_logged_in, prompt, counting_backend):
+    cache = LoopGuardCache("loop-guard", {})
+    with mock.patch("apps.prompts.result_cache.get_result_cache", return_value=cache):
+        first, second = run(api_client_logged_in, prompt), run(api_client_logged_in, prompt)
+        stream = api_client_logged_in.post(reverse("prompt-run-stream", args=[prompt.id]), {"input_text": "hello"})
+        body = async_to_sync(read_stream)(stream)
+
+    assert (first.data["cached"], second.data["cached"]) == (False, True)
+    assert "Cached:v1:hello" in body
+    assert counting_backend.calls == 1
@@ -0,0 +1,111 @@
+import re
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from apps.prompts.models import Prompt, PromptLog
+
+User = get_user_model()
+pytestmark = pytest.mark.django_db
+
+
+def search(client, q, **params):
+    return client.get(reverse("prompt-search"), {"q": q, **params})
+
+
+# 관련도 순 정렬 + 스니펫 강조, 다른 유저의 프롬프트는 제외
+def test_search_prompts_ranked_with_snippet(api_client_logged_in, user):
+    other = User.objects.create_user(email="other@example.com", username="other", password="pass1234")
+    Prompt.objects.create(user=other, title="Translator", content="translate everything")
+    weak = Prompt.objects.create(user=user, title="Notes", content="A long note that mentions translate once " * 5)
+    strong = Prompt.objects.create(user=user, title="Translator", content="Translate the input. Translate politely.")
+    Prompt.objects.create(user=user, title="Summarizer", content="Summarize the input.")
+
+    res = search(api_client_logged_in, "translate")
+
+    assert res.status_code == 200
+    assert [r["id"] for r in res.data["results"]] == [strong.id, weak.id]
+    assert "<mark>Translate</mark>" in res.data["results"][0]["snippet"]
+    assert res.data["next"] is None
+
+
+# 수정/삭제된 프롬프트도 인덱스에 반영
+def test_search_index_follows_updates(api_client_logged_in, user):
+    prompt = Prompt.objects.create(user=user, title="Draft", content="alpha")
+    prompt.content = "bravo"
+    prompt.save()
+
+    assert search(api_client_logged_in, "alpha").data["results"] == []
+    assert [r["id"] for r in search(api_client_logged_in, "bravo").data["results"]] == [prompt.id]
+
+    prompt.delete()
+    assert search(api_client_logged_in, "bravo").data["results"] == []
+
+
+# 긴 프롬프트 / 실행 로그 본문도 원문으로 색인되어 검색됨
+def test_search_finds_long_text(api_client_logged_in, user, settings):
+    settings.TEXT_COMPRESSION_MIN_BYTES = 1024
+    long_text = "filler sentence without the keyword. " * 100 + "zucchini"
+    prompt = Prompt.objects.create(user=user, title="Long", content=long_text)
+    PromptLog.objects.create(prompt=prompt, user=user, input_text="short", output_text=long_text)
+
+    assert [r["id"] for r in search(api_client_logged_in, "zucchini").data["results"]] == [prompt.id]
+    assert len(search(api_client_logged_in, "zucchini", type="log").data["results"]) == 1
+
+
+# 실행 로그는 입력/출력 모두 검색, limit/offset 페이지네이션
+def test_search_logs_paginated(api_client_logged_in, user):
+    prompt = Prompt.objects.create(user=user, title="Echo", content="echo")
+    PromptLog.objects.bulk_create(
+        [PromptLog(prompt=prompt, user=user, input_text=f"question {i}", output_text="kiwi answer") for i in range(3)]
+        + [PromptLog(prompt=prompt, user=user, input_text="unrelated", output_text="nothing")]
+    )
+
+    first = search(api_client_logged_in, "kiwi", type="log", limit=2)
+    assert len(first.data["results"]) == 2
+    assert first.data["results"][0]["prompt"] == prompt.id
+    assert "<mark>kiwi</mark>" in first.data["results"][0]["snippet"]
+
+    second = api_client_logged_in.get(first.data["next"])
+    assert len(second.data["results"]) == 1
+    assert second.data["next"] is None
+
+
+# 실행 로그 검색은 유저의 로그가 참조하는 본문만 매칭 (다른 유저의 일치 본문은 후보에도 오르지 않음)
+def test_search_logs_ranks_only_own_blobs(api_client_logged_in, user):
+    other = User.objects.create_user(email="other@example.com", username="other", password="pass1234")
+    other_prompt = Prompt.objects.create(user=other, title="Echo", content="echo")
+    PromptLog.objects.bulk_create(
+        [PromptLog(prompt=other_prompt, user=other, input_text=f"kiwi {i}", output_text="kiwi") for i in range(1000)]
+    )
+    prompt = Prompt.objects.create(user=user, title="Echo", content="echo")
+    own = PromptLog.objects.create(prompt=prompt, user=user, input_text="kiwi", output_text="banana")
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "ANALYZE TABLE prompts_promptlog, prompts_contentblob" if connection.vendor == "mysql" else "ANALYZE"
+        )
+
+    with CaptureQueriesContext(connection) as ctx:
+        res = search(api_client_logged_in, "kiwi", type="log")
+
+    assert [r["id"] for r in res.data["results"]] == [own.id]
+    if connection.vendor == "sqlite":
+        sql = next(q["sql"] for q in ctx.captured_queries if "prompts_contentblob_fts" in q["sql"])
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN QUERY PLAN {sql}")
+            fts_steps = [row[3] for row in cursor.fetchall() if "prompts_contentblob_fts" in row[3]]
+        # FTS 테이블은 MATCH만으로 훑지 않고 후보 본문의 rowid(=)로만 조회
+        assert fts_steps and all(re.search(r"INDEX \d+:\S*=", step) for step in fts_steps), fts_steps
+
+
+# FTS 문법 문자가 섞인 검색어도 오류 없이 처리, 잘못된 파라미터는 400
+def test_search_sanitizes_query(api_client_logged_in, user):
+    Prompt.objects.create(user=user, title="Quotes", content='say "hello" (politely)')
+
+    assert search(api_client_logged_in, 'hel" (*').data["results"][0]["title"] == "Quotes"
+    assert search(api_client_logged_in, "").status_code == 400
+    assert search(api_client_logged_in, "hello", type="users").status_code == 400
+    assert search(api_client_logged_in, "hello", limit="abc").status_code == 400
@@ -0,0 +1,113 @@
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.prompts.history import get_log_buffer
+from apps.prompts.models import (
+    Prompt,
+    PromptLog,
+    PromptLogArchive,
+    PromptRunDay,
+    UserRunStats,
+)
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def prompt(user):
+    return Prompt.objects.create(user=user, title="Stats", content="content")
+
+
+def add_logs(prompt, created_at_list):
+    logs = PromptLog.objects.bulk_create(
+        [PromptLog(prompt=prompt, user=prompt.user, input_text="in", output_text="out") for _ in created_at_list]
+    )
+    for log, created_at in zip(logs, created_at_list):
+        PromptLog.objects.filter(pk=log.pk).update(created_at=created_at)
+
+
+# 실행 / 배치 실행 후 프롬프트 상세 / 목록 / 통계 API에 실행 수가 반영되고 상세 ETag가 바뀜
+# (목록 ETag도 바뀌고, 실행 전 ETag로 보낸 If-Match 수정은 통과)
+def test_runs_update_stats(api_client_logged_in, prompt):
+    detail_url = reverse("prompt-detail", args=[prompt.id])
+    list_url = reverse("prompt-list-create")
+    etag = api_client_logged_in.get(detail_url)["ETag"]
+    list_etag = api_client_logged_in.get(list_url)["ETag"]
+
+    api_client_logged_in.post(reverse("prompt-run", args=[prompt.id]), {"input_text": "one"})
+    api_client_logged_in.post(reverse("prompt-run-batch", args=[prompt.id]), {"inputs": ["a", "b"]}, format="json")
+
+    res = api_client_logged_in.get(detail_url, HTTP_IF_NONE_MATCH=etag)
+    assert res.status_code == 200
+    assert res.data["run_count"] == 3 and res.data["last_run_at"]
+    res = api_client_logged_in.get(list_url, HTTP_IF_NONE_MATCH=list_etag)
+    assert res.status_code == 200 and res["ETag"] != list_etag
+    assert res.data["results"][0]["run_count"] == 3
+    assert api_client_logged_in.get(list_url, HTTP_IF_NONE_MATCH=res["ETag"]).status_code == 304
+
+    res = api_client_logged_in.patch(detail_url, {"title": "Edited"}, format="json", HTTP_IF_MATCH=etag)
+    assert res.status_code == 200
+    res = api_client_logged_in.patch(detail_url, {"title": "Stale"}, format="json", HTTP_IF_MATCH=etag)
+    assert res.status_code == 412
+
+    res = api_client_logged_in.get(reverse("prompt-run-stats", args=[prompt.id]), {"days": 7})
+    assert res.data["run_count"] == 3
+    assert len(res.data["daily"]) == 7
+    assert res.data["daily"][-1] == {"date": timezone.localdate(), "runs": 3}
+
+    res = api_client_logged_in.get(reverse("run-stats"))
+    assert res.data["run_count"] == 3 and len(res.data["daily"]) == 30
+    assert api_client_logged_in.get(reverse("run-stats"), {"days": 0}).status_code == 400
+
+
+# buffered 모드에서는 flush 시점에 로그와 함께 반영, 프롬프트 삭제 시 유저 누적 실행 수에서 빠짐
+@override_settings(
+    PROMPT_LOG_WRITE_MODE="buffered",
+    PROMPT_LOG_BUFFER={"MAX_SIZE": 100, "FLUSH_SIZE": 10_000, "FLUSH_INTERVAL": 3600},
+)
+def test_buffered_runs_counted_on_flush(api_client_logged_in, prompt, user):
+    other = Prompt.objects.create(user=user, title="Other", content="content")
+    for target in (prompt, prompt, other):
+        api_client_logged_in.post(reverse("prompt-run", args=[target.id]), {"input_text": "hi"})
+    assert UserRunStats.objects.filter(user=user).exists() is False
+
+    get_log_buffer().flush()
+    assert Prompt.objects.get(pk=prompt.pk).run_count == 2
+    assert UserRunStats.objects.get(user=user).run_count == 3
+
+    prompt.delete()
+    assert UserRunStats.objects.get(user=user).run_count == 1
+    assert list(PromptRunDay.objects.values_list("prompt_id", "run_count")) == [(other.pk, 1)]
+
+    # 누적 값이 이미 어긋나 있어도 음수로 내려가지 않고 0
+    UserRunStats.objects.filter(user=user).update(run_count=0)
+    other.delete()
+    assert UserRunStats.objects.get(user=user).run_count == 0
+
+
+# reconcile_run_stats: 남아 있는 로그로 일별 / 누적 값을 다시 계산하고, 아카이브된 날의 값은 유지
+def test_reconcile_rebuilds_from_logs(prompt, user):
+    now = timezone.now()
+    today = timezone.localdate()
+    add_logs(prompt, [now, now, now - timedelta(days=2)])
+    archived_day = today - timedelta(days=10)
+    PromptRunDay.objects.create(prompt=prompt, user=user, day=archived_day, run_count=5)
+    PromptRunDay.objects.create(prompt=prompt, user=user, day=today, run_count=99)
+    PromptLogArchive.objects.create(user=user, path="a.ndjson.gz", row_count=5, end_at=now - timedelta(days=9))
+
+    out = StringIO()
+    call_command("reconcile_run_stats", stdout=out)
+
+    days = dict(PromptRunDay.objects.filter(prompt=prompt).values_list("day", "run_count"))
+    assert days == {archived_day: 5, today - timedelta(days=2): 1, today: 2}
+    prompt.refresh_from_db()
+    assert prompt.run_count == 8 and prompt.last_run_at == now
+    stats = UserRunStats.objects.get(user=user)
+    assert (stats.run_count, stats.last_run_at) == (8, now)
+    assert "실행 로그 3건" in out.getvalue()
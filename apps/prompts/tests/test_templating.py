@@ -0,0 +1,111 @@
+import pytest
+from django.test import override_settings
+from django.urls import reverse
+
+from apps.common.metrics import metrics
+from apps.prompts.backends import BaseExecutionBackend
+from apps.prompts.models import Prompt
+from apps.prompts.templating import TemplateCache, compile_template, get_template_cache
+
+pytestmark = pytest.mark.django_db
+
+
+# 렌더링된 프롬프트 내용을 그대로 돌려주는 백엔드
+class ContentEchoBackend(BaseExecutionBackend):
+    async def run(self, request):
+        return request.content
+
+
+@pytest.fixture(autouse=True)
+def echo_backend():
+    get_template_cache.cache_clear()
+    with override_settings(
+        PROMPT_EXECUTION={"BACKEND": "apps.prompts.tests.test_templating.ContentEchoBackend"},
+        PROMPT_RESULT_CACHE_ENABLED=False,
+    ):
+        yield
+    get_template_cache.cache_clear()
+
+
+@pytest.fixture
+def prompt(user):
+    return Prompt.objects.create(
+        user=user, title="Greeting", content="Hello {{ name }}, {{name}}! Topic: {{topic}}", is_template=True
+    )
+
+
+# 같은 변수는 여러 번 치환, 형식이 아닌 중괄호와 값 안의 {{...}}는 그대로
+def test_compile_and_render():
+    template = compile_template("{{a}} and {{ b }} / {{a}} {{ not valid }} {}")
+    assert template.variables == {"a", "b"}
+    assert template.render({"a": "{{b}}", "b": "B"}) == "{{b}} and B / {{b}} {{ not valid }} {}"
+    assert compile_template("").render({}) == ""
+    assert compile_template("plain").render({}) == "plain"
+
+
+# {{{{ 는 글자 그대로의 {{ (뒤의 변수 형식도 치환하지 않음)
+def test_escaped_braces():
+    template = compile_template("{{{{ a }} = {{a}}, {{{{{{{{ / {{{{{{a}}")
+    assert template.variables == {"a"}
+    assert template.render({"a": "A"}) == "{{ a }} = A, {{{{ / {{A"
+    assert compile_template("{{{{").segments == ("{{",)
+
+
+# 용량을 넘으면 가장 오래 쓰지 않은 항목부터 제거, 프롬프트별 무효화
+def test_template_cache_lru():
+    cache = TemplateCache(max_size=2)
+    first = cache.get(1, "{{x}}")
+    cache.get(2, "{{y}}")
+    assert cache.get(1, "{{x}}") is first
+    cache.get(3, "{{z}}")
+    assert len(cache) == 2 and cache.get(1, "{{x}}") is first
+
+    cache.invalidate(1)
+    assert cache.get(1, "{{x}}") is not first
+
+
+# 실행 시 variables로 치환, 누락 / 알 수 없는 / 잘못된 값의 변수는 400
+def test_run_with_variables(api_client_logged_in, prompt):
+    url = reverse("prompt-run", args=[prompt.id])
+    res = api_client_logged_in.post(url, {"input_text": "hi", "variables": {"name": "Kim", "topic": 3}}, format="json")
+    assert res.status_code == 200
+    assert res.data["output"] == "Hello Kim, Kim! Topic: 3"
+
+    for variables in ({"name": "Kim"}, {"name": "Kim", "topic": "t", "extra": 1}, {"name": [], "topic": "t"}, []):
+        res = api_client_logged_in.post(url, {"input_text": "hi", "variables": variables}, format="json")
+        assert res.status_code == 400, variables
+
+    res = api_client_logged_in.post(
+        reverse("prompt-run-batch", args=[prompt.id]),
+        {"inputs": ["a", "b"], "variables": {"name": "Lee", "topic": "x"}},
+        format="json",
+    )
+    assert [item["output"] for item in res.data["results"]] == ["Hello Lee, Lee! Topic: x"] * 2
+
+
+# 컴파일은 프롬프트 내용마다 한 번, 수정하면 해당 프롬프트의 캐시 항목을 지우고 새 내용으로 컴파일
+def test_template_compiled_once_and_invalidated_on_update(api_client_logged_in, prompt):
+    metrics.reset()
+    url = reverse("prompt-run", args=[prompt.id])
+    variables = {"name": "Kim", "topic": "t"}
+    for _ in range(3):
+        api_client_logged_in.post(url, {"input_text": "hi", "variables": variables}, format="json")
+    counters = metrics.snapshot()["counters"]
+    assert (counters["prompt_template_cache.misses"], counters["prompt_template_cache.hits"]) == (1, 2)
+
+    api_client_logged_in.patch(reverse("prompt-detail", args=[prompt.id]), {"content": "Bye {{name}}"})
+    assert len(get_template_cache()) == 0
+    res = api_client_logged_in.post(url, {"input_text": "hi", "variables": {"name": "Kim"}}, format="json")
+    assert res.data["output"] == "Bye Kim"
+
+
+# 템플릿이 아닌 프롬프트(템플릿 도입 전 프롬프트 포함)는 {{ }}를 그대로 보내고 variables를 받지 않음
+def test_non_template_prompt_is_literal(api_client_logged_in, prompt):
+    Prompt.objects.filter(pk=prompt.pk).update(is_template=False)
+    url = reverse("prompt-run", args=[prompt.id])
+    res = api_client_logged_in.post(url, {"input_text": "hi"}, format="json")
+    assert res.status_code == 200
+    assert res.data["output"] == "Hello {{ name }}, {{name}}! Topic: {{topic}}"
+
+    res = api_client_logged_in.post(url, {"input_text": "hi", "variables": {"name": "Kim"}}, format="json")
+    assert res.status_code == 400
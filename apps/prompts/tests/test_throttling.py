@@ -0,0 +1,124 @@
+from datetime import datetime, timezone
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.urls import reverse
+
+from apps.prompts.backends import BaseExecutionBackend, ExecutionError
+from apps.prompts.models import Prompt, PromptRunLimit
+from apps.prompts.throttling import RunRateThrottle
+
+pytestmark = pytest.mark.django_db
+
+NOON = datetime(2026, 3, 1, 12, 0, tzinfo=timezone.utc).timestamp()
+
+
+# 입력이 "fail"이면 실행에 실패하는 백엔드
+class FailOnInputBackend(BaseExecutionBackend):
+    async def run(self, request):
+        if request.input_text == "fail":
+            raise ExecutionError("boom")
+        return request.input_text
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [NOON]
+    monkeypatch.setattr(RunRateThrottle, "timer", staticmethod(lambda: now[0]))
+    return now
+
+
+@pytest.fixture
+def prompt(user):
+    return Prompt.objects.create(user=user, title="Throttle", content="content")
+
+
+# 토큰 버킷: 한도만큼 연속 허용 후 429 + Retry-After, 시간이 지나면 다시 채워짐 (엔드포인트별 버킷)
+@pytest.mark.parametrize("store", ["local", "cache"])
+def test_rate_limit_per_endpoint(api_client_logged_in, prompt, settings, clock, store):
+    settings.PROMPT_RUN_LIMIT_STORE = store
+    settings.PROMPT_RUN_RATES = {"run": "2/m", "batch": "", "stream": ""}
+    settings.PROMPT_RUN_DAILY_QUOTA = 0
+    url = reverse("prompt-run", args=[prompt.id])
+
+    remaining = [api_client_logged_in.post(url, {"input_text": "hi"})["X-RateLimit-Remaining"] for _ in range(2)]
+    assert remaining == ["1", "0"]
+    res = api_client_logged_in.post(url, {"input_text": "hi"})
+    assert res.status_code == 429
+    assert res["Retry-After"] == "30" and res["X-RateLimit-Remaining"] == "0"
+    assert "X-RunQuota-Limit" not in res
+
+    res = api_client_logged_in.post(reverse("prompt-run-batch", args=[prompt.id]), {"inputs": ["a"]}, format="json")
+    assert res.status_code == 200 and "X-RateLimit-Limit" not in res
+
+    clock[0] += 30
+    res = api_client_logged_in.post(url, {"input_text": "hi"})
+    assert res.status_code == 200 and res["X-RateLimit-Remaining"] == "0"
+
+
+# 하루 실행 수: 배치는 실행한 입력 수만큼 차감, 넘으면 다음 날 자정까지 429
+@pytest.mark.parametrize("store", ["local", "cache"])
+def test_daily_quota(api_client_logged_in, prompt, settings, clock, store):
+    settings.PROMPT_RUN_LIMIT_STORE = store
+    settings.PROMPT_RUN_DAILY_QUOTA = 3
+    batch_url = reverse("prompt-run-batch", args=[prompt.id])
+    run_url = reverse("prompt-run", args=[prompt.id])
+
+    res = api_client_logged_in.post(batch_url, {"inputs": ["a", "b"]}, format="json")
+    assert (res["X-RunQuota-Limit"], res["X-RunQuota-Remaining"]) == ("3", "1")
+    res = api_client_logged_in.post(batch_url, {"inputs": ["a", "b"]}, format="json")
+    assert res.status_code == 429 and res.data["detail"].code == "run_quota_exceeded"
+    assert api_client_logged_in.post(run_url, {"input_text": "hi"})["X-RunQuota-Remaining"] == "0"
+
+    res = api_client_logged_in.post(run_url, {"input_text": "hi"})
+    assert res.status_code == 429 and res["Retry-After"] == str(12 * 3600)
+
+    clock[0] += 12 * 3600
+    res = api_client_logged_in.post(run_url, {"input_text": "hi"})
+    assert res.status_code == 200 and res["X-RunQuota-Remaining"] == "2"
+
+
+# 유저별 덮어쓰기는 저장 즉시 반영, daily_quota=0이면 하루 실행 수 제한 없음
+def test_per_user_limits(api_client_logged_in, prompt, user, clock):
+    url = reverse("prompt-run", args=[prompt.id])
+    assert api_client_logged_in.post(url, {"input_text": "hi"})["X-RateLimit-Limit"] == "120"
+
+    limit = PromptRunLimit.objects.create(user=user, run_rate="1/h", daily_quota=0)
+    res = api_client_logged_in.post(url, {"input_text": "hi"})
+    assert res.status_code == 200 and res["X-RateLimit-Limit"] == "1" and "X-RunQuota-Limit" not in res
+    res = api_client_logged_in.post(url, {"input_text": "hi"})
+    assert res.status_code == 429 and res["Retry-After"] == "3600"
+
+    limit.run_rate = "100/h"
+    limit.save()
+    assert api_client_logged_in.post(url, {"input_text": "hi"}).status_code == 200
+
+
+# 검증에 실패한 요청(404 / 400), 빈 배치 항목, 실행에 실패한 실행은 하루 실행 수를 쓰지 않음
+def test_quota_charged_only_for_executed_runs(api_client_logged_in, prompt, user, settings, clock):
+    settings.PROMPT_RUN_DAILY_QUOTA = 3
+    settings.PROMPT_RESULT_CACHE_ENABLED = False
+    settings.PROMPT_EXECUTION = {"BACKEND": "apps.prompts.tests.test_throttling.FailOnInputBackend"}
+    run_url = reverse("prompt-run", args=[prompt.id])
+    batch_url = reverse("prompt-run-batch", args=[prompt.id])
+    stream_url = reverse("prompt-run-stream", args=[prompt.id])
+
+    assert (
+        api_client_logged_in.post(reverse("prompt-run", args=[prompt.id + 1]), {"input_text": "hi"}).status_code == 404
+    )
+    res = api_client_logged_in.post(run_url, {"input_text": " "})
+    assert res.status_code == 400 and "X-RunQuota-Remaining" not in res
+    assert api_client_logged_in.post(run_url, {"input_text": "fail"}).status_code == 502
+    res = api_client_logged_in.post(stream_url, {"input_text": "fail"})
+
+    async def collect():
+        return b"".join([chunk async for chunk in res.streaming_content])
+
+    assert b"event: error" in async_to_sync(collect)()
+
+    res = api_client_logged_in.post(batch_url, {"inputs": ["a", "", 1, "fail"]}, format="json")
+    assert [item.get("output") for item in res.data["results"]] == ["a", None, None, None]
+    assert res["X-RunQuota-Remaining"] == "2"
+
+    res = api_client_logged_in.post(batch_url, {"inputs": ["b", "c"]}, format="json")
+    assert res.status_code == 200 and res["X-RunQuota-Remaining"] == "0"
@@ -0,0 +1,98 @@
+import json
+from io import StringIO
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.urls import reverse
+
+from apps.prompts.models import Prompt, PromptLog, Tag, UserTagCount
+from apps.prompts.transfer import import_prompts
+
+User = get_user_model()
+pytestmark = pytest.mark.django_db
+
+
+def ndjson(*records):
+    return "".join(json.dumps(record, ensure_ascii=False) + "\n" for record in records)
+
+
+# 가져오기: 청크 단위 저장, 기존 태그 재사용 + 새 태그 생성, 태그 집계 반영
+def test_import_prompts_in_chunks(user):
+    Tag.objects.create(name="기존")
+    lines = ndjson(
+        {"title": "첫째", "content": "내용1", "tags": ["기존", "새태그"]},
+        {"title": "둘째", "content": "내용2", "is_favorite": True, "tags": ["새태그"]},
+        {"title": "셋째", "content": "내용3"},
+    ).splitlines(keepends=True)
+
+    result = import_prompts(user, lines, chunk_size=2)
+
+    assert (result.created, result.tags_created, result.failed) == (3, 1, 0)
+    prompts = {p.title: p for p in Prompt.objects.filter(user=user).prefetch_related("tags")}
+    assert {t.name for t in prompts["첫째"].tags.all()} == {"기존", "새태그"}
+    assert prompts["둘째"].is_favorite
+    counts = dict(UserTagCount.objects.filter(user=user).values_list("tag__name", "count"))
+    assert counts == {"기존": 1, "새태그": 2}
+
+
+# 조회 후 다른 요청이 같은 태그를 먼저 만든 경우 실제로 만든 태그만 셈
+def test_import_counts_only_created_tags(user):
+    table = connection.ops.quote_name(Tag._meta.db_table)
+    raced = []
+
+    def create_concurrently(execute, sql, params, many, context):
+        if not raced and sql.startswith("INSERT") and f"INTO {table} " in sql:
+            raced.append(True)
+            # 다른 연결에서 커밋된 것처럼 Django 쿼리 래퍼를 거치지 않고 바로 삽입
+            connection.connection.execute(f"INSERT INTO {table} (name) VALUES ('동시')")
+        return execute(sql, params, many, context)
+
+    with connection.execute_wrapper(create_concurrently):
+        result = import_prompts(user, [json.dumps({"title": "t", "content": "c", "tags": ["동시", "새태그"]})])
+
+    assert raced and (result.created, result.tags_created) == (1, 1)
+    assert set(Prompt.objects.get(user=user).tags.values_list("name", flat=True)) == {"동시", "새태그"}
+
+
+# 잘못된 줄은 건너뛰고 줄 번호와 함께 보고
+def test_import_endpoint_reports_invalid_lines(api_client_logged_in, user):
+    body = ndjson({"title": "정상", "content": "본문"}, {"title": ""}) + "not json\n"
+    res = api_client_logged_in.generic("POST", reverse("prompt-import"), body, content_type="application/x-ndjson")
+
+    assert res.status_code == 201
+    assert res.data["created"] == 1
+    assert [error["line"] for error in res.data["errors"]] == [2, 3]
+    assert Prompt.objects.filter(user=user).count() == 1
+
+
+# 내보내기: 프롬프트 줄 + (include=logs) 로그 줄 스트리밍, 가져오기로 되돌릴 수 있음
+def test_export_streams_prompts_and_logs(api_client_logged_in, user):
+    prompt = Prompt.objects.create(user=user, title="내보내기", content="본문")
+    prompt.tags.add(Tag.objects.create(name="export"))
+    PromptLog.objects.create(prompt=prompt, user=user, input_text="in", output_text="out")
+
+    res = api_client_logged_in.get(reverse("prompt-export"), {"include": "logs"})
+    assert res.status_code == 200
+    assert res["Content-Type"] == "application/x-ndjson"
+    records = [json.loads(line) for line in b"".join(res.streaming_content).decode().splitlines()]
+    assert [r["type"] for r in records] == ["prompt", "log"]
+    assert records[0]["tags"] == ["export"]
+    assert records[1]["prompt_id"] == prompt.id
+
+    other = User.objects.create_user(email="other@example.com", username="other", password="pass1234")
+    result = import_prompts(other, [json.dumps(records[0])])
+    assert result.created == 1
+    assert Prompt.objects.get(user=other).tags.get().name == "export"
+
+
+def test_import_prompts_command(user, tmp_path):
+    path = tmp_path / "prompts.ndjson"
+    path.write_text(ndjson({"title": "명령", "content": "본문"}), encoding="utf-8")
+
+    out = StringIO()
+    call_command("import_prompts", str(path), user=user.email, stdout=out)
+
+    assert Prompt.objects.filter(user=user, title="명령").exists()
+    assert "1개" in out.getvalue()
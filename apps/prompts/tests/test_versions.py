@@ -0,0 +1,101 @@
+import random
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+
+from apps.prompts.models import Prompt, PromptLog, PromptVersion, Tag
+from apps.prompts.versions import apply_delta, get_version, make_delta
+
+User = get_user_model()
+pytestmark = pytest.mark.django_db
+
+
+def edit(lines, rng):
+    lines = list(lines)
+    index = rng.randrange(len(lines))
+    action = rng.choice(("change", "insert", "delete"))
+    if action == "change":
+        lines[index] = f"changed {rng.random()}\n"
+    elif action == "insert":
+        lines.insert(index, f"inserted {rng.random()}\n")
+    elif len(lines) > 1:
+        del lines[index]
+    return lines
+
+
+# 차이를 적용하면 새 내용이 되고, 크기는 바뀐 줄 정도
+def test_delta_round_trip():
+    rng = random.Random(0)
+    lines = [f"line {i} 한글 내용\n" for i in range(200)]
+    for _ in range(50):
+        new_lines = edit(lines, rng)
+        old, new = "".join(lines), "".join(new_lines)
+        delta = make_delta(old, new)
+        assert apply_delta(old, delta) == new
+        assert len(delta) < len(new) / 10
+        lines = new_lines
+
+    assert apply_delta("a\nb", make_delta("a\nb", "")) == ""
+    assert apply_delta("", make_delta("", "x\ny")) == "x\ny"
+
+
+# 수정할 때마다 버전이 쌓이고, 어떤 버전이든 쿼리 1번으로 복원 (전체 저장은 간격마다)
+def test_every_revision_is_restorable(api_client_logged_in, user, settings, django_assert_num_queries):
+    settings.PROMPT_VERSION_SNAPSHOT_INTERVAL = 4
+    rng = random.Random(1)
+    lines = [f"step {i}\n" for i in range(30)]
+    res = api_client_logged_in.post(reverse("prompt-list-create"), {"title": "v1", "content": "".join(lines)})
+    prompt_id = res.data["id"]
+    history = {1: ("v1", res.data["content"])}  # 앞뒤 공백은 시리얼라이저가 제거
+
+    for number in range(2, 12):
+        lines = edit(lines, rng)
+        res = api_client_logged_in.patch(
+            reverse("prompt-detail", args=[prompt_id]), {"title": f"v{number}", "content": "".join(lines)}
+        )
+        assert res.data["version"] == number
+        history[number] = (f"v{number}", res.data["content"])
+
+    snapshots = PromptVersion.objects.filter(prompt_id=prompt_id, snapshot__isnull=False)
+    assert sorted(snapshots.values_list("number", flat=True)) == [1, 5, 9]
+    for number, (title, content) in history.items():
+        with django_assert_num_queries(1):
+            version = get_version(prompt_id, number)
+        assert (version["title"], version["content"]) == (title, content)
+    assert get_version(prompt_id, 12) is None
+
+    res = api_client_logged_in.get(reverse("prompt-version-detail", args=[prompt_id, 7]))
+    assert res.status_code == 200 and res.data["content"] == history[7][1]
+    res = api_client_logged_in.get(reverse("prompt-versions", args=[prompt_id]))
+    assert [item["number"] for item in res.data["results"]] == list(range(11, 0, -1))
+
+
+# 실행 로그는 실행 당시 버전을 기록, 태그만 바꾸면 버전이 늘지 않음
+def test_run_logs_reference_version(api_client_logged_in, user):
+    res = api_client_logged_in.post(reverse("prompt-list-create"), {"title": "Run", "content": "first"})
+    prompt_id = res.data["id"]
+    url = reverse("prompt-detail", args=[prompt_id])
+    api_client_logged_in.post(reverse("prompt-run", args=[prompt_id]), {"input_text": "a"})
+    api_client_logged_in.patch(url, {"content": "second"})
+    api_client_logged_in.patch(url, {"tag_ids": [Tag.objects.create(name="only-tags").id]}, format="json")
+    api_client_logged_in.post(reverse("prompt-run", args=[prompt_id]), {"input_text": "b"})
+
+    assert Prompt.objects.get(pk=prompt_id).version == 2
+    logs = PromptLog.objects.order_by("id").values_list("prompt_version", flat=True)
+    assert list(logs) == [1, 2]
+    assert get_version(prompt_id, 1)["content"] == "first"
+
+
+# 이력이 없던 프롬프트는 수정 시 변경 전 내용을 1번 버전으로 남김, 다른 유저의 프롬프트 버전은 404
+def test_unversioned_prompt_keeps_previous_content(api_client_logged_in, user):
+    prompt = Prompt.objects.create(user=user, title="Old", content="legacy")
+    api_client_logged_in.patch(reverse("prompt-detail", args=[prompt.id]), {"content": "new"})
+
+    assert get_version(prompt.id, 1)["content"] == "legacy"
+    assert get_version(prompt.id, 2)["content"] == "new"
+
+    other = User.objects.create_user(email="other@example.com", username="other", password="pass1234")
+    foreign = Prompt.objects.create(user=other, title="Foreign", content="secret")
+    res = api_client_logged_in.get(reverse("prompt-version-detail", args=[foreign.id, 1]))
+    assert res.status_code == 404
@@ -0,0 +1,310 @@
+"""
+프롬프트 실행 요청 제한 (DRF 스로틀)
+
+- 엔드포인트(throttle_scope)별 토큰 버킷: settings.PROMPT_RUN_RATES의 "요청 수/기간"만큼 한 번에 보낼 수 있고,
+  기간 동안 고르게 다시 채워짐. 키마다 "다음 토큰이 비는 시각"(GCRA) 값 하나만 저장
+- 유저별 하루 실행 수(settings.PROMPT_RUN_DAILY_QUOTA), 날짜는 TIME_ZONE 기준
+  스로틀은 한도만 정하고, 실행 뷰가 입력 검증 뒤 실제로 실행할 수만큼 charge_run_quota()로 차감
+  (404 / 400 요청과 잘못된 배치 항목은 차감하지 않고, 실행에 실패해 출력이 없으면 refund_run_quota()로 돌려줌)
+- 유저별 덮어쓰기는 PromptRunLimit, 요청마다 조회하지 않도록 프로세스 내에 PROMPT_RUN_LIMIT_POLICY_TTL 동안 캐시
+- 저장소: local(프로세스 내 dict + 락, 워커별 한도) | cache(CACHES["run_limits"], 워커 간 공유)
+- 초과하면 429 + Retry-After, 응답에는 X-RateLimit-* / X-RunQuota-* 헤더로 남은 양을 표시
+"""
+
+import math
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.exceptions import APIException
+from rest_framework.throttling import BaseThrottle
+
+from apps.common.metrics import metrics
+
+from .models import PromptRunLimit
+
+PERIODS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+SCOPES = ("run", "batch", "stream")
+
+
+class RunLimitExceeded(APIException):
+    status_code = status.HTTP_429_TOO_MANY_REQUESTS
+    default_detail = "실행 요청이 너무 많습니다. 잠시 후 다시 시도해 주세요."
+    default_code = "run_rate_limited"
+
+    def __init__(self, wait, detail=None, code=None):
+        super().__init__(detail, code)
+        self.wait = wait  # DRF가 Retry-After 헤더로 내려줌
+
+
+@lru_cache(maxsize=256)
+def parse_rate(rate):
+    """'60/m' → (60, 60.0). 비어 있으면 None (제한 없음)"""
+    if not rate:
+        return None
+    count, period = rate.split("/")
+    return int(count), float(PERIODS[period[0]])
+
+
+class LocalLimitStore:
+    """프로세스 내 저장소, 한 락 안에서 읽고 갱신하므로 스레드 간에 원자적"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._buckets = {}
+        self._quotas = {}
+        self._quota_day = None
+        self._prune_at = settings.PROMPT_RUN_LIMIT_MAX_KEYS
+
+    def take(self, key, now, interval, period):
+        """토큰 하나를 쓰고 (허용 여부, 다음 토큰이 비는 시각) 반환"""
+        with self._lock:
+            tat = max(self._buckets.get(key, now), now)
+            if tat + interval - now > period:
+                return False, tat
+            self._buckets[key] = tat + interval
+            if len(self._buckets) > self._prune_at:
+                # 다 채워진 버킷은 없는 것과 같으므로 제거 (남은 키가 많으면 다음 정리 시점을 늦춤)
+                self._buckets = {key: value for key, value in self._buckets.items() if value > now}
+                self._prune_at = max(settings.PROMPT_RUN_LIMIT_MAX_KEYS, 2 * len(self._buckets))
+            return True, tat + interval
+
+    def charge(self, key, day, cost, limit):
+        """하루 사용량에 cost를 더하고 (허용 여부, 사용량) 반환. 한도를 넘으면 더하지 않음"""
+        with self._lock:
+            if day != self._quota_day:
+                self._quotas.clear()
+                self._quota_day = day
+            used = self._quotas.get(key, 0)
+            if used + cost > limit:
+                return False, used
+            self._quotas[key] = used + cost
+            return True, used + cost
+
+    def refund(self, key, day, cost):
+        with self._lock:
+            if day == self._quota_day and key in self._quotas:
+                self._quotas[key] = max(self._quotas[key] - cost, 0)
+
+
+class CacheLimitStore:
+    """
+    공유 캐시 저장소
+    - 하루 사용량은 add + incr(원자적)로 차감
+    - 버킷은 get + set이라 같은 키를 동시에 갱신하면 드물게 한도를 조금 넘을 수 있음
+    """
+
+    def take(self, key, now, interval, period):
+        cache = get_limit_cache()
+        tat = max(cache.get(key, now), now)
+        if tat + interval - now > period:
+            return False, tat
+        cache.set(key, tat + interval, math.ceil(tat + interval - now) + 1)
+        return True, tat + interval
+
+    def charge(self, key, day, cost, limit):
+        cache, key = get_limit_cache(), f"{key}:{day}"
+        cache.add(key, 0, 2 * 86400)
+        used = cache.incr(key, cost)
+        if used > limit:
+            cache.decr(key, cost)
+            return False, used - cost
+        return True, used
+
+    def refund(self, key, day, cost):
+        try:
+            get_limit_cache().decr(f"{key}:{day}", cost)
+        except ValueError:  # 날짜가 바뀌어 키가 만료된 경우
+            pass
+
+
+def get_limit_cache():
+    return caches[settings.PROMPT_RUN_LIMIT_CACHE_ALIAS]
+
+
+@lru_cache(maxsize=None)
+def get_limit_store():
+    if settings.PROMPT_RUN_LIMIT_STORE == "cache":
+        return CacheLimitStore()
+    return LocalLimitStore()
+
+
+def load_user_limits(user_id):
+    """유저별 덮어쓰기 {"rates": {scope: rate}, "daily_quota": 값 또는 None} (행이 없으면 빈 값)"""
+    limits = {"rates": {}, "daily_quota": None}
+    row = PromptRunLimit.objects.filter(user_id=user_id).first()
+    if row is not None:
+        limits["rates"] = {scope: getattr(row, f"{scope}_rate") for scope in SCOPES if getattr(row, f"{scope}_rate")}
+        limits["daily_quota"] = row.daily_quota
+    return limits
+
+
+class UserLimitCache:
+    """
+    유저별 덮어쓰기의 프로세스 내 캐시 (PROMPT_RUN_LIMIT_POLICY_TTL 동안 재사용)
+    - 이 프로세스에서 저장 / 삭제하면 signals.py에서 바로 무효화, 다른 프로세스는 TTL 이내에 반영
+    - dict 한 번의 get / set이라 락 없이 사용 (동시에 놓치면 같은 값을 두 번 읽을 뿐)
+    """
+
+    def __init__(self, ttl):
+        self.ttl = ttl
+        self._entries = {}
+
+    def get(self, user_id):
+        now = time.monotonic()
+        entry = self._entries.get(user_id)
+        if entry is not None and entry[0] > now:
+            return entry[1]
+        limits = load_user_limits(user_id)
+        if len(self._entries) >= settings.PROMPT_RUN_LIMIT_MAX_KEYS:
+            self._entries = {}
+        self._entries[user_id] = (now + self.ttl, limits)
+        return limits
+
+    def invalidate(self, user_id):
+        self._entries.pop(user_id, None)
+
+
+@lru_cache(maxsize=None)
+def get_user_limit_cache():
+    return UserLimitCache(settings.PROMPT_RUN_LIMIT_POLICY_TTL)
+
+
+def invalidate_user_limits(user_id):
+    get_user_limit_cache().invalidate(user_id)
+
+
+def reset_run_limits():
+    """저장소와 유저별 덮어쓰기 캐시를 새로 만듦 (설정 변경 / 테스트 간 초기화)"""
+    get_limit_store.cache_clear()
+    get_user_limit_cache.cache_clear()
+
+
+@receiver(setting_changed)
+def reset_on_setting_changed(*, setting, **kwargs):
+    if setting in ("PROMPT_RUN_LIMIT_STORE", "PROMPT_RUN_LIMIT_CACHE_ALIAS", "PROMPT_RUN_LIMIT_POLICY_TTL"):
+        reset_run_limits()
+
+
+def local_moment(timestamp):
+    # 요청별로 활성화된 시간대가 아니라 settings.TIME_ZONE 기준 (get_current_timezone()보다 빠름)
+    return datetime.fromtimestamp(timestamp, tz=timezone.get_default_timezone())
+
+
+def seconds_until_tomorrow(moment):
+    tomorrow = (moment + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
+    return (tomorrow - moment).total_seconds()
+
+
+@dataclass
+class RunLimitState:
+    user_id: int = None
+    rate_limit: int = None
+    rate_remaining: int = None
+    quota_limit: int = None
+    quota_remaining: int = None  # 차감한 뒤에만 값이 있음
+    quota_day: str = None
+
+
+class RunRateThrottle(BaseThrottle):
+    """
+    view.throttle_scope("run" / "batch" / "stream")의 토큰 버킷을 확인하고 하루 실행 수 한도를 정함
+    - 확인 결과는 request.run_limit에 남겨 charge_run_quota()와 RunLimitMixin(응답 헤더)이 씀
+    """
+
+    timer = time.time
+
+    def allow_request(self, request, view):
+        user = request.user
+        if not user or not user.is_authenticated:
+            return True
+
+        started = time.perf_counter()
+        try:
+            return self.check(request, view, user)
+        finally:
+            metrics.observe("run_limit.check", time.perf_counter() - started)
+
+    def check(self, request, view, user):
+        store = get_limit_store()
+        now = self.timer()
+        state = request.run_limit = RunLimitState(user_id=user.pk)
+        self.wait_seconds = None
+
+        limits = get_user_limit_cache().get(user.pk)
+        scope = view.throttle_scope
+        parsed = parse_rate(limits["rates"].get(scope) or settings.PROMPT_RUN_RATES.get(scope))
+        if parsed is not None:
+            count, period = parsed
+            interval = period / count
+            # 한도가 바뀌면 새 버킷에서 시작
+            allowed, tat = store.take(f"run-rate:{scope}:{user.pk}:{count}/{period:g}", now, interval, period)
+            state.rate_limit = count
+            state.rate_remaining = max(int((period - (tat - now)) / interval), 0)
+            if not allowed:
+                metrics.incr("run_limit.rejected.rate")
+                self.wait_seconds = tat + interval - period - now
+                return False
+
+        quota = limits["daily_quota"]
+        if quota is None:
+            quota = settings.PROMPT_RUN_DAILY_QUOTA
+        state.quota_limit = quota or None
+        return True
+
+    def wait(self):
+        return self.wait_seconds
+
+
+def charge_run_quota(request, cost):
+    """검증을 통과해 실행할 cost회를 하루 실행 수에서 차감, 한도를 넘으면 차감하지 않고 RunLimitExceeded(429)"""
+    state = getattr(request, "run_limit", None)
+    if state is None or state.quota_limit is None or cost <= 0:
+        return
+    moment = local_moment(RunRateThrottle.timer())
+    state.quota_day = moment.date().isoformat()
+    allowed, used = get_limit_store().charge(f"run-quota:{state.user_id}", state.quota_day, cost, state.quota_limit)
+    state.quota_remaining = state.quota_limit - used
+    if not allowed:
+        metrics.incr("run_limit.rejected.quota")
+        wait = math.ceil(seconds_until_tomorrow(moment))
+        raise RunLimitExceeded(wait, "오늘 실행 가능한 횟수를 모두 사용했습니다.", "run_quota_exceeded")
+
+
+def refund_run_quota(request, cost):
+    """charge_run_quota()로 차감한 것 중 실행에 실패한 cost회를 돌려줌 (차감한 날짜의 사용량에서)"""
+    state = getattr(request, "run_limit", None)
+    if state is None or state.quota_day is None or cost <= 0:
+        return
+    get_limit_store().refund(f"run-quota:{state.user_id}", state.quota_day, cost)
+    state.quota_remaining = min(state.quota_remaining + cost, state.quota_limit)
+    metrics.incr("run_limit.refunded", cost)
+
+
+class RunLimitMixin:
+    """실행 뷰에 RunRateThrottle을 적용하고 남은 요청 수 / 실행 수를 응답 헤더로 표시 (뷰마다 throttle_scope 지정)"""
+
+    throttle_classes = [RunRateThrottle]
+
+    def throttled(self, request, wait):
+        raise RunLimitExceeded(math.ceil(wait) if wait is not None else None)  # Retry-After는 정수 초
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        state = getattr(request, "run_limit", None)
+        if state is not None:
+            if state.rate_limit is not None:
+                response["X-RateLimit-Limit"] = state.rate_limit
+                response["X-RateLimit-Remaining"] = state.rate_remaining
+            if state.quota_remaining is not None:
+                response["X-RunQuota-Limit"] = state.quota_limit
+                response["X-RunQuota-Remaining"] = state.quota_remaining
+        return response
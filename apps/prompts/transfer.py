@@ -0,0 +1,214 @@
+"""
+프롬프트 NDJSON 가져오기 / 내보내기
+
+가져오기: 한 줄에 프롬프트 하나
+    {"title": "...", "content": "...", "is_public": false, "is_favorite": false, "is_template": false, "tags": ["a", "b"]}
+- IMPORT_CHUNK_SIZE 줄마다 트랜잭션 하나로 태그 일괄 조회/생성 + Prompt/태그 연결 bulk_create (+ 목록 버전 갱신)
+- 잘못된 줄은 건너뛰고 줄 번호와 사유를 보고 (앞선 청크는 이미 커밋됨)
+
+내보내기: {"type": "prompt", ...} 줄 뒤에 (선택) {"type": "log", ...} 줄을 .iterator()로 읽어 스트리밍
+"""
+
+import json
+from collections import Counter
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection, transaction
+from django.db.models import F
+
+from .models import Prompt, PromptLog, PromptVersion, Tag
+from .signals import apply_tag_count_deltas, bump_prompt_list_versions
+from .versions import build_version
+
+IMPORT_CHUNK_SIZE = 1000
+EXPORT_CHUNK_SIZE = 2000
+MAX_REPORTED_ERRORS = 100
+
+TITLE_MAX_LENGTH = Prompt._meta.get_field("title").max_length
+TAG_MAX_LENGTH = Tag._meta.get_field("name").max_length
+
+
+class ImportResult:
+    def __init__(self):
+        self.created = 0
+        self.tags_created = 0
+        self.failed = 0
+        self.errors = []
+
+    def add_error(self, line_number, message):
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"line": line_number, "message": message})
+
+    def as_dict(self):
+        return {
+            "created": self.created,
+            "tags_created": self.tags_created,
+            "failed": self.failed,
+            "errors": self.errors,
+        }
+
+
+def parse_prompt_line(raw_line):
+    """NDJSON 한 줄을 (필드 dict, 태그 이름 목록)으로 변환, 형식이 틀리면 ValueError"""
+    try:
+        data = json.loads(raw_line)
+    except json.JSONDecodeError:
+        raise ValueError("JSON 형식이 아닙니다.")
+    if not isinstance(data, dict):
+        raise ValueError("한 줄은 JSON 객체여야 합니다.")
+    if data.get("type", "prompt") != "prompt":
+        raise ValueError("프롬프트 줄만 가져올 수 있습니다.")
+
+    title, content = data.get("title"), data.get("content")
+    if not isinstance(title, str) or not title.strip() or len(title) > TITLE_MAX_LENGTH:
+        raise ValueError(f"title은 1~{TITLE_MAX_LENGTH}자 문자열이어야 합니다.")
+    if not isinstance(content, str) or not content:
+        raise ValueError("content는 비어 있지 않은 문자열이어야 합니다.")
+
+    tags = data.get("tags", [])
+    if not isinstance(tags, list) or not all(
+        isinstance(name, str) and 0 < len(name) <= TAG_MAX_LENGTH for name in tags
+    ):
+        raise ValueError(f"tags는 1~{TAG_MAX_LENGTH}자 문자열 목록이어야 합니다.")
+
+    fields = {"title": title, "content": content}
+    for flag in ("is_public", "is_favorite", "is_template"):
+        value = data.get(flag, False)
+        if not isinstance(value, bool):
+            raise ValueError(f"{flag}는 true/false여야 합니다.")
+        fields[flag] = value
+    return fields, list(dict.fromkeys(tags))
+
+
+def import_prompts(user, lines, chunk_size=IMPORT_CHUNK_SIZE):
+    """NDJSON 줄(bytes 또는 str) 이터러블을 읽어 청크 단위로 저장, ImportResult 반환"""
+    result = ImportResult()
+    chunk = []
+
+    for line_number, raw_line in enumerate(lines, start=1):
+        if isinstance(raw_line, bytes):
+            raw_line = raw_line.decode("utf-8", errors="replace")
+        if not raw_line.strip():
+            continue
+        try:
+            chunk.append(parse_prompt_line(raw_line))
+        except ValueError as e:
+            result.add_error(line_number, str(e))
+            continue
+
+        if len(chunk) >= chunk_size:
+            _import_chunk(user, chunk, result)
+            chunk = []
+
+    if chunk:
+        _import_chunk(user, chunk, result)
+    return result
+
+
+def _import_chunk(user, rows, result):
+    tag_names = {name for _, names in rows for name in names}
+
+    with transaction.atomic():
+        tag_ids = dict(Tag.objects.filter(name__in=tag_names).values_list("name", "id"))
+        missing = tag_names - tag_ids.keys()
+        if missing:
+            result.tags_created += _create_missing_tags(missing)
+            # ignore_conflicts 사용 시 PK가 채워지지 않으므로 다시 조회
+            tag_ids.update(Tag.objects.filter(name__in=missing).values_list("name", "id"))
+
+        prompts = [Prompt(user=user, version=1, **fields) for fields, _ in rows]
+        _bulk_create_with_pks(user, prompts)
+        PromptVersion.objects.bulk_create(
+            [build_version(prompt.pk, 1, prompt.title, prompt.content) for prompt in prompts],
+            batch_size=IMPORT_CHUNK_SIZE,
+        )
+
+        Through = Prompt.tags.through
+        links = [
+            Through(prompt_id=prompt.pk, tag_id=tag_ids[name])
+            for prompt, (_, names) in zip(prompts, rows)
+            for name in names
+        ]
+        Through.objects.bulk_create(links, batch_size=IMPORT_CHUNK_SIZE)
+        # through 모델 bulk_create는 m2m_changed를 보내지 않으므로 태그 집계를 직접 반영
+        apply_tag_count_deltas(Counter((user.pk, link.tag_id) for link in links))
+        bump_prompt_list_versions([user.pk])
+
+    result.created += len(prompts)
+
+
+def _create_missing_tags(names):
+    """
+    없는 태그를 만들고 실제로 만든 수를 반환
+    - 동시에 다른 요청이 먼저 만든 태그는 충돌로 건너뛰므로, INSERT가 보고한 행 수로 셈
+    """
+    created = 0
+
+    def count_inserted(execute, sql, params, many, context):
+        nonlocal created
+        result = execute(sql, params, many, context)
+        created += max(context["cursor"].rowcount, 0)
+        return result
+
+    with connection.execute_wrapper(count_inserted):
+        Tag.objects.bulk_create([Tag(name=name) for name in names], ignore_conflicts=True)
+    return created
+
+
+def _bulk_create_with_pks(user, prompts):
+    if connection.features.can_return_rows_from_bulk_insert:
+        Prompt.objects.bulk_create(prompts)
+        return
+
+    # MySQL은 bulk_create 후 PK를 돌려주지 않음. INSERT 한 번에 넣은 행은 연속된 auto increment 값을 받으므로
+    # (행 수를 미리 아는 simple insert) LAST_INSERT_ID()(첫 행의 id)와 증가폭으로 PK를 채움
+    Prompt.objects.bulk_create(prompts, batch_size=len(prompts))
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT LAST_INSERT_ID(), @@auto_increment_increment")
+        first_id, step = cursor.fetchone()
+    for index, prompt in enumerate(prompts):
+        prompt.pk = first_id + index * step
+
+
+def to_ndjson(record):
+    return json.dumps(record, ensure_ascii=False, cls=DjangoJSONEncoder) + "\n"
+
+
+def export_lines(user, include_logs=False):
+    """유저의 프롬프트(+로그)를 NDJSON 줄로 하나씩 생성 (청크 단위로 읽어 메모리 사용량 일정)"""
+    prompts = Prompt.objects.filter(user=user).order_by("id").prefetch_related("tags")
+    for prompt in prompts.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+        yield to_ndjson(
+            {
+                "type": "prompt",
+                "id": prompt.id,
+                "title": prompt.title,
+                "content": prompt.content,
+                "is_public": prompt.is_public,
+                "is_favorite": prompt.is_favorite,
+                "is_template": prompt.is_template,
+                "tags": [tag.name for tag in prompt.tags.all()],
+                "version": prompt.version,
+                "created_at": prompt.created_at,
+            }
+        )
+
+    if not include_logs:
+        return
+    logs = (
+        PromptLog.objects.filter(user=user)
+        .order_by("id")
+        .values(
+            "id",
+            "prompt_id",
+            "prompt_version",
+            "is_partial",
+            "is_cached",
+            "created_at",
+            input_text=F("input_blob__text"),
+            output_text=F("output_blob__text"),
+        )
+    )
+    for log in logs.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+        yield to_ndjson({"type": "log", **log})
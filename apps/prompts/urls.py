@@ -2,15 +2,39 @@
 from django.urls import path
 
 from .views import (
+    PromptExportView,
+    PromptImportView,
     PromptListCreateView,
+    PromptLogArchiveListView,
+    PromptLogArchiveRowsView,
     PromptLogListView,
     PromptRetrieveUpdateDestroyView,
+    PromptRunStatsView,
+    PromptSearchView,
+    PromptVersionDetailView,
+    PromptVersionListView,
+    RunPromptBatchView,
+    RunPromptStreamView,
     RunPromptView,
+    RunStatsView,
+    TagFacetView,
 )
 
 urlpatterns = [
     path("", PromptListCreateView.as_view(), name="prompt-list-create"),
     path("<int:pk>/", PromptRetrieveUpdateDestroyView.as_view(), name="prompt-detail"),
     path("<int:pk>/run/", RunPromptView.as_view(), name="prompt-run"),
+    path("<int:pk>/run/batch/", RunPromptBatchView.as_view(), name="prompt-run-batch"),
+    path("<int:pk>/run/stream/", RunPromptStreamView.as_view(), name="prompt-run-stream"),
+    path("<int:pk>/versions/", PromptVersionListView.as_view(), name="prompt-versions"),
+    path("<int:pk>/versions/<int:number>/", PromptVersionDetailView.as_view(), name="prompt-version-detail"),
+    path("<int:pk>/stats/", PromptRunStatsView.as_view(), name="prompt-run-stats"),
     path("logs/", PromptLogListView.as_view(), name="prompt-logs"),
+    path("logs/archive/", PromptLogArchiveListView.as_view(), name="prompt-log-archives"),
+    path("logs/archive/rows/", PromptLogArchiveRowsView.as_view(), name="prompt-log-archive-rows"),
+    path("search/", PromptSearchView.as_view(), name="prompt-search"),
+    path("tags/", TagFacetView.as_view(), name="prompt-tag-facets"),
+    path("stats/", RunStatsView.as_view(), name="run-stats"),
+    path("import/", PromptImportView.as_view(), name="prompt-import"),
+    path("export/", PromptExportView.as_view(), name="prompt-export"),
 ]
@@ -0,0 +1,96 @@
+"""
+프롬프트 버전 이력
+
+- 제목이나 내용이 바뀔 때마다 PromptVersion을 하나 추가하고 Prompt.version을 그 번호로 바꿈
+- 내용은 PROMPT_VERSION_SNAPSHOT_INTERVAL 간격(1, 1 + N, 1 + 2N, ...)으로 전체를 저장하고,
+  나머지 버전은 직전 버전과의 줄 단위 차이만 저장 (차이가 내용보다 크면 전체 저장)
+- 복원은 가장 가까운 이전 전체 저장 버전부터 차이를 차례로 적용 (쿼리 1번, 최대 N - 1번 적용)
+- 실행 로그(PromptLog.prompt_version)는 실행 당시의 버전 번호를 기록
+"""
+
+import json
+from difflib import SequenceMatcher
+
+from django.conf import settings
+from django.db.models import OuterRef, Subquery
+
+from .models import PromptVersion
+
+
+def make_delta(old, new):
+    """
+    old → new 줄 단위 차이 (JSON 문자열)
+    - [시작, 끝]: old의 해당 줄 구간을 그대로 사용, 문자열: 새로 들어간 내용
+    """
+    old_lines, new_lines = old.splitlines(keepends=True), new.splitlines(keepends=True)
+    ops = []
+    for tag, i1, i2, j1, j2 in SequenceMatcher(None, old_lines, new_lines, autojunk=False).get_opcodes():
+        if tag == "equal":
+            ops.append([i1, i2])
+        elif j2 > j1:
+            ops.append("".join(new_lines[j1:j2]))
+    return json.dumps(ops, ensure_ascii=False, separators=(",", ":"))
+
+
+def apply_delta(old, delta):
+    old_lines = old.splitlines(keepends=True)
+    return "".join("".join(old_lines[op[0] : op[1]]) if isinstance(op, list) else op for op in json.loads(delta))
+
+
+def _is_snapshot_number(number):
+    return (number - 1) % settings.PROMPT_VERSION_SNAPSHOT_INTERVAL == 0
+
+
+def build_version(prompt_id, number, title, content, previous_content=None):
+    """저장할 PromptVersion 객체 (직전 내용이 없거나 전체 저장 순서면 전체, 아니면 차이)"""
+    version = PromptVersion(prompt_id=prompt_id, number=number, title=title)
+    if previous_content is not None and not _is_snapshot_number(number):
+        delta = make_delta(previous_content, content)
+        if len(delta) < len(content):
+            version.delta = delta
+            return version
+    version.snapshot = content
+    return version
+
+
+def record_revision(prompt, previous):
+    """
+    prompt의 제목 / 내용이 previous(잠근 상태로 읽은 (title, content, version))와 다르면 새 버전을 추가
+    - prompt.version을 새 번호로 바꾸며, prompt 저장은 호출부에서 수행
+    - 이력이 없던 프롬프트는 변경 전 내용을 1번 버전으로 먼저 남김
+    """
+    old_title, old_content, number = previous
+    old_content = str(old_content)
+    if (prompt.title, prompt.content) == (old_title, old_content):
+        return None
+
+    versions = []
+    if number == 0:
+        number = 1
+        versions.append(build_version(prompt.pk, number, old_title, old_content))
+    versions.append(build_version(prompt.pk, number + 1, prompt.title, prompt.content, old_content))
+    PromptVersion.objects.bulk_create(versions)
+    prompt.version = number + 1
+    return versions[-1]
+
+
+def get_version(prompt_id, number):
+    """number 버전의 {"number", "title", "content", "created_at"}, 없으면 None"""
+    latest_snapshot = (
+        PromptVersion.objects.filter(prompt_id=OuterRef("prompt_id"), number__lte=number, snapshot__isnull=False)
+        .order_by("-number")
+        .values("number")[:1]
+    )
+    chain = list(
+        PromptVersion.objects.filter(prompt_id=prompt_id, number__lte=number, number__gte=Subquery(latest_snapshot))
+        .order_by("number")
+        .values_list("number", "title", "snapshot", "delta", "created_at")
+    )
+    if not chain or chain[-1][0] != number:
+        return None
+
+    content = None
+    for _, _, snapshot, delta, _ in chain:
+        content = str(snapshot) if snapshot is not None else apply_delta(content, delta)
+    _, title, _, _, created_at = chain[-1]
+    return {"number": number, "title": title, "content": content, "created_at": created_at}
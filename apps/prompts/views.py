@@ -1,15 +1,109 @@
+import asyncio
+import json
+from contextlib import aclosing
+from dataclasses import replace
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import Exists, OuterRef
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
 from rest_framework import generics, permissions, status
 from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
 from rest_framework.views import APIView
 
-from .models import Prompt, PromptLog
-from .serializers import PromptLogSerializer, PromptSerializer
+from apps.common.asgi import client_disconnected
+from apps.common.conditional import (
+    check_preconditions,
+    has_validators,
+    is_not_modified,
+    make_etag,
+    not_modified,
+    set_validators,
+)
+from apps.common.db import ReplicaReadMixin
+from apps.common.views import AsyncAPIView
+
+from .archive import iter_archived_range
+from .backends import ExecutionError, RunRequest, get_backend
+from .history import asave_run_logs
+from .listing import prompt_rows, render_prompt_rows, requested_fields
+from .models import (
+    Prompt,
+    PromptLog,
+    PromptLogArchive,
+    PromptRunDay,
+    PromptVersion,
+    UserRunStats,
+    UserTagCount,
+)
+from .result_cache import (
+    aget_cached_output,
+    amake_result_key,
+    aset_cached_output,
+    invalidate_prompt_results,
+    run_with_cache,
+)
+from .search import search_logs, search_prompts
+from .serializers import (
+    PromptLogArchiveSerializer,
+    PromptLogSerializer,
+    PromptSerializer,
+    PromptVersionSerializer,
+)
+from .stats import RUN_STATS_MAX_DAYS, daily_runs
+from .templating import TemplateVariableError, invalidate_template
+from .throttling import RunLimitMixin, charge_run_quota, refund_run_quota
+from .transfer import export_lines, import_prompts, to_ndjson
+from .versions import get_version
+
+
+def prompt_list_validators(request):
+    """
+    (ETag, Last-Modified): 유저의 목록 버전 + 쿼리스트링(필터 / 커서)으로 계산, 목록은 읽지 않음
+    - 목록 행에도 run_count / last_run_at이 있으므로 유저 누적 실행 통계(UserRunStats)를 ETag variant에 반영
+    - 두 값은 유저 행 기준 LEFT JOIN 한 번으로 읽음
+    """
+    version, changed_at, run_count, last_run_at = (
+        get_user_model()
+        .objects.filter(pk=request.user.pk)
+        .values_list(
+            "prompt_list_version__version",
+            "prompt_list_version__changed_at",
+            "run_stats__run_count",
+            "run_stats__last_run_at",
+        )
+        .first()
+    ) or (None, None, None, None)
+    etag = make_etag(
+        "prompts", request.user.pk, version or 0, request.get_full_path(), variant=(run_count or 0, last_run_at)
+    )
+    last_modified = max(filter(None, (changed_at, last_run_at)), default=None)
+    return etag, last_modified
+
+
+def prompt_validators(prompt_id, updated_at, version, run_count, last_run_at):
+    """
+    상세 응답의 (ETag, Last-Modified)
+    - 실행 통계(run_count / last_run_at)도 응답에 있으므로 조회용 ETag / Last-Modified에 반영
+    - 통계는 ETag의 variant라 If-Match는 수정 시각 / 버전만 비교 (실행만으로 수정이 412가 되지 않음)
+    """
+    last_modified = max(updated_at, last_run_at) if last_run_at else updated_at
+    return make_etag("prompt", prompt_id, updated_at.isoformat(), version, variant=(run_count,)), last_modified
 
 
-class PromptListCreateView(generics.ListCreateAPIView):
+class PromptListCreateView(ReplicaReadMixin, generics.ListCreateAPIView):
     """
     - GET: 로그인 유저의 프롬프트 목록 조회
+      (?tags=a,b 태그 이름 필터, ?tag_match=any(기본값)|all)
+      (?fields=id,title,... 필요한 필드만, ?view=summary content 제외, 목록은 .values() 행으로 응답 - listing.py)
+      목록 버전으로 만든 ETag / Last-Modified를 내려주고, 변경이 없으면 목록을 조회하지 않고 304
+      (실행하면 유저 누적 실행 통계가 바뀌어 ETag도 바뀜)
     - POST: 프롬프트 생성
     """
 
@@ -17,57 +111,520 @@ class PromptListCreateView(generics.ListCreateAPIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def get_queryset(self):
-        return Prompt.objects.filter(user=self.request.user)
+        queryset = Prompt.objects.filter(user=self.request.user).prefetch_related("tags")
+
+        tag_names = {name.strip() for name in self.request.query_params.get("tags", "").split(",") if name.strip()}
+        if not tag_names:
+            return queryset
+
+        # JOIN + DISTINCT 대신 EXISTS 서브쿼리로 필터링해 커서 정렬을 그대로 유지
+        tag_links = Prompt.tags.through.objects.filter(prompt_id=OuterRef("pk"))
+        if self.request.query_params.get("tag_match") == "all":
+            for name in tag_names:
+                queryset = queryset.filter(Exists(tag_links.filter(tag__name=name)))
+            return queryset
+        return queryset.filter(Exists(tag_links.filter(tag__name__in=tag_names)))
+
+    def list(self, request, *args, **kwargs):
+        etag, last_modified = prompt_list_validators(request)
+        if is_not_modified(request, etag, last_modified):
+            return not_modified(etag, last_modified)
+
+        fields = requested_fields(request.query_params)
+        rows = prompt_rows(self.filter_queryset(self.get_queryset()), fields)
+        page = self.paginate_queryset(rows)
+        if page is None:
+            response = Response(render_prompt_rows(list(rows), fields))
+        else:
+            response = self.get_paginated_response(render_prompt_rows(page, fields))
+        return set_validators(response, etag, last_modified)
 
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
 
 
-class PromptRetrieveUpdateDestroyView(generics.RetrieveUpdateDestroyAPIView):
+class PromptRetrieveUpdateDestroyView(ReplicaReadMixin, generics.RetrieveUpdateDestroyAPIView):
     """
-    - GET: 프롬프트 상세 조회
+    - GET: 프롬프트 상세 조회 (ETag / Last-Modified, 변경이 없으면 수정 시각과 실행 통계만 조회하고 304)
     - PUT/PATCH: 수정
     - DELETE: 삭제
+    - 수정 / 삭제에 If-Match(또는 If-Unmodified-Since)를 보내면 그 사이 변경된 경우 412
+      (조건 확인부터 저장 / 삭제까지 한 트랜잭션에서 행을 잠근 채 처리해 같은 ETag로 동시에 통과하지 못함)
     """
 
     serializer_class = PromptSerializer
     permission_classes = [permissions.IsAuthenticated]
 
     def get_queryset(self):
-        return Prompt.objects.filter(user=self.request.user)
+        queryset = Prompt.objects.filter(user=self.request.user).prefetch_related("tags")
+        if self.request.method not in permissions.SAFE_METHODS:
+            queryset = queryset.select_for_update()
+        return queryset
+
+    def get_object(self):
+        prompt = super().get_object()
+        if self.request.method not in permissions.SAFE_METHODS:
+            # If-Unmodified-Since도 실행 시각이 아닌 수정 시각과 비교
+            etag, _ = self.validators(prompt)
+            check_preconditions(self.request, etag, prompt.updated_at)
+        return prompt
+
+    @staticmethod
+    def validators(prompt):
+        return prompt_validators(prompt.pk, prompt.updated_at, prompt.version, prompt.run_count, prompt.last_run_at)
+
+    def retrieve(self, request, *args, **kwargs):
+        if has_validators(request):
+            state = (
+                Prompt.objects.filter(user=request.user, pk=kwargs["pk"])
+                .values_list("updated_at", "version", "run_count", "last_run_at")
+                .first()
+            )
+            if state is not None and is_not_modified(request, *prompt_validators(kwargs["pk"], *state)):
+                return not_modified(*prompt_validators(kwargs["pk"], *state))
+
+        prompt = self.get_object()
+        response = Response(self.get_serializer(prompt).data)
+        return set_validators(response, *self.validators(prompt))
+
+    def update(self, request, *args, **kwargs):
+        with transaction.atomic():
+            response = super().update(request, *args, **kwargs)
+        # 캐시는 커밋 뒤에 비워야 그 사이 다른 요청이 이전 내용을 다시 캐시하지 않음
+        self.invalidate_caches(self.updated_prompt.pk)
+        return set_validators(response, *self.validators(self.updated_prompt))
+
+    def perform_update(self, serializer):
+        super().perform_update(serializer)
+        self.updated_prompt = serializer.instance
+
+    def destroy(self, request, *args, **kwargs):
+        prompt_id = kwargs["pk"]
+        with transaction.atomic():
+            response = super().destroy(request, *args, **kwargs)
+        self.invalidate_caches(prompt_id)
+        return response
+
+    @staticmethod
+    def invalidate_caches(prompt_id):
+        invalidate_prompt_results(prompt_id)
+        invalidate_template(prompt_id)
+
+
+class PromptVersionListView(ReplicaReadMixin, generics.ListAPIView):
+    """
+    - GET: 프롬프트의 버전 목록 (번호, 제목, 저장 시각, 최신순)
+    """
+
+    serializer_class = PromptVersionSerializer
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get_queryset(self):
+        prompt = get_object_or_404(Prompt.objects.filter(user=self.request.user).only("id"), pk=self.kwargs["pk"])
+        return PromptVersion.objects.filter(prompt=prompt).only("number", "title", "created_at")
+
+
+class PromptVersionDetailView(ReplicaReadMixin, APIView):
+    """
+    - GET: 특정 버전의 제목 / 내용 (가장 가까운 전체 저장 버전부터 차이를 적용해 복원)
+    """
+
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request, pk, number):
+        get_object_or_404(Prompt.objects.filter(user=request.user).only("id"), pk=pk)
+        version = get_version(pk, number)
+        if version is None:
+            return Response({"message": "존재하지 않는 버전입니다."}, status=404)
+        return Response(version, status=200)
 
 
-class RunPromptView(APIView):
+class RunPromptView(RunLimitMixin, AsyncAPIView):
     """
-    - POST: 프롬프트 실행(Mock) + 로그 저장
+    - POST: 프롬프트 실행 + 로그 저장 (JSON: {"input_text": ..., "variables": {...}})
+    - is_template 프롬프트 내용의 {{변수}}는 variables로 채움 (누락 / 알 수 없는 변수는 400, templating.py)
+    - 실행은 settings.PROMPT_EXECUTION 의 백엔드가 비동기로 처리 (기본값: Mock)
+    - 유저별 요청 제한 / 하루 실행 수를 넘으면 429 (throttling.py, 실행 수는 검증 뒤 차감하고 실행에 실패하면 돌려줌)
     """
 
     permission_classes = [permissions.IsAuthenticated]
+    throttle_scope = "run"
 
-    def post(self, request, pk):
-        prompt = get_object_or_404(Prompt, pk=pk, user=request.user)
+    async def post(self, request, pk):
+        prompt = await sync_to_async(get_object_or_404)(Prompt, pk=pk, user=request.user)
         input_text = request.data.get("input_text", "").strip()
 
         if not input_text:
             return Response({"message": "input_text는 필수이며 빈 문자열일 수 없습니다."}, status=400)
+        try:
+            run_request = RunRequest.from_prompt(prompt, input_text, request.data.get("variables"))
+        except TemplateVariableError as e:
+            return Response({"message": str(e)}, status=400)
+
+        await sync_to_async(charge_run_quota)(request, 1)
+        try:
+            output_text, is_cached = await run_with_cache(get_backend(), prompt.pk, run_request)
+        except ExecutionError:
+            await sync_to_async(refund_run_quota)(request, 1)
+            return Response({"message": "프롬프트 실행에 실패했습니다."}, status=502)
+
+        log = PromptLog(
+            prompt=prompt,
+            user=request.user,
+            prompt_version=prompt.version or None,
+            input_text=input_text,
+            output_text=output_text,
+            is_cached=is_cached,
+        )
+        try:
+            await asave_run_logs([log])
+        except Exception:
+            return Response({"message": "프롬프트 실행 이력을 저장하지 못했습니다."}, status=500)
+
+        return Response({"output": output_text, "cached": is_cached}, status=200)
+
+
+class RunPromptBatchView(RunLimitMixin, AsyncAPIView):
+    """
+    - POST: 하나의 프롬프트에 여러 input_text를 동시 실행 (JSON: {"inputs": [...], "variables": {...}})
+    - variables는 모든 입력에 같이 적용
+    - 동시 실행 수는 PROMPT_BATCH_CONCURRENCY 로 제한, 결과는 입력 순서대로 반환
+    - 항목별 실패는 error로 표시하고, 성공한 실행 로그는 bulk_create 한 번으로 저장
+    - 하루 실행 수는 실행할 항목 수만큼 차감 (빈 입력은 제외, 실행에 실패한 항목은 돌려줌)
+    """
+
+    permission_classes = [permissions.IsAuthenticated]
+    throttle_scope = "batch"
+
+    async def post(self, request, pk):
+        prompt = await sync_to_async(get_object_or_404)(Prompt, pk=pk, user=request.user)
+        inputs = request.data.get("inputs")
+
+        if not isinstance(inputs, list) or not inputs:
+            return Response({"message": "inputs는 비어 있지 않은 목록이어야 합니다."}, status=400)
+        if len(inputs) > settings.PROMPT_BATCH_MAX_INPUTS:
+            return Response(
+                {"message": f"inputs는 최대 {settings.PROMPT_BATCH_MAX_INPUTS}개까지 실행할 수 있습니다."}, status=400
+            )
+        try:
+            # 템플릿 렌더링은 한 번만 하고 입력만 바꿔 실행
+            base_request = RunRequest.from_prompt(prompt, "", request.data.get("variables"))
+        except TemplateVariableError as e:
+            return Response({"message": str(e)}, status=400)
+
+        input_texts = [raw_input.strip() if isinstance(raw_input, str) else "" for raw_input in inputs]
+        await sync_to_async(charge_run_quota)(request, sum(1 for input_text in input_texts if input_text))
 
-        output_text = f"[MOCK RESPONSE] '{prompt.title}' → '{input_text}'"
+        backend = get_backend()
+        semaphore = asyncio.Semaphore(settings.PROMPT_BATCH_CONCURRENCY)
+        failed = 0
+
+        async def run_one(index, input_text):
+            nonlocal failed
+            if not input_text:
+                return {"index": index, "error": "input_text는 필수이며 빈 문자열일 수 없습니다."}, None
+
+            async with semaphore:
+                try:
+                    output_text, is_cached = await run_with_cache(
+                        backend, prompt.pk, replace(base_request, input_text=input_text)
+                    )
+                except ExecutionError:
+                    failed += 1
+                    return {"index": index, "error": "프롬프트 실행에 실패했습니다."}, None
+
+            log = PromptLog(
+                prompt=prompt,
+                user=request.user,
+                prompt_version=prompt.version or None,
+                input_text=input_text,
+                output_text=output_text,
+                is_cached=is_cached,
+            )
+            return {"index": index, "output": output_text, "cached": is_cached}, log
+
+        outcomes = await asyncio.gather(*(run_one(index, input_text) for index, input_text in enumerate(input_texts)))
+        if failed:
+            await sync_to_async(refund_run_quota)(request, failed)
 
         try:
-            PromptLog.objects.create(prompt=prompt, user=request.user, input_text=input_text, output_text=output_text)
+            await asave_run_logs([log for _, log in outcomes if log is not None])
         except Exception:
             return Response({"message": "프롬프트 실행 이력을 저장하지 못했습니다."}, status=500)
 
-        return Response({"output": output_text}, status=200)
+        return Response({"results": [result for result, _ in outcomes]}, status=200)
 
 
-class PromptLogListView(generics.ListAPIView):
+class RunPromptStreamView(RunLimitMixin, AsyncAPIView):
     """
-    - GET: 유저의 프롬프트 실행 이력 조회
+    - POST: 프롬프트 실행 결과를 Server-Sent Events로 스트리밍
+    - token 이벤트로 생성된 조각을 즉시 전송하고, 완료 시 로그를 한 번 저장한 뒤 done 이벤트 전송
+    - 클라이언트 연결이 끊기면(apps.common.asgi가 알려줌) 백엔드 스트림을 닫고 그때까지의 출력을 is_partial=True 로그로 저장
+    - done 이벤트: {"log_id": ...} (PROMPT_LOG_WRITE_MODE=buffered이면 로그가 아직 저장되지 않아 빈 객체)
+    """
+
+    permission_classes = [permissions.IsAuthenticated]
+    throttle_scope = "stream"
+
+    async def post(self, request, pk):
+        prompt = await sync_to_async(get_object_or_404)(Prompt, pk=pk, user=request.user)
+        input_text = request.data.get("input_text", "").strip()
+
+        if not input_text:
+            return Response({"message": "input_text는 필수이며 빈 문자열일 수 없습니다."}, status=400)
+        try:
+            run_request = RunRequest.from_prompt(prompt, input_text, request.data.get("variables"))
+        except TemplateVariableError as e:
+            return Response({"message": str(e)}, status=400)
+
+        await sync_to_async(charge_run_quota)(request, 1)
+        response = StreamingHttpResponse(
+            self.stream_events(prompt, request.user, run_request, request), content_type="text/event-stream"
+        )
+        response["Cache-Control"] = "no-cache"
+        response["X-Accel-Buffering"] = "no"
+        return response
+
+    async def stream_events(self, prompt, user, run_request, request=None):
+        # 로그용 출력은 PROMPT_STREAM_LOG_MAX_CHARS 까지만 보관해 스트림당 메모리를 제한
+        limit = settings.PROMPT_STREAM_LOG_MAX_CHARS
+        chunks, kept = [], 0
+        completed = failed = aborted = False
+
+        backend = get_backend()
+        cache_key = await amake_result_key(prompt.pk, run_request, backend)
+        cached_output = await aget_cached_output(cache_key)
+
+        try:
+            if cached_output is not None:
+                chunks.append(cached_output[:limit])
+                yield self.format_event("token", {"text": cached_output})
+            else:
+                async with aclosing(backend.stream(run_request)) as tokens:
+                    async for token in tokens:
+                        # 끊긴 뒤 보낸 이벤트는 서버가 버리므로 더 생성하지 않고 중단
+                        if client_disconnected(request):
+                            aborted = True
+                            break
+                        if kept < limit:
+                            chunks.append(token[: limit - kept])
+                            kept += len(chunks[-1])
+                        yield self.format_event("token", {"text": token})
+                # 출력 전체를 보관한 경우에만 캐시에 저장
+                if kept < limit and not aborted:
+                    await aset_cached_output(cache_key, "".join(chunks))
+            completed = not aborted
+        except ExecutionError:
+            failed = True
+        finally:
+            log = None
+            if completed or chunks:
+                log = PromptLog(
+                    prompt=prompt,
+                    user=user,
+                    prompt_version=prompt.version or None,
+                    input_text=run_request.input_text,
+                    output_text="".join(chunks),
+                    is_partial=not completed,
+                    is_cached=cached_output is not None,
+                )
+                try:
+                    await asave_run_logs([log])
+                except Exception:
+                    log = None
+
+        if aborted:
+            return
+        if failed:
+            if not chunks:
+                await sync_to_async(refund_run_quota)(request, 1)
+            yield self.format_event("error", {"message": "프롬프트 실행에 실패했습니다."})
+        elif log is None:
+            yield self.format_event("error", {"message": "프롬프트 실행 이력을 저장하지 못했습니다."})
+        else:
+            # buffered 모드에서는 로그가 flush 시점에 저장되어 아직 id가 없으므로 log_id를 생략
+            yield self.format_event("done", {"log_id": log.id} if log.id is not None else {})
+
+    @staticmethod
+    def format_event(event, data):
+        return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+class PromptLogListView(ReplicaReadMixin, generics.ListAPIView):
+    """
+    - GET: 유저의 프롬프트 실행 이력 조회 (읽기 복제본 사용, 자신의 쓰기 직후에는 default)
     """
 
     serializer_class = PromptLogSerializer
     permission_classes = [permissions.IsAuthenticated]
 
     def get_queryset(self):
-        return PromptLog.objects.filter(user=self.request.user)
+        return PromptLog.objects.filter(user=self.request.user).select_related("input_blob", "output_blob")
+
+
+class PromptLogArchiveListView(generics.ListAPIView):
+    """
+    - GET: 보관 기간이 지나 아카이브된 로그 세그먼트 목록 (기간, 건수)
+    """
+
+    serializer_class = PromptLogArchiveSerializer
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get_queryset(self):
+        return PromptLogArchive.objects.filter(user=self.request.user, row_count__gt=0)
+
+
+class PromptLogArchiveRowsView(APIView):
+    """
+    - GET: 아카이브된 로그를 NDJSON으로 스트리밍 (?start=&end= ISO 시각, [start, end) 범위)
+    - 범위와 겹치는 세그먼트만 열어 한 줄씩 풀어서 전송
+    """
+
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request):
+        bounds = {}
+        for name in ("start", "end"):
+            raw = request.query_params.get(name)
+            if not raw:
+                bounds[name] = None
+                continue
+            value = parse_datetime(raw)
+            if value is None:
+                return Response({"message": f"{name}은 ISO 8601 시각이어야 합니다."}, status=400)
+            bounds[name] = value if timezone.is_aware(value) else timezone.make_aware(value)
+
+        rows = iter_archived_range(request.user, bounds["start"], bounds["end"])
+        return StreamingHttpResponse((to_ndjson(row) for row in rows), content_type="application/x-ndjson")
+
+
+class TagFacetView(APIView):
+    """
+    - GET: 내 프롬프트에 달린 태그별 개수 (UserTagCount 집계 테이블에서 조회)
+    """
+
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request):
+        facets = (
+            UserTagCount.objects.filter(user=request.user, count__gt=0)
+            .order_by("-count", "tag__name")
+            .values("tag_id", "tag__name", "count")
+        )
+        return Response(
+            [{"id": row["tag_id"], "name": row["tag__name"], "count": row["count"]} for row in facets], status=200
+        )
+
+
+def stats_days(request):
+    """?days= (기본 30, 1 ~ RUN_STATS_MAX_DAYS), 잘못된 값이면 None"""
+    try:
+        days = int(request.query_params.get("days", 30))
+    except ValueError:
+        return None
+    return days if 1 <= days <= RUN_STATS_MAX_DAYS else None
+
+
+class RunStatsView(ReplicaReadMixin, APIView):
+    """
+    - GET: 내 전체 실행 수, 마지막 실행 시각, 최근 ?days=일의 일별 실행 수 (집계 테이블만 조회)
+    """
+
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request):
+        days = stats_days(request)
+        if days is None:
+            return Response({"message": f"days는 1 ~ {RUN_STATS_MAX_DAYS} 사이의 정수여야 합니다."}, status=400)
+
+        totals = UserRunStats.objects.filter(user=request.user).values("run_count", "last_run_at").first()
+        totals = totals or {"run_count": 0, "last_run_at": None}
+        daily = daily_runs(PromptRunDay.objects.filter(user=request.user), days)
+        return Response({**totals, "daily": daily}, status=200)
+
+
+class PromptRunStatsView(ReplicaReadMixin, APIView):
+    """
+    - GET: 프롬프트의 실행 수, 마지막 실행 시각, 최근 ?days=일의 일별 실행 수 (집계 테이블만 조회)
+    """
+
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request, pk):
+        days = stats_days(request)
+        if days is None:
+            return Response({"message": f"days는 1 ~ {RUN_STATS_MAX_DAYS} 사이의 정수여야 합니다."}, status=400)
+
+        totals = get_object_or_404(
+            Prompt.objects.filter(user=request.user).values("id", "run_count", "last_run_at"), pk=pk
+        )
+        daily = daily_runs(PromptRunDay.objects.filter(prompt_id=pk), days)
+        return Response({**totals, "daily": daily}, status=200)
+
+
+class PromptSearchView(APIView):
+    """
+    - GET: 내 프롬프트(type=prompt) 또는 실행 로그(type=log) 전문 검색, 관련도 순 + 스니펫
+    - ?q=검색어 &type=prompt|log &limit= &offset= (COUNT 없이 next 링크만 제공)
+    """
+
+    permission_classes = [permissions.IsAuthenticated]
+    searches = {"prompt": search_prompts, "log": search_logs}
+
+    def get(self, request):
+        query = request.query_params.get("q", "").strip()
+        search = self.searches.get(request.query_params.get("type", "prompt"))
+        if not query or search is None:
+            return Response({"message": "q는 필수이며 type은 prompt 또는 log만 가능합니다."}, status=400)
+
+        try:
+            limit = min(
+                int(request.query_params.get("limit", settings.REST_FRAMEWORK["PAGE_SIZE"])), settings.MAX_PAGE_SIZE
+            )
+            offset = int(request.query_params.get("offset", 0))
+        except ValueError:
+            return Response({"message": "limit, offset은 정수여야 합니다."}, status=400)
+        if limit < 1 or offset < 0:
+            return Response({"message": "limit은 1 이상, offset은 0 이상이어야 합니다."}, status=400)
+
+        results = search(request.user, query, limit + 1, offset)
+        next_url = None
+        if len(results) > limit:
+            results = results[:limit]
+            next_url = replace_query_param(request.build_absolute_uri(), "offset", offset + limit)
+
+        return Response({"next": next_url, "results": results}, status=200)
+
+
+class PromptImportView(APIView):
+    """
+    - POST: NDJSON(한 줄에 프롬프트 하나) 본문을 스트리밍으로 읽어 일괄 생성
+    - 청크마다 태그 일괄 조회/생성 + bulk_create, 잘못된 줄은 건너뛰고 errors로 보고
+    """
+
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request):
+        # request.data 대신 본문 스트림을 줄 단위로 읽어 전체를 메모리에 올리지 않음
+        stream = request.stream
+        if stream is None:
+            return Response({"message": "NDJSON 본문이 비어 있습니다."}, status=400)
+
+        result = import_prompts(request.user, stream)
+        return Response(result.as_dict(), status=201 if result.created else 400)
+
+
+class PromptExportView(APIView):
+    """
+    - GET: 내 프롬프트를 NDJSON으로 스트리밍 (?include=logs 이면 실행 로그도 포함)
+    """
+
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request):
+        include_logs = request.query_params.get("include") == "logs"
+        response = StreamingHttpResponse(
+            export_lines(request.user, include_logs=include_logs), content_type="application/x-ndjson"
+        )
+        response["Content-Disposition"] = 'attachment; filename="prompts.ndjson"'
+        return response
@@ -0,0 +1,116 @@
+"""
+로그인 폭주 중 다른 요청의 지연 측정
+
+ASGI 앱(config.asgi)에 httpx로 직접 요청을 보내, 로그인 요청을 동시에 대량으로 보내는 동안
+인증된 GET /api/accounts/me/ 요청의 지연을 비교한다.
+- inline: 해싱을 이벤트 루프에서 바로 실행 (요청 처리 중 해싱이 워커를 점유하던 이전 방식)
+- pool: 해싱 전용 스레드 풀 사용 (PASSWORD_HASH_POOL), 한도를 넘는 로그인은 503으로 즉시 거절
+
+    python benchmarks/bench_login_storm.py --logins 500 --probes 200
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+import httpx  # noqa: E402
+from django.contrib.auth import get_user_model  # noqa: E402
+from django.db import connection  # noqa: E402
+from rest_framework_simplejwt.tokens import AccessToken  # noqa: E402
+
+from apps.accounts import views  # noqa: E402
+from apps.accounts.hashing import PasswordHashPool, get_hash_pool  # noqa: E402
+from config.asgi import application  # noqa: E402
+
+EMAIL, PASSWORD = "bench@example.com", "bench1234"
+
+
+class InlineHashPool(PasswordHashPool):
+    """해싱을 호출한 스레드(이벤트 루프)에서 그대로 실행"""
+
+    def __init__(self):
+        super().__init__(max_workers=1, max_pending=1, retry_after=1)
+
+    async def run(self, func, *args):
+        return func(*args)
+
+
+def summarize(label, samples):
+    samples = sorted(samples)
+    print(
+        f"{label:<28} n={len(samples):<5} p50={statistics.median(samples):8.2f}ms "
+        f"p99={samples[max(int(len(samples) * 0.99) - 1, 0)]:8.2f}ms max={samples[-1]:8.2f}ms"
+    )
+
+
+async def probe(client, token, count, interval):
+    samples = []
+    for _ in range(count):
+        started = time.perf_counter()
+        res = await client.get("/api/accounts/me/", headers={"Authorization": f"Bearer {token}"})
+        res.raise_for_status()
+        samples.append((time.perf_counter() - started) * 1000)
+        await asyncio.sleep(interval)
+    return samples
+
+
+async def storm(client, logins):
+    responses = await asyncio.gather(
+        *(client.post("/api/accounts/login/", json={"email": EMAIL, "password": PASSWORD}) for _ in range(logins))
+    )
+    return Counter(res.status_code for res in responses)
+
+
+async def run_mode(label, token, logins, probes, interval):
+    transport = httpx.ASGITransport(app=application)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        summarize(f"{label} / idle", await probe(client, token, probes, interval))
+        storm_task = asyncio.ensure_future(storm(client, logins))
+        samples = await probe(client, token, probes, interval)
+        statuses = await storm_task
+    summarize(f"{label} / login storm", samples)
+    print(f"{'':<28} login 응답: {dict(statuses)}")
+
+
+def run(logins, probes, interval):
+    user = get_user_model().objects.create_user(email=EMAIL, username="bench", password=PASSWORD)
+    token = str(AccessToken.for_user(user))
+
+    with mock.patch.object(views, "get_hash_pool", InlineHashPool):
+        asyncio.run(run_mode("inline", token, logins, probes, interval))
+    asyncio.run(run_mode("pool", token, logins, probes, interval))
+    get_hash_pool().shutdown()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--logins", type=int, default=300, help="동시에 보낼 로그인 요청 수")
+    parser.add_argument("--probes", type=int, default=200, help="측정할 /me/ 요청 수")
+    parser.add_argument("--interval", type=float, default=0.005, help="/me/ 요청 간격(초)")
+    parser.add_argument("--keepdb", action="store_true", help="측정 후 테스트 DB를 삭제하지 않음")
+    args = parser.parse_args()
+
+    logging.getLogger("django.request").setLevel(logging.ERROR)  # 503 경고 로그 생략
+    old_name = connection.creation.create_test_db(verbosity=0, keepdb=args.keepdb)
+    try:
+        run(args.logins, args.probes, args.interval)
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0, keepdb=args.keepdb)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""
+프롬프트 목록 응답 처리량 비교 (ModelSerializer vs .values() 행, DRF JSONRenderer vs orjson)
+
+테스트 DB(test_<DB_NAME>)에 태그가 달린 프롬프트를 채운 뒤, 전체 목록을 응답 바이트로 만드는 시간과
+API로 전체 페이지를 순회하는 시간을 측정한다.
+
+    python benchmarks/bench_prompt_list.py --prompts 10000 --content-chars 2000
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.conf import settings  # noqa: E402
+from django.contrib.auth import get_user_model  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.urls import reverse  # noqa: E402
+from rest_framework.renderers import JSONRenderer  # noqa: E402
+from rest_framework.test import APIClient  # noqa: E402
+
+from apps.common.renderers import FastJSONRenderer, orjson  # noqa: E402
+from apps.prompts.listing import (  # noqa: E402
+    LIST_FIELDS,
+    SUMMARY_FIELDS,
+    prompt_rows,
+    render_prompt_rows,
+)
+from apps.prompts.models import Prompt, Tag  # noqa: E402
+from apps.prompts.serializers import PromptSerializer  # noqa: E402
+
+
+def seed(user, count, content_chars, tag_count):
+    rng = random.Random(0)
+    tags = Tag.objects.bulk_create([Tag(name=f"bench-{i}") for i in range(tag_count)])
+    for start in range(0, count, 2000):
+        prompts = Prompt.objects.bulk_create(
+            Prompt(user=user, title=f"prompt {i}", content=(f"line {i} " * content_chars)[:content_chars])
+            for i in range(start, min(start + 2000, count))
+        )
+        if not connection.features.can_return_rows_from_bulk_insert:
+            prompts = Prompt.objects.filter(user=user).order_by("-id")[: len(prompts)]
+        Prompt.tags.through.objects.bulk_create(
+            Prompt.tags.through(prompt_id=prompt.pk, tag_id=tag.pk)
+            for prompt in prompts
+            for tag in rng.sample(tags, rng.randint(0, 3))
+        )
+
+
+def measure(label, func, iterations, count):
+    samples = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - started)
+    p50 = statistics.median(samples)
+    print(f"  {label:<40} p50={p50 * 1000:9.1f}ms  {count / p50:10,.0f} rows/s")
+
+
+def walk_pages(client, params):
+    url, count = reverse("prompt-list-create"), 0
+    while url:
+        res = client.get(url, params)
+        count += len(res.data["results"])
+        url, params = res.data["next"], None
+    return count
+
+
+def run(count, content_chars, tag_count, iterations):
+    user = get_user_model().objects.create_user(email="bench@example.com", username="bench", password="bench1234")
+    seed(user, count, content_chars, tag_count)
+    queryset = Prompt.objects.filter(user=user).order_by("-created_at", "-id")
+    drf, fast = JSONRenderer(), FastJSONRenderer()
+    print(f"프롬프트 {count}개, content {content_chars}자, orjson {'사용' if orjson else '미설치'}")
+
+    print("전체 목록을 응답 바이트로 변환")
+    measure(
+        "ModelSerializer + JSONRenderer",
+        lambda: drf.render(PromptSerializer(queryset.prefetch_related("tags"), many=True).data),
+        iterations,
+        count,
+    )
+    measure(
+        ".values() + JSONRenderer",
+        lambda: drf.render(render_prompt_rows(list(prompt_rows(queryset, LIST_FIELDS)), LIST_FIELDS)),
+        iterations,
+        count,
+    )
+    measure(
+        ".values() + orjson",
+        lambda: fast.render(render_prompt_rows(list(prompt_rows(queryset, LIST_FIELDS)), LIST_FIELDS)),
+        iterations,
+        count,
+    )
+    measure(
+        ".values() + orjson (?view=summary)",
+        lambda: fast.render(render_prompt_rows(list(prompt_rows(queryset, SUMMARY_FIELDS)), SUMMARY_FIELDS)),
+        iterations,
+        count,
+    )
+
+    client = APIClient()
+    client.force_authenticate(user)
+    page_size = settings.MAX_PAGE_SIZE
+    print(f"API로 전체 페이지 순회 (page_size={page_size})")
+    measure("GET 전체 필드", lambda: walk_pages(client, {"page_size": page_size}), iterations, count)
+    measure(
+        "GET ?view=summary", lambda: walk_pages(client, {"page_size": page_size, "view": "summary"}), iterations, count
+    )
+    measure(
+        "GET ?fields=id,title",
+        lambda: walk_pages(client, {"page_size": page_size, "fields": "id,title"}),
+        iterations,
+        count,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--prompts", type=int, default=10_000)
+    parser.add_argument("--content-chars", type=int, default=2000)
+    parser.add_argument("--tags", type=int, default=20)
+    parser.add_argument("--iterations", type=int, default=5)
+    parser.add_argument("--keepdb", action="store_true", help="측정 후 테스트 DB를 삭제하지 않음")
+    args = parser.parse_args()
+
+    old_name = connection.creation.create_test_db(verbosity=0, keepdb=args.keepdb)
+    try:
+        run(args.prompts, args.content_chars, args.tags, args.iterations)
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0, keepdb=args.keepdb)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+프롬프트 템플릿 렌더링 비교 (매 실행마다 정규식 치환 vs 컴파일 결과 캐시 + 조각 join)
+
+큰 템플릿(--chars 길이, --variables 개의 변수가 --repeats 번씩 등장)을 만들어
+실행 한 번에 드는 렌더링 시간을 측정한다. DB는 사용하지 않는다.
+
+    python benchmarks/bench_prompt_template.py --chars 200000 --variables 50 --repeats 10
+"""
+
+import argparse
+import os
+import random
+import re
+import statistics
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from apps.prompts.templating import (  # noqa: E402
+    VARIABLE_PATTERN,
+    compile_template,
+    get_template_cache,
+    render_prompt,
+)
+
+
+def build_template(chars, variables, repeats):
+    rng = random.Random(0)
+    slots = [f"{{{{ var_{i % variables} }}}}" for i in range(variables * repeats)]
+    filler = chars // (len(slots) + 1)
+    words = "system context answer step example output should because".split()
+    pieces = []
+    for slot in slots + [""]:
+        text = " ".join(rng.choice(words) for _ in range(filler // 6 + 1))[:filler]
+        pieces.extend([text, "\n", slot])
+    return "".join(pieces)
+
+
+def measure(label, func, iterations):
+    samples = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - started)
+    p50 = statistics.median(samples)
+    print(f"  {label:<36} p50={p50 * 1_000_000:10.1f}µs  {1 / p50:12,.0f} renders/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--chars", type=int, default=200_000)
+    parser.add_argument("--variables", type=int, default=50)
+    parser.add_argument("--repeats", type=int, default=10)
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    content = build_template(args.chars, args.variables, args.repeats)
+    variables = {f"var_{i}": f"value {i}" for i in range(args.variables)}
+    prompt = SimpleNamespace(pk=1, content=content, is_template=True)
+    expected = VARIABLE_PATTERN.sub(lambda match: variables[match.group(1)], content)
+    assert render_prompt(prompt, variables) == expected
+
+    compiled = compile_template(content)
+    print(f"템플릿 {len(content):,}자, 변수 {args.variables}개 x {args.repeats}회, 조각 {len(compiled.segments)}개")
+    measure(
+        "정규식 치환 (매번 파싱)",
+        lambda: VARIABLE_PATTERN.sub(lambda m: variables[m.group(1)], content),
+        args.iterations,
+    )
+    measure("컴파일만", lambda: compile_template(content), args.iterations)
+    measure("컴파일된 템플릿 render()", lambda: compiled.render(variables), args.iterations)
+    measure("render_prompt (같은 문자열 객체)", lambda: render_prompt(prompt, variables), args.iterations)
+
+    # 실제 요청에서는 DB에서 읽은 새 문자열이므로 해시와 원문 비교가 매번 일어남 (복사 시간은 기준으로 따로 표시)
+    def fresh(pk, text):
+        return SimpleNamespace(pk=pk, content=text[:1] + text[1:], is_template=True)
+
+    measure("문자열 복사만 (기준)", lambda: fresh(1, content), args.iterations)
+    measure("render_prompt (매번 새 문자열)", lambda: render_prompt(fresh(1, content), variables), args.iterations)
+    plain = re.sub(r"\{\{.*?\}\}", "", content)
+    measure("render_prompt (변수 없는 내용)", lambda: render_prompt(fresh(2, plain), {}), args.iterations)
+    get_template_cache().invalidate(1)
+    get_template_cache().invalidate(2)
+
+
+if __name__ == "__main__":
+    main()
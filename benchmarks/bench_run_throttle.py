@@ -0,0 +1,112 @@
+"""
+실행 요청 제한(RunRateThrottle) 확인 + 하루 실행 수 차감(charge_run_quota) 한 번의 소요 시간 측정
+
+테스트 DB에 유저를 만들고, 유저를 돌아가며 토큰 버킷 확인 + 하루 실행 수 차감을 반복한다.
+유저별 덮어쓰기 조회는 첫 요청 이후 캐시에서 읽으므로 워밍업 후 측정한다.
+- local: 프로세스 내 dict + 락 (PROMPT_RUN_LIMIT_STORE=local)
+- cache: CACHES["run_limits"] (기본 locmem, 공유 캐시로 바꾸면 네트워크 왕복이 더해짐)
+--threads를 주면 같은 저장소를 여러 스레드가 동시에 쓰는 경우도 측정한다.
+
+    python benchmarks/bench_run_throttle.py --users 1000 --checks 200000 --threads 8
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import threading
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.contrib.auth import get_user_model  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.test import override_settings  # noqa: E402
+
+from apps.prompts.throttling import (  # noqa: E402
+    RunRateThrottle,
+    charge_run_quota,
+    get_limit_store,
+)
+
+# 한도에 걸리지 않도록 충분히 큰 값 (거절 경로도 같은 연산)
+RATES = {"run": "1000000/m", "batch": "1000000/m", "stream": "1000000/m"}
+
+
+def make_requests(users):
+    view = SimpleNamespace(throttle_scope="run")
+    return [(SimpleNamespace(user=user), view) for user in users]
+
+
+def run_checks(requests, checks, samples):
+    throttle = RunRateThrottle()
+    for index in range(checks):
+        request, view = requests[index % len(requests)]
+        started = time.perf_counter()
+        throttle.allow_request(request, view)
+        charge_run_quota(request, 1)
+        samples.append(time.perf_counter() - started)
+
+
+def summarize(label, samples, elapsed):
+    samples = sorted(samples)
+    print(
+        f"  {label:<18} p50={statistics.median(samples) * 1_000_000:7.1f}µs "
+        f"p99={samples[int(len(samples) * 0.99) - 1] * 1_000_000:7.1f}µs "
+        f"{len(samples) / elapsed:12,.0f} checks/s"
+    )
+
+
+def measure(label, requests, checks, threads):
+    for request, view in requests:  # 유저별 덮어쓰기 캐시 워밍업
+        RunRateThrottle().allow_request(request, view)
+
+    samples = [[] for _ in range(threads)]
+    workers = [
+        threading.Thread(target=run_checks, args=(requests, checks // threads, samples[index]))
+        for index in range(threads)
+    ]
+    started = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    summarize(label, [sample for chunk in samples for sample in chunk], time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--checks", type=int, default=200_000)
+    parser.add_argument("--threads", type=int, default=1)
+    parser.add_argument("--keepdb", action="store_true")
+    args = parser.parse_args()
+
+    old_name = connection.creation.create_test_db(verbosity=0, keepdb=args.keepdb)
+    try:
+        User = get_user_model()
+        User.objects.all().delete()
+        User.objects.bulk_create(
+            User(email=f"throttle{i}@example.com", username=f"throttle{i}") for i in range(args.users)
+        )
+        requests = make_requests(list(User.objects.all()))
+        print(f"유저 {args.users}명, 확인 {args.checks:,}회")
+
+        for store in ("local", "cache"):
+            for threads in sorted({1, args.threads}):
+                with override_settings(PROMPT_RUN_LIMIT_STORE=store, PROMPT_RUN_RATES=RATES):
+                    measure(f"{store} x{threads}", requests, args.checks, threads)
+                    get_limit_store.cache_clear()
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0, keepdb=args.keepdb)
+
+
+if __name__ == "__main__":
+    main()
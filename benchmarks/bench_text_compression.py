@@ -0,0 +1,110 @@
+"""
+프롬프트 버전 스냅샷 압축 저장 전/후의 저장 크기와 조회 지연 비교
+
+테스트 DB(test_<DB_NAME>)에 긴 프롬프트 내용의 전체 저장 버전(PromptVersion.snapshot)을 압축 끔(0) /
+켬(TEXT_COMPRESSION_MIN_BYTES) 상태로 각각 채운 뒤, 스냅샷 컬럼 크기와 버전 복원(get_version) / 스냅샷 미사용 조회 지연을 측정한다.
+(프롬프트 내용 / 실행 로그 본문은 전문 검색 대상이라 압축하지 않음)
+
+    python benchmarks/bench_text_compression.py --rows 50000 --output-chars 4000
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.conf import settings  # noqa: E402
+from django.contrib.auth import get_user_model  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.test.utils import override_settings  # noqa: E402
+
+from apps.prompts.models import Prompt, PromptVersion  # noqa: E402
+from apps.prompts.versions import get_version  # noqa: E402
+
+WORDS = (
+    "the model response prompt context token answer example however therefore function value result "
+    "data user request first second finally summary step because output input should would can"
+).split()
+
+
+def fake_output(rng, chars):
+    sentences = []
+    while sum(map(len, sentences)) < chars:
+        sentences.append(" ".join(rng.choice(WORDS) for _ in range(rng.randint(8, 20))).capitalize() + ".")
+    return " ".join(sentences)[:chars]
+
+
+def column_bytes():
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT SUM(LENGTH(snapshot)) FROM prompts_promptversion")
+        total = cursor.fetchone()[0] or 0
+        if connection.vendor == "mysql":
+            cursor.execute(
+                "SELECT data_length FROM information_schema.tables WHERE table_schema = DATABASE() "
+                "AND table_name = 'prompts_promptversion'"
+            )
+            return total, cursor.fetchone()[0]
+    return total, None
+
+
+def measure(label, func, iterations):
+    samples = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - started) * 1000)
+    print(f"  {label:<34} p50={statistics.median(samples):8.2f}ms mean={statistics.fmean(samples):8.2f}ms")
+
+
+def run(rows, output_chars, iterations):
+    user = get_user_model().objects.create_user(email="bench@example.com", username="bench", password="bench1234")
+    prompt = Prompt.objects.create(user=user, title="bench", content="Summarize the input.")
+    rng = random.Random(0)
+    contents = [fake_output(rng, output_chars) for _ in range(200)]
+
+    for threshold in (0, settings.TEXT_COMPRESSION_MIN_BYTES or 1024):
+        with override_settings(TEXT_COMPRESSION_MIN_BYTES=threshold):
+            PromptVersion.objects.all().delete()
+            for start in range(0, rows, 5000):
+                PromptVersion.objects.bulk_create(
+                    PromptVersion(prompt=prompt, number=i + 1, title="bench", snapshot=contents[i % len(contents)])
+                    for i in range(start, min(start + 5000, rows))
+                )
+
+            total, data_length = column_bytes()
+            print(f"압축 기준 {threshold} bytes: 스냅샷 컬럼 {total / 1024 / 1024:.1f} MiB", end="")
+            print(f", 테이블 data_length {data_length / 1024 / 1024:.1f} MiB" if data_length else "")
+
+            numbers = [rng.randint(1, rows) for _ in range(100)]
+            measure("버전 100개 복원 (스냅샷 해제)", lambda: [get_version(prompt.pk, n) for n in numbers], iterations)
+            history = PromptVersion.objects.filter(prompt=prompt).only("number", "title", "created_at")
+            measure("이력 100건 조회 (스냅샷 미사용)", lambda: [v.number for v in history[:100]], iterations)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=20_000)
+    parser.add_argument("--output-chars", type=int, default=4000)
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--keepdb", action="store_true", help="측정 후 테스트 DB를 삭제하지 않음")
+    args = parser.parse_args()
+
+    old_name = connection.creation.create_test_db(verbosity=0, keepdb=args.keepdb)
+    try:
+        run(args.rows, args.output_chars, args.iterations)
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0, keepdb=args.keepdb)
+
+
+if __name__ == "__main__":
+    main()
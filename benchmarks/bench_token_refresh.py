@@ -0,0 +1,114 @@
+"""
+Refresh 토큰 재발급 시 블랙리스트 조회 지연 측정
+
+테스트 DB(test_<DB_NAME>)를 새로 만들어 블랙리스트 행을 채운 뒤,
+Bloom filter를 켠 경우와 끈 경우의 check_blacklist / 재발급 직렬화 지연을 비교한다.
+
+    python benchmarks/bench_token_refresh.py --rows 20000000 --iterations 2000
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+import uuid
+from datetime import timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.conf import settings  # noqa: E402
+from django.contrib.auth import get_user_model  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.test.utils import override_settings  # noqa: E402
+from rest_framework_simplejwt.token_blacklist.models import (  # noqa: E402
+    BlacklistedToken,
+    OutstandingToken,
+)
+from rest_framework_simplejwt.utils import aware_utcnow  # noqa: E402
+
+from apps.accounts.blacklist import (  # noqa: E402
+    FilteredRefreshToken,
+    get_blacklist_filter,
+)
+from apps.accounts.serializers import CookieTokenRefreshSerializer  # noqa: E402
+
+
+def fill_blacklist(user, rows, chunk_size=50_000):
+    expires_at = aware_utcnow() + timedelta(days=7)
+    for start in range(0, rows, chunk_size):
+        size = min(chunk_size, rows - start)
+        first_id = start + 1
+        OutstandingToken.objects.bulk_create(
+            OutstandingToken(id=first_id + i, user=user, jti=uuid.uuid4().hex, token="", expires_at=expires_at)
+            for i in range(size)
+        )
+        BlacklistedToken.objects.bulk_create(BlacklistedToken(token_id=first_id + i) for i in range(size))
+        print(f"\r  {start + size:,}/{rows:,}", end="", flush=True)
+    print()
+
+
+def measure(label, func, iterations):
+    samples = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - started) * 1000)
+    samples.sort()
+    print(
+        f"{label:<38} p50={statistics.median(samples):.3f}ms "
+        f"p99={samples[int(len(samples) * 0.99) - 1]:.3f}ms mean={statistics.fmean(samples):.3f}ms"
+    )
+
+
+def run(rows, iterations):
+    user = get_user_model().objects.create_user(email="bench@example.com", username="bench", password="bench1234")
+    print(f"블랙리스트 {rows:,}행 생성 중")
+    fill_blacklist(user, rows)
+
+    token = str(FilteredRefreshToken.for_user(user))
+
+    for enabled in (False, True):
+        # 방금 만든 행을 동기화마다 SYNC_LAG 범위로 다시 읽지 않도록 (운영에서는 최근 SYNC_LAG초 분량만 다시 읽음)
+        conf = {**settings.TOKEN_BLACKLIST_FILTER, "ENABLED": enabled, "SYNC_LAG": 0.0}
+        with override_settings(TOKEN_BLACKLIST_FILTER=conf):
+            if enabled:
+                started = time.perf_counter()
+                get_blacklist_filter().rebuild()
+                print(f"Bloom filter 구성: {time.perf_counter() - started:.1f}s")
+
+            label = "filter" if enabled else "db"
+            measure(f"check_blacklist ({label})", lambda: FilteredRefreshToken(token), iterations)
+
+            # 재발급은 기존 토큰을 블랙리스트에 넣으므로 매번 새 토큰 사용
+            pending = iter([str(FilteredRefreshToken.for_user(user)) for _ in range(iterations)])
+
+            def refresh():
+                serializer = CookieTokenRefreshSerializer(data={"refresh": next(pending)})
+                serializer.is_valid(raise_exception=True)
+
+            measure(f"refresh serializer ({label})", refresh, iterations)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--iterations", type=int, default=1000)
+    parser.add_argument("--keepdb", action="store_true", help="측정 후 테스트 DB를 삭제하지 않음")
+    args = parser.parse_args()
+
+    old_name = connection.creation.create_test_db(verbosity=0, keepdb=args.keepdb)
+    try:
+        run(args.rows, args.iterations)
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0, keepdb=args.keepdb)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,9 @@
 from datetime import timedelta
+from tempfile import gettempdir
 
 import pymysql
-from decouple import config
+from decouple import Csv, config
+from django.core.exceptions import ImproperlyConfigured
 
 pymysql.install_as_MySQLdb()
 
@@ -48,6 +50,7 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "apps.common.db.PrimaryPinMiddleware",
 ]
 
 ROOT_URLCONF = "config.urls"
@@ -83,13 +86,158 @@ DATABASES = {
         "HOST": config("DB_HOST"),
         "PORT": config("DB_PORT"),
         "OPTIONS": {"charset": "utf8mb4", "init_command": "SET sql_mode='STRICT_TRANS_TABLES'"},
+        # 요청마다 새로 연결하지 않고 재사용, 재사용 전에 끊긴 연결인지 확인
+        "CONN_MAX_AGE": config("DB_CONN_MAX_AGE", default=60, cast=int),
+        "CONN_HEALTH_CHECKS": True,
     }
 }
+
+# 읽기 복제본 (apps.common.db): 콤마로 구분한 호스트마다 replica_N 연결을 만들고 일부 뷰의 조회를 분산
+DATABASE_REPLICAS = []
+for index, host in enumerate(config("DB_REPLICA_HOSTS", default="", cast=Csv()), start=1):
+    DATABASES[f"replica_{index}"] = {**DATABASES["default"], "HOST": host, "TEST": {"MIRROR": "default"}}
+    DATABASE_REPLICAS.append(f"replica_{index}")
+DATABASE_ROUTERS = ["apps.common.db.ReplicaRouter"]
+# 쓰기 후 이 시간(초) 동안은 해당 유저의 조회를 default에서 처리 (복제 지연보다 길게)
+REPLICA_PIN_SECONDS = config("REPLICA_PIN_SECONDS", default=5, cast=int)
+REPLICA_PIN_CACHE_ALIAS = "replica_pins"
+
+# Cache
+# https://docs.djangoproject.com/en/4.2/topics/cache/
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    # 프롬프트 실행 결과 캐시 (locmem은 LRU 제거 + TIMEOUT 만료, 공유 캐시 백엔드로 교체 가능)
+    "prompt_results": {
+        "BACKEND": config("PROMPT_RESULT_CACHE_BACKEND", default="django.core.cache.backends.locmem.LocMemCache"),
+        "LOCATION": config("PROMPT_RESULT_CACHE_LOCATION", default="prompt-results"),
+        "TIMEOUT": config("PROMPT_RESULT_CACHE_TIMEOUT", default=3600, cast=int),
+        "OPTIONS": {"MAX_ENTRIES": config("PROMPT_RESULT_CACHE_MAX_ENTRIES", default=10_000, cast=int)},
+    },
+    # 인증된 유저 캐시 (apps.accounts.authentication), 프로세스 내 캐시여도 무효화는 아래 auth_generations로 전파
+    "auth_users": {
+        "BACKEND": config("AUTH_USER_CACHE_BACKEND", default="django.core.cache.backends.locmem.LocMemCache"),
+        "LOCATION": config("AUTH_USER_CACHE_LOCATION", default="auth-users"),
+        "TIMEOUT": config("AUTH_USER_CACHE_TTL", default=30, cast=int),
+        "OPTIONS": {"MAX_ENTRIES": config("AUTH_USER_CACHE_MAX_ENTRIES", default=10_000, cast=int)},
+    },
+    # 유저별 인증 캐시 세대 번호 (유저 변경 시 갱신), 모든 서버 프로세스가 같은 값을 봐야 하므로 공유 백엔드 사용
+    # 기본값은 같은 호스트의 프로세스끼리 공유하는 파일 캐시, 여러 호스트로 서빙하면 Redis / Memcached로 교체
+    "auth_generations": {
+        "BACKEND": config(
+            "AUTH_GENERATION_CACHE_BACKEND", default="django.core.cache.backends.filebased.FileBasedCache"
+        ),
+        "LOCATION": config(
+            "AUTH_GENERATION_CACHE_LOCATION", default=str(Path(gettempdir()) / "promptbook-auth-generations")
+        ),
+        "TIMEOUT": None,
+        "OPTIONS": {"MAX_ENTRIES": config("AUTH_GENERATION_CACHE_MAX_ENTRIES", default=100_000, cast=int)},
+    },
+    # 쓰기 직후 default 고정 여부 (apps.common.db), 다음 요청이 다른 워커로 가도 보이도록 공유 백엔드 사용
+    # 기본값은 같은 호스트의 프로세스끼리 공유하는 파일 캐시, 여러 호스트로 서빙하면 Redis / Memcached로 교체
+    "replica_pins": {
+        "BACKEND": config("REPLICA_PIN_CACHE_BACKEND", default="django.core.cache.backends.filebased.FileBasedCache"),
+        "LOCATION": config("REPLICA_PIN_CACHE_LOCATION", default=str(Path(gettempdir()) / "promptbook-replica-pins")),
+        "OPTIONS": {"MAX_ENTRIES": config("REPLICA_PIN_CACHE_MAX_ENTRIES", default=100_000, cast=int)},
+    },
+    # PROMPT_RUN_LIMIT_STORE=cache일 때 실행 요청 제한 상태 (apps.prompts.throttling), 워커 간 공유하려면 공유 캐시 백엔드 사용
+    "run_limits": {
+        "BACKEND": config("RUN_LIMIT_CACHE_BACKEND", default="django.core.cache.backends.locmem.LocMemCache"),
+        "LOCATION": config("RUN_LIMIT_CACHE_LOCATION", default="run-limits"),
+        "OPTIONS": {"MAX_ENTRIES": config("RUN_LIMIT_CACHE_MAX_ENTRIES", default=100_000, cast=int)},
+    },
+}
+# 복제본을 쓰면서 고정 여부를 워커별 캐시에 두면 쓰기 직후 다른 워커의 조회가 복제본으로 가므로 시작 시 거부
+if DATABASE_REPLICAS and CACHES[REPLICA_PIN_CACHE_ALIAS]["BACKEND"] in (
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+):
+    raise ImproperlyConfigured(
+        "DB_REPLICA_HOSTS를 쓰려면 REPLICA_PIN_CACHE_BACKEND를 공유 캐시 백엔드로 설정해야 합니다."
+    )
+AUTH_USER_CACHE_ALIAS = "auth_users"
+AUTH_GENERATION_CACHE_ALIAS = "auth_generations"
+
 REST_FRAMEWORK = {
-    "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
-        "apps.accounts.authentication.CookieJWTAuthentication",
+    # Authorization 헤더와 access_token 쿠키를 모두 처리 (apps.accounts.authentication)
+    "DEFAULT_AUTHENTICATION_CLASSES": ("apps.accounts.authentication.CookieJWTAuthentication",),
+    "DEFAULT_PAGINATION_CLASS": "apps.prompts.pagination.CreatedAtCursorPagination",
+    "PAGE_SIZE": config("PAGE_SIZE", default=50, cast=int),
+    # orjson 기반 JSON 렌더러 / 파서 (apps.common.renderers, orjson 미설치 시 DRF 기본 구현으로 동작)
+    "DEFAULT_RENDERER_CLASSES": (
+        "apps.common.renderers.FastJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
     ),
+    "DEFAULT_PARSER_CLASSES": (
+        "apps.common.renderers.FastJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ),
+}
+MAX_PAGE_SIZE = config("MAX_PAGE_SIZE", default=500, cast=int)
+
+# 프롬프트 실행 백엔드 (apps.prompts.backends)
+PROMPT_EXECUTION = {
+    "BACKEND": config("PROMPT_EXECUTION_BACKEND", default="apps.prompts.backends.MockExecutionBackend"),
+    "OPTIONS": {
+        "base_url": config("LLM_API_BASE_URL", default="https://api.openai.com/v1"),
+        "api_key": config("LLM_API_KEY", default=""),
+        "model": config("LLM_MODEL", default="gpt-4o-mini"),
+        "timeout": config("LLM_TIMEOUT_SECONDS", default=60.0, cast=float),
+        "max_connections": config("LLM_MAX_CONNECTIONS", default=200, cast=int),
+    },
+}
+# 배치 실행: 요청당 최대 입력 수 / 동시 실행 수
+PROMPT_BATCH_MAX_INPUTS = config("PROMPT_BATCH_MAX_INPUTS", default=5000, cast=int)
+PROMPT_BATCH_CONCURRENCY = config("PROMPT_BATCH_CONCURRENCY", default=32, cast=int)
+# 실행 결과 캐시 (apps.prompts.result_cache)
+PROMPT_RESULT_CACHE_ENABLED = config("PROMPT_RESULT_CACHE_ENABLED", default=True, cast=bool)
+PROMPT_RESULT_CACHE_ALIAS = "prompt_results"
+# 실행 로그 저장 방식: "sync"(요청 안에서 INSERT) | "buffered"(write-behind, apps.prompts.history)
+PROMPT_LOG_WRITE_MODE = config("PROMPT_LOG_WRITE_MODE", default="sync")
+PROMPT_LOG_BUFFER = {
+    "MAX_SIZE": config("PROMPT_LOG_BUFFER_MAX_SIZE", default=50_000, cast=int),  # 초과분은 드롭
+    "FLUSH_SIZE": config("PROMPT_LOG_BUFFER_FLUSH_SIZE", default=500, cast=int),
+    "FLUSH_INTERVAL": config("PROMPT_LOG_BUFFER_FLUSH_INTERVAL", default=1.0, cast=float),
+}
+# 스트리밍 실행 시 로그로 보관할 최대 출력 길이 (스트림당 메모리 상한)
+PROMPT_STREAM_LOG_MAX_CHARS = config("PROMPT_STREAM_LOG_MAX_CHARS", default=1_000_000, cast=int)
+# 실행 요청 제한 (apps.prompts.throttling, 유저별 덮어쓰기는 PromptRunLimit)
+# - 엔드포인트별 토큰 버킷 "요청 수/기간"(s / m / h / d): 요청 수만큼 몰아서 보낼 수 있고 기간 동안 고르게 다시 채워짐, 비우면 제한 없음
+PROMPT_RUN_RATES = {
+    "run": config("PROMPT_RUN_RATE", default="120/m"),
+    "batch": config("PROMPT_RUN_BATCH_RATE", default="20/m"),
+    "stream": config("PROMPT_RUN_STREAM_RATE", default="60/m"),
+}
+# - 유저별 하루 실행 수 (검증 뒤 실행한 수만 차감, 배치는 실행한 입력 수만큼, 날짜는 TIME_ZONE 기준), 0이면 제한 없음
+PROMPT_RUN_DAILY_QUOTA = config("PROMPT_RUN_DAILY_QUOTA", default=10_000, cast=int)
+# - 제한 상태 저장소: "local"(프로세스 내, 워커별 한도) | "cache"(CACHES["run_limits"], 공유 캐시로 워커 간 한도 공유)
+PROMPT_RUN_LIMIT_STORE = config("PROMPT_RUN_LIMIT_STORE", default="local")
+PROMPT_RUN_LIMIT_CACHE_ALIAS = "run_limits"
+PROMPT_RUN_LIMIT_MAX_KEYS = config("PROMPT_RUN_LIMIT_MAX_KEYS", default=100_000, cast=int)
+# - 유저별 덮어쓰기(PromptRunLimit)를 프로세스 내에 캐시하는 시간(초), 다른 프로세스의 변경은 이 시간 이내에 반영
+PROMPT_RUN_LIMIT_POLICY_TTL = config("PROMPT_RUN_LIMIT_POLICY_TTL", default=60, cast=int)
+
+# 프롬프트 버전 스냅샷 압축 저장 기준 (UTF-8 바이트, 0이면 압축하지 않음, apps.common.fields)
+# 전문 검색 대상인 프롬프트 내용 / 실행 로그 본문은 색인이 원문을 담아야 하므로 압축하지 않음
+TEXT_COMPRESSION_MIN_BYTES = config("TEXT_COMPRESSION_MIN_BYTES", default=1024, cast=int)
+
+# 컴파일된 프롬프트 템플릿 LRU 크기 (프로세스별, apps.prompts.templating)
+PROMPT_TEMPLATE_CACHE_SIZE = config("PROMPT_TEMPLATE_CACHE_SIZE", default=1024, cast=int)
+
+# 프롬프트 버전 이력 (apps.prompts.versions): 이 간격마다 전체 내용을 저장하고 나머지는 직전 버전과의 차이만 저장
+# (어떤 버전이든 최대 INTERVAL - 1번의 차이 적용으로 복원)
+PROMPT_VERSION_SNAPSHOT_INTERVAL = config("PROMPT_VERSION_SNAPSHOT_INTERVAL", default=16, cast=int)
+
+# 실행 로그 보관 / 아카이브 (archive_prompt_logs 명령, apps.prompts.archive)
+# RETENTION_DAYS: 유저별 정책(PromptLogRetentionPolicy)이 없을 때의 기본 보관 기간, 0이면 아카이브하지 않음
+PROMPT_LOG_ARCHIVE = {
+    "DIR": config("PROMPT_LOG_ARCHIVE_DIR", default=str(BASE_DIR / "archive" / "prompt_logs")),
+    "RETENTION_DAYS": config("PROMPT_LOG_RETENTION_DAYS", default=90, cast=int),
+    "BATCH_SIZE": config("PROMPT_LOG_ARCHIVE_BATCH_SIZE", default=1000, cast=int),
+    "SEGMENT_MAX_ROWS": config("PROMPT_LOG_ARCHIVE_SEGMENT_MAX_ROWS", default=100_000, cast=int),
 }
 
 SIMPLE_JWT = {
@@ -102,6 +250,28 @@ SIMPLE_JWT = {
     "AUTH_HEADER_TYPES": ("Bearer",),
 }
 
+# Refresh 토큰 블랙리스트 Bloom filter (apps.accounts.blacklist)
+TOKEN_BLACKLIST_FILTER = {
+    "ENABLED": config("TOKEN_BLACKLIST_FILTER_ENABLED", default=True, cast=bool),
+    "CAPACITY": config("TOKEN_BLACKLIST_FILTER_CAPACITY", default=10_000_000, cast=int),
+    "ERROR_RATE": config("TOKEN_BLACKLIST_FILTER_ERROR_RATE", default=0.01, cast=float),
+    "SYNC_INTERVAL": config("TOKEN_BLACKLIST_FILTER_SYNC_SECONDS", default=1.0, cast=float),
+    "REBUILD_INTERVAL": config("TOKEN_BLACKLIST_FILTER_REBUILD_SECONDS", default=3600.0, cast=float),
+    # 증분 동기화 시 이 시간(초)만큼 이전에 할당된 id 이후를 다시 읽음 (가장 긴 트랜잭션 + 서버 간 시계 차이보다 길게)
+    "SYNC_LAG": config("TOKEN_BLACKLIST_FILTER_SYNC_LAG_SECONDS", default=60.0, cast=float),
+}
+
+# 비밀번호 해싱 전용 스레드 풀 (apps.accounts.hashing)
+# 실행 중 + 대기 중 작업이 MAX_PENDING을 넘으면 503 + Retry-After(RETRY_AFTER초)로 즉시 거절
+PASSWORD_HASH_POOL = {
+    "MAX_WORKERS": config("PASSWORD_HASH_WORKERS", default=4, cast=int),
+    "MAX_PENDING": config("PASSWORD_HASH_MAX_PENDING", default=64, cast=int),
+    "RETRY_AFTER": config("PASSWORD_HASH_RETRY_AFTER", default=1, cast=int),
+}
+
+# 만료된 세션 기록(RefreshTokenLog) 보관 기간, prune_tokens 명령이 정리
+REFRESH_TOKEN_LOG_RETENTION_DAYS = config("REFRESH_TOKEN_LOG_RETENTION_DAYS", default=30, cast=int)
+
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
 
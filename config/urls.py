@@ -1,8 +1,11 @@
 from django.contrib import admin
 from django.urls import include, path
 
+from apps.common.views import MetricsView
+
 urlpatterns = [
     path("admin/", admin.site.urls),
     path("api/accounts/", include("apps.accounts.urls")),
     path("api/prompt/", include("apps.prompts.urls")),
+    path("api/metrics/", MetricsView.as_view(), name="metrics"),
 ]
@@ -0,0 +1,32 @@
+import pytest
+from django.core.cache import caches
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+
+# 프로세스 내 캐시(locmem)와 실행 제한 상태가 테스트 간에 공유되지 않도록 매 테스트마다 비움
+@pytest.fixture(autouse=True)
+def clear_caches():
+    yield
+    for cache in caches.all():
+        cache.clear()
+
+    from apps.prompts.throttling import reset_run_limits
+
+    reset_run_limits()
+
+
+# 테스트용 사용자 생성
+@pytest.fixture
+def user(django_user_model):
+    return django_user_model.objects.create_user(email="tester@example.com", username="tester", password="pass1234")
+
+
+# 로그인된 APIClient 제공 (access_token을 쿠키로 설정)
+@pytest.fixture
+def api_client_logged_in(user):
+    client = APIClient()
+    login_response = client.post(reverse("login"), data={"email": user.email, "password": "pass1234"})
+    assert login_response.status_code == 200
+    client.cookies["access_token"] = login_response.cookies["access_token"].value
+    return client